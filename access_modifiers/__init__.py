@@ -1,3 +1,8 @@
 """Access modifiers package externally available names."""
 
-from .access_modifiers import disable, privatemethod, protectedmethod, AccessException
+from .access_modifiers import (
+    allowlist, collect_stats, disable, enable, enforce, invalidate_caches, privateattribute, privatemethod,
+    protectedattribute, protectedmethod, sample, stats, use_backend, AccessException, PrivateAccessException,
+    ProtectedAccessException, ViolationRecord)
+from .controlled import access_controlled, AccessControlled
+from .policies import set_policy
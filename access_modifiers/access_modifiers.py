@@ -1,70 +1,989 @@
 """Access modifiers for Python."""
 
+import atexit
+import sys
 from functools import wraps
 from sys import _getframe as getframe
-from typing import Callable, TypeVar
+from threading import Lock, local
+from types import CodeType, FunctionType, MemberDescriptorType, MethodType
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, FrozenSet, Hashable, Iterator, List, Optional, Set, \
+    Tuple, TypeVar
+from weakref import WeakKeyDictionary, WeakSet, ref
+
+from . import policies
+
+if TYPE_CHECKING:  # pragma: nocover
+    from .allowlists import Allowlist, AllowlistRecorder  # pylint: disable=cyclic-import
+    from .counters import Stats  # pylint: disable=cyclic-import
+    from .sinks import Recorder  # pylint: disable=cyclic-import
 
 
 class AccessException(Exception):
     """Exception raised when a private or protected method is called from outside the class."""
 
 
+class _AccessViolationException(AccessException):
+    """AccessException raised by the access checks, with the qualified name of the method or attribute with access
+    modifier, the qualified name of the caller, the caller's code location, and the access modifier as attributes. The
+    message is only formatted when the exception is converted to a string. Exceptions created by other code are plain
+    exceptions whose attributes are None."""
+
+    callee: Optional[str] = None  # The qualified name of the method or attribute with access modifier
+    caller: Optional[str] = None  # The qualified name of the calling code
+    filename: Optional[str] = None  # The filename of the calling code
+    lineno: Optional[int] = None  # The line number of the call
+    modifier: Optional[str] = None  # "private", "protected", "private attribute", or "protected attribute"
+
+    def __str__(self) -> str:
+        modifier = self.modifier
+        return super().__str__() if modifier is None else _MESSAGES[modifier].format(method=self.callee)
+
+
+class PrivateAccessException(_AccessViolationException):
+    """Exception raised when a private method is called, or a private attribute accessed, from outside its class."""
+
+
+class ProtectedAccessException(_AccessViolationException):
+    """Exception raised when a protected method is called, or a protected attribute accessed, from another object."""
+
+
+def _access_exception(callee: str, caller: str, filename: str, lineno: int, modifier: str) -> AccessException:
+    """Return the exception for the violation of the access modifier. The exception has the fields as arguments too,
+    and pickles them, so it can be sent to other processes."""
+    exception = _EXCEPTIONS[modifier](callee, caller, filename, lineno, modifier)
+    exception.callee, exception.caller, exception.filename, exception.lineno, exception.modifier = \
+        callee, caller, filename, lineno, modifier
+    return exception
+
+
 ReturnType = TypeVar('ReturnType')
+Member = Any  # Method, or attribute descriptor, with access modifier
 
 
 _CHECK_ACCESS = True
 
+_VERDICT_CACHE_SIZE = 1024  # Maximum number of cached verdicts per private method
+_VERDICT_LOCK = Lock()  # Shared by the verdict caches, which only take it for verdicts not cached before
+
+
+class _VerdictCache:
+    """Bounded, thread-safe cache of the access verdicts of one private method or attribute. Verdicts are keyed by
+    (caller code, caller class) pairs, for code that may call the private method on behalf of an instance of the caller
+    class. Also holds the keys of the code of its class, if the class was indexed when it was created.
+
+    Code objects are compared by value, and hashing them takes time proportional to their size. Hence, the keys
+    contain the id of code objects, and the cache holds on to the code objects so their ids can't be reused. The keys
+    also contain the id of classes, but the cache only holds weak references to them, so it doesn't keep classes, and
+    the methods in them, alive. When a class is garbage collected, its verdicts are forgotten before its id can be
+    reused."""
+
+    __slots__ = ("verdicts", "pinned", "callers", "pinned_callers", "class_qualname", "maxsize", "modifier")
+
+    def __init__(self, class_qualname: Optional[str], maxsize: int, modifier: str = "private") -> None:
+        self.verdicts: Dict[Hashable, bool] = {}
+        self.pinned: Dict[Hashable, Tuple[CodeType, "ref[type]"]] = {}
+        self.callers: FrozenSet[Tuple[int, int]] = frozenset()  # Keys of the code of the indexed class
+        self.pinned_callers: Tuple[Any, ...] = ()
+        self.class_qualname = class_qualname
+        self.maxsize = maxsize
+        self.modifier = modifier  # "private" or "private attribute"
+
+    def add(self, key: Hashable, caller_code: CodeType, caller_class: type, verdict: bool) -> bool:
+        """Remember and return the verdict for the key, which contains the ids of the caller code and class."""
+        class_reference = ref(caller_class, lambda _: self.forget(key))
+        with _VERDICT_LOCK:
+            if len(self.verdicts) >= self.maxsize:
+                # Dicts are ordered, so this evicts the oldest verdict
+                oldest_key = next(iter(self.verdicts))
+                self.forget(oldest_key)
+            self.verdicts[key] = verdict
+            self.pinned[key] = (caller_code, class_reference)
+        return verdict
+
+    def forget(self, key: Hashable) -> None:
+        """Forget the verdict for the key. Doesn't need the lock, so it can be called when the garbage collector runs
+        while the lock is held."""
+        self.verdicts.pop(key, None)
+        self.pinned.pop(key, None)
+
+    def set_callers(self, cls: type, caller_codes: Tuple[CodeType, ...], caller_keys: FrozenSet[Tuple[int, int]]) \
+            -> None:
+        """Set the keys of the code objects that may call the private method on behalf of an instance of the class.
+        Like the verdicts, the keys are only valid while the code objects are pinned and the class is alive."""
+        self.pinned_callers = (caller_codes, ref(cls, lambda _: self.forget_callers()))
+        self.callers = caller_keys
+
+    def forget_callers(self) -> None:
+        """Forget the keys of the code of the indexed class, when the class is garbage collected."""
+        self.callers = frozenset()
+        self.pinned_callers = ()
+
+    def clear(self) -> None:
+        """Forget all verdicts."""
+        with _VERDICT_LOCK:
+            self.verdicts.clear()
+            self.pinned.clear()
+
+
+_VERDICT_CACHES: "WeakKeyDictionary[Member, _VerdictCache]" = WeakKeyDictionary()  # Private method and attribute caches
+
+
+def invalidate_caches() -> None:
+    """Forget all cached access verdicts. Needs to be invoked after monkeypatching methods that call private methods.
+
+    Redefined classes don't need this: they have new code objects, so their verdicts are computed anew."""
+    for cache in list(_VERDICT_CACHES.values()):
+        cache.clear()
+
+
+# All method wrappers and descriptors created by the access modifier decorators and in use
+_WRAPPERS: "WeakSet[Any]" = WeakSet()
+_SWAPPED_OUT: Dict[Callable, Callable] = {}  # Original methods put back by disable(), mapped to their wrappers
+_SWAP_LOCK = Lock()
+_OWNERS: "WeakKeyDictionary[Any, ref[type]]" = WeakKeyDictionary()  # The classes the wrappers were put in
+_ALL_CLASSES: "ref[type]" = ref(object)  # Owner of wrappers put in more than one class
+
+
+def _add_owner(wrapper: Any, owner: type) -> None:
+    """Remember that the wrapper was put in the dict of the class."""
+    previous_owner = _OWNERS.get(wrapper)
+    _OWNERS[wrapper] = ref(owner) if previous_owner is None or previous_owner() is owner else _ALL_CLASSES
+
+
+def _classes(wrappers: List[Any]) -> Iterator[type]:
+    """Yield the classes that may have the wrappers in their dict: the classes they were put in and the subclasses of
+    these classes, which may have copied them. If a wrapper wasn't put in one class when it was created, such as a
+    method wrapped in a static method, yield all classes."""
+    owners: Set[type] = set()
+    for wrapper in wrappers:
+        owner_reference = _OWNERS.get(wrapper)
+        owner = owner_reference() if owner_reference is not None else None
+        if owner is None:
+            owners = {object}
+            break
+        owners.add(owner)
+    seen: Set[int] = set()
+    classes = list(owners)
+    while classes:
+        cls = classes.pop()
+        if id(cls) not in seen:
+            seen.add(id(cls))
+            classes.extend(type.__subclasses__(cls))
+            yield cls
+
+
+def _swap(replacements: Dict[Callable, Callable], wrappers: List[Any]) -> None:
+    """Replace methods, also when wrapped in a static method, class and static methods, and attributes in the dicts
+    of the classes that own them. The wrappers are the methods and attributes with access modifiers among the replaced
+    ones or the replacements."""
+    if not replacements:
+        return
+    for cls in list(_classes(wrappers)):
+        for name, attribute in list(vars(cls).items()):
+            if isinstance(attribute, (staticmethod, classmethod)) and attribute in replacements:
+                type.__setattr__(cls, name, replacements[attribute])  # Class and static methods with access modifier
+                continue
+            is_static = isinstance(attribute, staticmethod)
+            function = attribute.__func__ if is_static else attribute
+            if isinstance(function, MemberDescriptorType) and function.__name__ == name:
+                continue  # Leave the slots that store the values of attributes with access modifiers in place
+            replaceable = (FunctionType, MemberDescriptorType, _MethodWithAccessModifier, _GuardedAttribute)
+            if isinstance(function, replaceable) and function in replacements:
+                replacement = replacements[function]
+                type.__setattr__(cls, name, staticmethod(replacement) if is_static else replacement)
+
 
 def disable() -> None:
-    """Disable all access checks. Needs to be invoked before the decorators are evaluated."""
+    """Disable all access checks. Methods decorated earlier are replaced by their originals in the classes that own
+    them, so calling them has no overhead at all. Methods decorated later are not wrapped."""
     global _CHECK_ACCESS  # pylint: disable=global-statement
-    _CHECK_ACCESS = False
+    with _SWAP_LOCK:
+        _CHECK_ACCESS = False
+        wrappers = list(_WRAPPERS)
+        _SWAPPED_OUT.update({wrapper.__wrapped__: wrapper for wrapper in wrappers})
+        _swap({wrapper: wrapper.__wrapped__ for wrapper in wrappers}, wrappers)
+        from .monitoring import set_monitoring  # pylint: disable=import-outside-toplevel,cyclic-import
+        set_monitoring(False)
 
 
 def enable() -> None:
-    """Enable all access checks. For testing purposes."""
+    """Enable all access checks. Methods that were decorated while access checks were enabled are checked again."""
     global _CHECK_ACCESS  # pylint: disable=global-statement
-    _CHECK_ACCESS = True
+    with _SWAP_LOCK:
+        _CHECK_ACCESS = True
+        _swap(_SWAPPED_OUT, list(_SWAPPED_OUT.values()))
+        _SWAPPED_OUT.clear()
+        from .monitoring import set_monitoring  # pylint: disable=import-outside-toplevel,cyclic-import
+        set_monitoring(True)
+
+
+class _Sampler:  # pylint: disable=too-few-public-methods
+    """Decide which calls of methods with access modifiers to check. Each thread counts its own calls, so threads
+    don't contend for the counts, also without global interpreter lock."""
+
+    __slots__ = ("every", "per_call_site", "adaptive", "thread_local")
+
+    def __init__(self, every: int, per_call_site: bool, adaptive: bool) -> None:
+        self.every = every
+        self.per_call_site = per_call_site
+        self.adaptive = adaptive
+        self.thread_local = local()
+
+    def skip(self, wrapper: Member, depth: int = 2) -> bool:
+        """Return whether the access check of the current call of the wrapper can be skipped. The depth is the number
+        of frames between this method and the caller of the method with access modifier."""
+        try:
+            counts = self.thread_local.counts
+        except AttributeError:
+            counts = self.thread_local.counts = {}
+        key: Hashable = (wrapper, id(getframe(depth).f_code)) if self.per_call_site else wrapper
+        count = counts.get(key, 0)
+        counts[key] = count + 1
+        if self.adaptive and count < self.every:
+            return count & (count - 1) != 0  # Check the first, second, fourth, eighth, ... call
+        return count % self.every != 0
+
+
+_SAMPLER: Optional[_Sampler] = None
+
+
+def sample(every: int = 1, per_call_site: bool = False, adaptive: bool = False) -> None:
+    """Check only one in every calls of each method with an access modifier, or of each call site if per_call_site is
+    true. If adaptive is true, check calls 1, 2, 4, 8, and so on until the interval reaches every. The default, checking
+    every call, turns sampling off."""
+    global _SAMPLER  # pylint: disable=global-statement
+    if every < 1:
+        raise ValueError(f"Expected a sampling interval of at least 1, got {every}")
+    _SAMPLER = _Sampler(every, per_call_site, adaptive) if every > 1 else None
+    _update_plain()
+
+
+_CHECKED, _CACHED, _VIOLATION = range(3)  # Results of the access checks
+_MESSAGES = {
+    "private": "Attempted call to private method {method} from outside its class",
+    "protected": "Attempted call to protected method {method} from another object",
+    "private attribute": "Attempted access to {method} from outside its class",
+    "protected attribute": "Attempted access to {method} from another object"}
+
+
+_EXCEPTIONS = {
+    "private": PrivateAccessException, "protected": ProtectedAccessException,
+    "private attribute": PrivateAccessException, "protected attribute": ProtectedAccessException}
+
+
+def _qualified_name(member: Any) -> str:
+    """Return the qualified name, including the module, of the method or attribute with access modifier."""
+    if isinstance(member, _GuardedAttribute):
+        return member.qualified_name
+    return f"{member.__module__}.{member.__qualname__}"
+
+
+def _modifier(member: Any) -> str:
+    """Return the access modifier of the method or attribute: "private", "protected", "private attribute", or
+    "protected attribute". Private methods and class-level methods have a verdict cache with their modifier."""
+    if isinstance(member, _GuardedAttribute):
+        return member.modifier
+    cache = _VERDICT_CACHES.get(member)
+    return "protected" if cache is None else cache.modifier
+
+
+class ViolationRecord:
+    """Record of a call of a private or protected method, or an access of a private or protected attribute, that
+    violated its access modifier. The message is only formatted when the record is converted to a string."""
+
+    __slots__ = ("method", "modifier", "filename", "lineno", "suppressed")
+
+    def __init__(self, method: Member, modifier: str, filename: str, lineno: int, suppressed: int) -> None:
+        self.method = method
+        self.modifier = modifier  # "private", "protected", "private attribute", or "protected attribute"
+        self.filename = filename
+        self.lineno = lineno
+        self.suppressed = suppressed  # Number of records dropped by the rate limit since the previous record
+
+    def __str__(self) -> str:
+        return f"{self.filename}:{self.lineno}: {_MESSAGES[self.modifier].format(method=self.method)}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record as a dict that can be serialized as JSON."""
+        return dict(method=_qualified_name(self.method), modifier=self.modifier,
+                    filename=self.filename, lineno=self.lineno, suppressed=self.suppressed, message=str(self))
+
+
+_RECORDER: Optional["Recorder"] = None
+
+
+def enforce(mode: str = "raise", sink: Optional[Callable[[ViolationRecord], Any]] = None, limit: int = 100,
+            period: float = 60.0) -> None:
+    """Raise an AccessException on violations if the mode is "raise", the default. If the mode is "record", hand a
+    ViolationRecord to the sink instead and continue. Each method and caller code location is recorded once, and at
+    most limit records are handed to the sink per period seconds. The sink defaults to logging the records, see
+    access_modifiers.sinks for other sinks."""
+    global _RECORDER  # pylint: disable=global-statement
+    if mode not in ("raise", "record"):
+        raise ValueError(f"Expected enforcement mode 'raise' or 'record', got {mode!r}")
+    if mode == "raise":
+        _RECORDER = None
+        return
+    # pylint: disable=import-outside-toplevel,cyclic-import,redefined-outer-name
+    from .sinks import LoggingSink, Recorder
+    _RECORDER = Recorder(LoggingSink() if sink is None else sink, limit, period)
+
+
+_WARN_RECORDER: Optional["Recorder"] = None
+_WARN_LOCK = Lock()
+
+
+def _level(module: str) -> str:
+    """Return the enforcement level of the module according to the policy, or "off" if access checks are disabled."""
+    return policies.module_level(module) if _CHECK_ACCESS else "off"
+
+
+def _enforced(member: Any, module: str) -> bool:
+    """Return whether the method or attribute should get an access modifier, according to the level of its module.
+    Methods and attributes in modules with level "warn" have their violations recorded instead of raised."""
+    level = _level(module)
+    if level == "warn":
+        policies.WARN_METHODS.add(member)
+    return level != "off"
+
+
+def _violation(method: Member, modifier: str, caller_frame) -> int:
+    """Raise an AccessException, or record the violation if violations are recorded instead of raised."""
+    global _WARN_RECORDER  # pylint: disable=global-statement
+    recorder = _RECORDER
+    if recorder is None:
+        warn_methods = policies.WARN_METHODS
+        if not warn_methods or method not in warn_methods:  # Checking the size first is faster if it's empty
+            caller_code = caller_frame.f_code
+            raise _access_exception(
+                _qualified_name(method), getattr(caller_code, "co_qualname", caller_code.co_name),
+                caller_code.co_filename, caller_frame.f_lineno, modifier)
+        with _WARN_LOCK:
+            if _WARN_RECORDER is None:
+                # pylint: disable=import-outside-toplevel,cyclic-import,redefined-outer-name
+                from .sinks import LoggingSink, Recorder
+                _WARN_RECORDER = Recorder(LoggingSink(), 100, 60.0)
+            recorder = _WARN_RECORDER
+    recorder.record(method, modifier, caller_frame)
+    return _VIOLATION
+
+
+_STATS: Optional["Stats"] = None
+
+
+def collect_stats(enabled: bool = True) -> None:
+    """Start or stop counting the access checks. Stopping discards the counts."""
+    global _STATS  # pylint: disable=global-statement
+    if not enabled:
+        _STATS = None
+    elif _STATS is None:
+        from .counters import Stats  # pylint: disable=import-outside-toplevel,cyclic-import,redefined-outer-name
+        _STATS = Stats()
+    _update_plain()
+
+
+def stats(reset: bool = False) -> Dict[str, Any]:
+    """Return the number of access checks, cache hits, and violations, and the nanoseconds spent checking, in total
+    and per method with access modifier and per caller code location ("filename:line"). Reset the counts if reset is
+    true. Returns zero counts if collecting stats is off, see collect_stats()."""
+    current_stats = _STATS
+    if current_stats is None:
+        return dict(checks=0, cache_hits=0, violations=0, ns=0, methods={})
+    return current_stats.snapshot(reset)
+
+
+def _check_access(
+        check: Callable[..., int], cache: Optional[_VerdictCache], member: Member, args: Tuple, depth: int) -> None:
+    """Check whether the caller may access the member with the check, unless the sampler skips the check, and count
+    the check if collecting stats is on. The depth is the number of frames between the code calling this function and
+    the caller of the member. The code calling this function trims the access check frames from the traceback of the
+    exceptions, because a bare raise only does that in the outermost frame."""
+    sampler = _SAMPLER
+    if sampler is None or not sampler.skip(member, depth + 2):
+        current_stats = _STATS
+        if current_stats is None:
+            check(getframe(depth + 1), cache, member, args)
+        else:
+            current_stats.measure(check, getframe(depth + 1), cache, member, args)
+
+
+_CODE_INFO_SIZE = 4096  # Maximum number of code objects to remember the classification of
+# Code objects, keyed by id, see _VerdictCache, with whether they have a variable named self and are transparent
+_CODE_INFO: Dict[int, Tuple[CodeType, bool, bool]] = {}
+# Names of the code of lambdas, generator expressions, and comprehensions. Since Python 3.12, list, dict, and set
+# comprehensions are inlined in the code they are defined in (PEP 709), so they have no code object of their own.
+_TRANSPARENT_CODE_NAMES = frozenset(("<lambda>", "<genexpr>", "<listcomp>", "<dictcomp>", "<setcomp>"))
+_MAX_WALK_DEPTH = 32  # Maximum number of nested transparent frames between a private method and its calling method
+
+
+def _code_info(code: CodeType) -> Tuple[CodeType, bool, bool]:
+    """Remember and return the code with whether it has a local, cell, or free variable named self, and whether it
+    is transparent: code with a name like <lambda>, <genexpr>, or <module>, whose frames the access check of private
+    methods skips to find the calling method."""
+    if len(_CODE_INFO) >= _CODE_INFO_SIZE:
+        _CODE_INFO.clear()
+    info = _CODE_INFO[id(code)] = (
+        code, "self" in code.co_varnames + code.co_cellvars + code.co_freevars, code.co_name.startswith("<"))
+    return info
+
+
+_ALLOWLIST_RECORDER: Optional["AllowlistRecorder"] = None
+_ALLOWLIST: Optional["Allowlist"] = None
+_PLAIN = True  # Whether sampling, collecting stats, and the allowlist are off, so the method wrappers check directly
+
+
+def _update_plain() -> None:
+    """Update whether sampling, collecting stats, and the allowlist are off."""
+    global _PLAIN  # pylint: disable=global-statement
+    _PLAIN = _SAMPLER is None and _STATS is None and _ALLOWLIST is None and _ALLOWLIST_RECORDER is None
+
+
+def allowlist(mode: str = "off", path: str = "access-modifiers-allowlist.txt") -> None:
+    """If the mode is "record", record which code the access checks allow to call which methods with access modifiers,
+    for example while running the tests, and write the pairs to the file, adding to the pairs already in it, when
+    recording stops and when the program exits. If the mode is "enforce", read the pairs from the file and only allow
+    calls of these pairs, without further checks. The default mode, "off", stops recording or enforcing."""
+    global _ALLOWLIST, _ALLOWLIST_RECORDER  # pylint: disable=global-statement
+    if mode not in ("off", "record", "enforce"):
+        raise ValueError(f"Expected allowlist mode 'off', 'record', or 'enforce', got {mode!r}")
+    recorder = _ALLOWLIST_RECORDER
+    _ALLOWLIST = _ALLOWLIST_RECORDER = None
+    if recorder is not None:
+        atexit.unregister(recorder.save)
+        recorder.save()
+    # pylint: disable=import-outside-toplevel,cyclic-import,redefined-outer-name
+    from .allowlists import Allowlist, AllowlistRecorder
+    if mode == "record":
+        _ALLOWLIST_RECORDER = AllowlistRecorder(path)
+    elif mode == "enforce":
+        _ALLOWLIST = Allowlist(path)
+    _update_plain()
+
+
+def _check_private(  # pylint: disable=unused-argument
+        caller_frame, cache: _VerdictCache, method: Member, args: Tuple) -> int:
+    """Check whether the caller may call the private method, or access the private attribute. Return _CACHED if the
+    verdict was cached, _CHECKED if not, and _VIOLATION if the caller may not call the method and the violation was
+    recorded instead of raised."""
+    caller_code = caller_frame.f_code
+    if _ALLOWLIST is not None:
+        return _ALLOWLIST.check(caller_frame, method, cache.modifier)
+    # Lambdas, generator expressions, comprehensions, and modules count as part of the code that runs them, so skip
+    # their frames to find the calling method, but not too many
+    frame = caller_frame
+    code_info = _CODE_INFO.get(id(caller_code)) or _code_info(caller_code)
+    depth = 0
+    while code_info[2] and frame.f_back is not None:
+        if depth == _MAX_WALK_DEPTH:
+            return _violation(method, cache.modifier, caller_frame)  # Too deeply nested to find the calling method
+        depth += 1
+        frame = frame.f_back
+        caller_code = frame.f_code
+        code_info = _CODE_INFO.get(id(caller_code)) or _code_info(caller_code)
+    if not code_info[1]:
+        return _violation(method, cache.modifier, caller_frame)  # The calling code has no self, so it's not a method
+    caller_class = frame.f_locals.get("self").__class__
+    key = (id(caller_code), id(caller_class))
+    result = _CACHED
+    if key not in cache.verdicts and key not in cache.callers:
+        # Look up the caller code to see if it's part of a method defined in the same class as the wrapped method
+        for cls in caller_class.mro():
+            if cls.__qualname__ == cache.class_qualname and any(
+                    code is caller_code for attribute in list(vars(cls).values())
+                    for function in _functions(attribute) for code in _transparent_codes(function.__code__)):
+                cache.add(key, caller_code, caller_class, True)
+                result = _CHECKED
+                break
+        else:
+            return _violation(method, cache.modifier, caller_frame)
+    if _ALLOWLIST_RECORDER is not None:
+        _ALLOWLIST_RECORDER.add(caller_frame, method)
+    return result
+
+
+# Code flags of coroutine functions and of all functions whose code starts running when the generator or coroutine
+# they return is first resumed, rather than when they are called: generator functions, coroutine functions, and async
+# generator functions. See the inspect module.
+_CO_COROUTINE = 0x80
+_RESUMABLE_CODE_FLAGS = 0x20 | _CO_COROUTINE | 0x100 | 0x200
+
+
+def _code_flags(method: Callable) -> int:
+    """Return the code flags of the method, or 0 if it has no code."""
+    return getattr(getattr(method, "__code__", None), "co_flags", 0)
+
+
+def _mark_coroutine_function(method: Callable, wrapper: Callable) -> Callable:
+    """Mark the wrapper as coroutine function if the method is one, so asyncio.iscoroutinefunction() and, since
+    Python 3.12, inspect.iscoroutinefunction() recognize it. The wrapper returns the coroutine of the method, so
+    awaiting it doesn't add an await layer."""
+    if not _code_flags(method) & _CO_COROUTINE:
+        return wrapper
+    if sys.version_info >= (3, 12):  # pylint: disable=no-else-return
+        from inspect import markcoroutinefunction  # pragma: nocover, pylint: disable=import-outside-toplevel
+        return markcoroutinefunction(wrapper)  # pragma: nocover
+    else:  # pragma: nocover, before Python 3.12, only asyncio.iscoroutinefunction() recognizes coroutine functions
+        from asyncio import coroutines  # pylint: disable=import-outside-toplevel
+        wrapper._is_coroutine = coroutines._is_coroutine  # type: ignore  # pylint: disable=protected-access
+        return wrapper
+
+
+class _ForwardedAttribute(str):
+    """Docstring or module name of a class whose instances wrap a method. Looked up on the class, it's the class's own
+    docstring or module name; looked up on an instance, it's the one of the function of the wrapped method."""
+
+    name: str
+
+    def __new__(cls, name: str, value: str) -> "_ForwardedAttribute":
+        attribute = super().__new__(cls, value)
+        attribute.name = name
+        return attribute
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        return self if instance is None else getattr(_function(instance.__wrapped__), self.name)
+
+
+class _WrapsMethod:  # pylint: disable=too-few-public-methods
+    """Mixin for classes whose instances wrap a method, stored as __wrapped__, that makes the instances report the
+    docstring, module, name, qualified name, and other attributes of the function of the method, like the wrappers
+    created with functools.wraps do."""
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in ("__doc__", "__module__"):
+            setattr(cls, name, _ForwardedAttribute(name, vars(cls).get(name) or ""))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_function(self.__wrapped__), name)  # type: ignore[attr-defined]
+
+
+class _MethodWithAccessModifier(_WrapsMethod):
+    """Descriptor for a method with an access modifier. Creating the function that checks the calls of the method,
+    the wrapper, takes more time and memory than creating the descriptor, so the wrapper is only created when the
+    method is first looked up. The wrapper then replaces the descriptor in the class that owns it, so later lookups and
+    calls of the method are those of a plain function. Static methods and properties don't look up the descriptor but
+    call it, so it calls a second wrapper that looks one frame further up for the caller."""
+
+    __slots__ = ("__wrapped__", "cache", "owner", "name", "wrapper", "call_wrapper", "__weakref__")
+    check: ClassVar[Callable[..., int]]  # The access check of the subclass
+
+    def __init__(self, method: Callable, cache: Optional[_VerdictCache]) -> None:
+        self.__wrapped__ = method
+        self.cache = cache
+        self.owner: Optional[type] = None
+        self.name = ""
+        self.wrapper: Optional[Callable] = None
+        self.call_wrapper: Optional[Callable] = None
+        _WRAPPERS.add(self)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+        _add_owner(self, owner)
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Callable:
+        wrapper = self.wrapper or self._install_wrapper()
+        return wrapper if instance is None else MethodType(wrapper, instance)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        if self.call_wrapper is None:
+            self.call_wrapper = self._wrap(depth=2)
+        return self.call_wrapper(*args, **kwargs)
+
+    def _install_wrapper(self) -> Callable:
+        """Create the wrapper and put it in place of the descriptor in the class that owns it."""
+        self.wrapper = wrapper = self._wrap()
+        with _SWAP_LOCK:
+            if self.owner is not None and vars(self.owner).get(self.name) is self:
+                installed = self._class_attribute(wrapper)
+                type.__setattr__(self.owner, self.name, installed)
+                _WRAPPERS.add(installed)
+                _add_owner(installed, self.owner)
+                _WRAPPERS.discard(self)
+        return wrapper
+
+    def _wrap(self, depth: int = 1) -> Callable:
+        """Return the wrapper that checks the calls of the method with the check of the subclass. The depth is the
+        number of frames between the wrapper and the caller of the method. Class methods and static methods are bound
+        to the class they're looked up on, which static methods don't pass on."""
+        function, check, cache = _function(self.__wrapped__), self.check, self.cache
+        is_static = isinstance(self.__wrapped__, staticmethod)
+        @wraps(function)
+        def method_wrapper(*args, **kwargs):
+            """Wrap the original method to give it an access modifier."""
+            try:
+                if _PLAIN:
+                    check(getframe(depth), cache, function, args)
+                else:
+                    _check_access(check, cache, function, args, depth)
+            except AccessException as exception:
+                exception.__traceback__ = None  # Trim the access check frames from the traceback
+                raise
+            return function(*args[1:], **kwargs) if is_static else function(*args, **kwargs)
+        return _mark_coroutine_function(function, method_wrapper)
+
+    def _class_attribute(self, wrapper: Callable) -> Any:
+        """Return the attribute that takes the place of the descriptor in the class that owns it."""
+        return wrapper
+
+
+class _PrivateMethod(_MethodWithAccessModifier):  # pylint: disable=too-few-public-methods
+    """Descriptor for a private method."""
+
+    __slots__ = ()
+    cache: _VerdictCache
+    check = staticmethod(_check_private)
 
 
 def privatemethod(method: Callable[..., ReturnType]) -> Callable[..., ReturnType]:
-    """Decorator that creates a private method."""
-    if not _CHECK_ACCESS:
+    """Decorator that creates a private method. Put it above the classmethod or staticmethod decorator to create a
+    private class method or static method."""
+    function = _function(method)
+    if not _enforced(function, getattr(function, "__module__", None) or ""):
         return method
-    method_class_qualname = getframe(1).f_locals.get("__qualname__")
-    @wraps(method)
-    def private_method_wrapper(*args, **kwargs) -> ReturnType:
-        """Wrap the original method to make it private."""
-        caller_frame = getframe(1)
-        caller_code = caller_frame.f_code
-        caller_name = caller_code.co_name
-        while caller_name.startswith("<") and caller_frame.f_back:
-            # Code is a <lambda>, <dictcomp>, <listcomp>, or other non-method code block
-            caller_frame = caller_frame.f_back
-            caller_code = caller_frame.f_code
-            caller_name = caller_code.co_name
-        caller_class = caller_frame.f_locals.get("self").__class__
-        # Look up the caller method to see if it's defined in the same class as the wrapped method
-        classes = [cls for cls in caller_class.mro() if caller_name in cls.__dict__]
-        for cls in classes:
-            caller = cls.__dict__[caller_name]
-            caller = caller.__dict__["__wrapped__"] if "__wrapped__" in caller.__dict__ else caller
-            if caller.__code__ == caller_code and method_class_qualname == cls.__qualname__:
-                return method(*args, **kwargs)
-        raise AccessException(f"Attempted call to private method {method} from outside its class")
-    return private_method_wrapper
+    return _private_method(method, getframe(1).f_locals.get("__qualname__"))
+
+
+def _function(method: Any) -> Callable:
+    """Return the function of the class method or static method, or the method itself if it's neither."""
+    return method.__func__ if isinstance(method, (classmethod, staticmethod)) else method
+
+
+def _private_method(method: Any, class_qualname: Optional[str]) -> Any:
+    """Return the private method, class method, or static method of the class with the qualified name."""
+    function = _function(method)
+    cache = _VERDICT_CACHES[function] = _VerdictCache(class_qualname, _VERDICT_CACHE_SIZE)
+    if function is not method:
+        return _ClassLevelMethod(method, cache)
+    if _BACKEND == "monitoring" and not _code_flags(method) & _RESUMABLE_CODE_FLAGS:  # pragma: nocover, Python < 3.12
+        from .monitoring import monitor  # pylint: disable=import-outside-toplevel,cyclic-import
+        monitor(method, cache)
+        return method
+    return _PrivateMethod(method, cache)
+
+
+def _check_protected(  # pylint: disable=unused-argument
+        caller_frame, cache: None, method: Member, args: Tuple) -> int:
+    """Check whether the caller may call the protected method, or access the protected attribute. Return _CHECKED,
+    because protected method verdicts are not cached, or _VIOLATION if the caller may not call the method and the
+    violation was recorded instead of raised."""
+    if _ALLOWLIST is not None:
+        return _ALLOWLIST.check(caller_frame, method, _modifier(method))
+    try:
+        instance = args[0]
+    except IndexError:
+        raise TypeError(
+            f"Protected method {_qualified_name(method)} called without self; to create a protected static method, "
+            "put @protectedmethod above @staticmethod") from None
+    if caller_frame.f_locals.get("self") is not instance:
+        return _violation(method, _modifier(method), caller_frame)
+    if _ALLOWLIST_RECORDER is not None:
+        _ALLOWLIST_RECORDER.add(caller_frame, method)
+    return _CHECKED
+
+
+class _ProtectedMethod(_MethodWithAccessModifier):  # pylint: disable=too-few-public-methods
+    """Descriptor for a protected method."""
+
+    __slots__ = ()
+    check = staticmethod(_check_protected)
+
+    def _wrap(self, depth: int = 1) -> Callable:
+        """Return the wrapper that checks the calls of the method. If sampling, collecting stats, and the allowlist are
+        off, the wrapper compares the caller's self with the instance itself, so allowed calls take no extra calls."""
+        function = self.__wrapped__
+        @wraps(function)
+        def method_wrapper(*args, **kwargs):
+            """Wrap the original method to give it an access modifier."""
+            if _PLAIN and args and getframe(depth).f_locals.get("self") is args[0]:
+                return function(*args, **kwargs)
+            try:
+                _check_access(_check_protected, None, function, args, depth)
+            except AccessException as exception:
+                exception.__traceback__ = None  # Trim the access check frames from the traceback
+                raise
+            return function(*args, **kwargs)
+        return _mark_coroutine_function(function, method_wrapper)
 
 
 def protectedmethod(method: Callable[..., ReturnType]) -> Callable[..., ReturnType]:
-    """Decorator that creates a protected method."""
-    if not _CHECK_ACCESS:
+    """Decorator that creates a protected method. Put it above the classmethod or staticmethod decorator to create a
+    protected class method or static method."""
+    function = _function(method)
+    if not _enforced(function, getattr(function, "__module__", None) or ""):
+        return method
+    return _protected_method(method)
+
+
+def _protected_method(method: Any) -> Any:
+    """Return the protected method, class method, or static method."""
+    function = _function(method)
+    if function is not method:
+        cache = _VERDICT_CACHES[function] = _VerdictCache(None, _VERDICT_CACHE_SIZE, "protected")
+        return _ClassLevelMethod(method, cache)
+    if _BACKEND == "monitoring" and not _code_flags(method) & _RESUMABLE_CODE_FLAGS:  # pragma: nocover, Python < 3.12
+        from .monitoring import monitor  # pylint: disable=import-outside-toplevel,cyclic-import
+        monitor(method, None)
         return method
-    @wraps(method)
-    def protected_method_wrapper(*args, **kwargs) -> ReturnType:
-        """Wrap the original method to make it protected."""
-        caller_frame = getframe(1)
-        caller_instance = caller_frame.f_locals.get("self")
-        if caller_instance is not args[0]:
-            raise AccessException(f"Attempted call to protected method {method} from another object")
-        return method(*args, **kwargs)
-    return protected_method_wrapper
+    return _ProtectedMethod(method, None)
+
+
+def _check_class_level(caller_frame, cache: _VerdictCache, method: Callable, args: Tuple) -> int:
+    """Check whether the caller may call the private or protected class method or static method, looked up on the
+    owner class, the first argument. Private ones may be called from the methods of the class that defines them,
+    protected ones from the methods of the owner class and its base classes, so calling a protected class method on a
+    subclass or an unrelated class isn't allowed. Verdicts are cached per caller code and owner class, so the caller's
+    locals aren't needed. Return _CACHED if the verdict was cached, _CHECKED if not, and _VIOLATION if the caller may
+    not call the method and the violation was recorded instead of raised."""
+    caller_code = caller_frame.f_code
+    if _ALLOWLIST is not None:
+        return _ALLOWLIST.check(caller_frame, method, cache.modifier)
+    owner = args[0]
+    key = (id(caller_code), id(owner))
+    verdict = True if key in cache.callers else cache.verdicts.get(key)
+    result = _CHECKED if verdict is None else _CACHED
+    if verdict is None:
+        private = cache.modifier == "private"
+        verdict = cache.add(key, caller_code, owner, any(
+            code is caller_code for cls in owner.mro() if not private or cls.__qualname__ == cache.class_qualname
+            for attribute in list(vars(cls).values()) for function in _functions(attribute)
+            for code in _transparent_codes(function.__code__)))
+    if not verdict:
+        return _violation(method, cache.modifier, caller_frame)
+    if _ALLOWLIST_RECORDER is not None:
+        _ALLOWLIST_RECORDER.add(caller_frame, method)
+    return result
+
+
+class _ClassMethodWrapper(_WrapsMethod, classmethod):  # pylint: disable=too-few-public-methods
+    """Class method that takes the place of a class method with an access modifier in the class that owns it, keeping
+    the original so disable() can put it back."""
+
+    __slots__ = ("__wrapped__", "__weakref__")
+
+    def __init__(self, wrapper: Callable, original: Any) -> None:
+        super().__init__(wrapper)
+        self.__wrapped__ = original  # type: ignore[misc]
+
+
+class _StaticMethodWrapper(_WrapsMethod, staticmethod):  # pylint: disable=too-few-public-methods
+    """Static method that takes the place of a static method with an access modifier in the class that owns it,
+    keeping the original so disable() can put it back. Like a class method, it binds the wrapper to the class it's
+    looked up on, so the access check knows the class."""
+
+    __slots__ = ("__wrapped__", "__weakref__")
+
+    def __init__(self, wrapper: Callable, original: Any) -> None:
+        super().__init__(wrapper)
+        self.__wrapped__ = original  # type: ignore[misc]
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Callable:
+        return MethodType(self.__func__, owner if owner is not None else type(instance))
+
+
+class _ClassLevelMethod(_MethodWithAccessModifier):  # pylint: disable=too-few-public-methods
+    """Descriptor for a class method or static method with an access modifier. The wrapper is bound to the class the
+    method is looked up on, like a class method, so the access check knows the class without inspecting the caller's
+    locals. It takes the place of the descriptor as class method or static method, like the original. The monitoring
+    backend doesn't know the class, so these methods are always wrapped."""
+
+    __slots__ = ()
+    cache: _VerdictCache
+    check = staticmethod(_check_class_level)
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Callable:
+        wrapper = self.wrapper or self._install_wrapper()
+        return MethodType(wrapper, owner if owner is not None else type(instance))
+
+    def _class_attribute(self, wrapper: Callable) -> Any:
+        if isinstance(self.__wrapped__, staticmethod):
+            return _StaticMethodWrapper(wrapper, self.__wrapped__)
+        return _ClassMethodWrapper(wrapper, self.__wrapped__)
+
+
+_HIDDEN_SLOTS: "WeakKeyDictionary[type, Dict[str, Any]]" = WeakKeyDictionary()  # Removed slot descriptors per class
+
+
+def _slot_members(cls: type) -> Iterator[Tuple[str, Any]]:
+    """Yield the names and descriptors of the slots of the class and its base classes, including the slots that were
+    removed from the classes because they store attributes with access modifiers."""
+    for klass in cls.__mro__:
+        hidden = _HIDDEN_SLOTS.get(klass, {})
+        slots = vars(klass).get("__slots__", ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot.startswith("__") and not slot.endswith("__"):
+                slot = f"_{klass.__name__.lstrip('_')}{slot}"  # Private names are mangled
+            member = hidden.get(slot, vars(klass).get(slot))
+            if isinstance(member, MemberDescriptorType):
+                yield slot, member
+
+
+def _get_state(instance: Any) -> Any:
+    """Return the state of the instance for copy and pickle, in the format of object.__getstate__(), which skips the
+    removed slots."""
+    slots = {}
+    for slot, member in _slot_members(type(instance)):
+        try:
+            slots[slot] = member.__get__(instance)
+        except AttributeError:
+            pass  # The slot has no value
+    instance_dict = getattr(instance, "__dict__", None) or None
+    return (instance_dict, slots) if slots else instance_dict
+
+
+def _set_state(instance: Any, state: Any) -> None:
+    """Restore the state returned by _get_state()."""
+    instance_dict, slots = state if isinstance(state, tuple) else (state, None)
+    if instance_dict:
+        vars(instance).update(instance_dict)
+    members = dict(_slot_members(type(instance)))
+    for slot, value in (slots or {}).items():
+        members[slot].__set__(instance, value)
+
+
+class _GuardedAttribute:
+    """Descriptor for an attribute with an access modifier. The value is stored in a slot of the instance, whose own
+    descriptor the access is delegated to after the access check, so instances don't need a __dict__. The descriptor
+    of the slot is removed from the class, so code outside the class can't bypass the access check by accessing the
+    slot. Classes without their own __getstate__ and __setstate__ get ones that copy and pickle the removed slots."""
+
+    __slots__ = ("__wrapped__", "cache", "slot", "enforced", "qualified_name", "__weakref__")
+    modifier = ""
+    check: ClassVar[Callable[..., int]]  # The access check of the subclass
+
+    def __init__(self, slot: Optional[str], cache: Optional[_VerdictCache], enforced: bool) -> None:
+        self.__wrapped__: Any = None  # The descriptor of the slot, set when the class is created
+        self.cache = cache
+        self.slot = slot
+        self.enforced = enforced
+        self.qualified_name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        slot = self.slot or f"_{name}"
+        self.qualified_name = f"{owner.__module__}.{owner.__qualname__}.{name}"
+        member = getattr(owner, slot, None)
+        if not isinstance(member, MemberDescriptorType):
+            raise TypeError(f"Expected a slot named {slot!r} to store the {self.modifier} {self.qualified_name}")
+        self.__wrapped__ = member
+        if self.enforced:
+            _add_owner(self, owner)
+            if vars(owner).get(slot) is member:
+                type.__delattr__(owner, slot)
+                _HIDDEN_SLOTS.setdefault(owner, {})[slot] = member
+                if getattr(owner, "__getstate__", None) in (None, getattr(object, "__getstate__", None), _get_state) \
+                        and getattr(owner, "__setstate__", None) in (None, _set_state):
+                    type.__setattr__(owner, "__getstate__", _get_state)  # So copy and pickle keep the removed slots
+                    type.__setattr__(owner, "__setstate__", _set_state)
+            _WRAPPERS.add(self)
+        else:
+            type.__setattr__(owner, name, member)  # Without access checks, access the slot directly
+
+    def __repr__(self) -> str:
+        return f"<{self.modifier} {self.qualified_name}>"
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            _check_access(self.check, self.cache, self, (instance,), 1)
+        except AccessException as exception:
+            exception.__traceback__ = None  # Trim the access check frames from the traceback
+            raise
+        return self.__wrapped__.__get__(instance, owner)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        try:
+            _check_access(self.check, self.cache, self, (instance,), 1)
+        except AccessException as exception:
+            exception.__traceback__ = None  # Trim the access check frames from the traceback
+            raise
+        self.__wrapped__.__set__(instance, value)
+
+    def __delete__(self, instance: Any) -> None:
+        try:
+            _check_access(self.check, self.cache, self, (instance,), 1)
+        except AccessException as exception:
+            exception.__traceback__ = None  # Trim the access check frames from the traceback
+            raise
+        self.__wrapped__.__delete__(instance)
+
+
+class _PrivateAttribute(_GuardedAttribute):  # pylint: disable=too-few-public-methods
+    """Descriptor for a private attribute."""
+
+    __slots__ = ()
+    cache: _VerdictCache
+    modifier = "private attribute"
+    check = staticmethod(_check_private)
+
+
+class _ProtectedAttribute(_GuardedAttribute):  # pylint: disable=too-few-public-methods
+    """Descriptor for a protected attribute."""
+
+    __slots__ = ()
+    modifier = "protected attribute"
+    check = staticmethod(_check_protected)
+
+
+def privateattribute(slot: Optional[str] = None) -> Any:
+    """Create a private attribute, stored in the slot, by default the name of the attribute prefixed with an
+    underscore. The slot needs to be declared in __slots__."""
+    class_frame = getframe(1)
+    cache = _VerdictCache(class_frame.f_locals.get("__qualname__"), _VERDICT_CACHE_SIZE, _PrivateAttribute.modifier)
+    attribute = _PrivateAttribute(slot, cache, True)
+    attribute.enforced = _enforced(attribute, class_frame.f_globals.get("__name__", ""))
+    _VERDICT_CACHES[attribute] = cache
+    return attribute
+
+
+def protectedattribute(slot: Optional[str] = None) -> Any:
+    """Create a protected attribute, stored in the slot, by default the name of the attribute prefixed with an
+    underscore. The slot needs to be declared in __slots__."""
+    attribute = _ProtectedAttribute(slot, None, True)
+    attribute.enforced = _enforced(attribute, getframe(1).f_globals.get("__name__", ""))
+    return attribute
+
+
+_BACKEND = "wrapper"
+
+
+def use_backend(name: str = "wrapper") -> None:
+    """Use the backend to check the calls of methods decorated from now on. The "wrapper" backend, the default, wraps
+    the methods in a function that checks the caller. The "monitoring" backend, available since Python 3.12, leaves
+    the methods unwrapped and checks the caller when they start, using sys.monitoring."""
+    global _BACKEND  # pylint: disable=global-statement
+    if name not in ("wrapper", "monitoring"):
+        raise ValueError(f"Expected backend 'wrapper' or 'monitoring', got {name!r}")
+    if name == "monitoring":
+        if sys.version_info < (3, 12):  # pragma: nocover, the tests run on one Python version at a time
+            raise ValueError("The monitoring backend needs Python 3.12 or newer")
+        from .monitoring import claim_tool  # pragma: nocover, pylint: disable=import-outside-toplevel,cyclic-import
+        claim_tool()  # pragma: nocover
+    _BACKEND = name
+
+
+def _functions(attribute: Any) -> Iterator[FunctionType]:
+    """Yield the functions in a class attribute, unwrapped from static methods, class methods, properties, and access
+    modifier wrappers."""
+    if isinstance(attribute, (staticmethod, classmethod)):
+        yield from _functions(attribute.__func__)
+    elif isinstance(attribute, property):
+        for accessor in (attribute.fget, attribute.fset, attribute.fdel):
+            yield from _functions(accessor)
+    elif isinstance(attribute, _MethodWithAccessModifier):
+        yield from _functions(attribute.__wrapped__)
+    elif isinstance(attribute, FunctionType):
+        yield attribute
+        if "__wrapped__" in attribute.__dict__:
+            yield from _functions(attribute.__dict__["__wrapped__"])
+
+
+def _transparent_codes(code: CodeType) -> Iterator[CodeType]:
+    """Yield the code and the code of the lambdas and comprehensions in it, recursively. Like the access checks, these
+    count as part of the code they are defined in; nested functions and classes don't."""
+    yield code
+    for constant in code.co_consts:
+        if isinstance(constant, CodeType) and constant.co_name in _TRANSPARENT_CODE_NAMES:
+            yield from _transparent_codes(constant)
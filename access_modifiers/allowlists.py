@@ -0,0 +1,124 @@
+"""Allowlist of the methods with access modifiers and the code that may call them, see access_modifiers.allowlist().
+
+Each line of the allowlist file has the identities of a method with access modifier and of code allowed to call it,
+separated by a tab. The identities contain the module, qualified name, and first line of the code, so they're stable
+across processes.
+"""
+
+import atexit
+import os
+import sys
+from types import CodeType
+from typing import Callable, Dict, FrozenSet, IO, Set, Tuple, cast
+
+from .access_modifiers import _CACHED, Member, _GuardedAttribute, _violation
+
+
+_IDENTITIES_SIZE = 4096  # Maximum number of code objects and methods to remember the identity of
+_IDENTITIES: Dict[int, Tuple[CodeType, str]] = {}  # Code objects, keyed by id, with their identity, see _identity()
+# Methods with access modifiers, keyed by id, with their identity, see _callee_identity()
+_CALLEE_IDENTITIES: Dict[int, Tuple[Callable, str]] = {}
+
+Pair = Tuple[str, str]  # Identities of a method with access modifier and of code allowed to call it
+
+
+def _identity(code: CodeType, module: str) -> str:
+    """Return the identity of the code that is stable across processes: its module, qualified name, and first line.
+    Code objects have a qualified name since Python 3.11; before, their name is used."""
+    entry = _IDENTITIES.get(id(code))
+    if entry is None:
+        if len(_IDENTITIES) >= _IDENTITIES_SIZE:
+            _IDENTITIES.clear()
+        entry = _IDENTITIES[id(code)] = (
+            code, f"{module}:{getattr(code, 'co_qualname', code.co_name)}:{code.co_firstlineno}")
+    return entry[1]
+
+
+def _callee_identity(method: Member) -> str:
+    """Return the identity of the method with access modifier, like _identity(), but with the qualified name of the
+    method, so it's the same on all Python versions, or the qualified name of the attribute with access modifier."""
+    if isinstance(method, _GuardedAttribute):
+        return method.qualified_name
+    entry = _CALLEE_IDENTITIES.get(id(method))
+    if entry is None:
+        if len(_CALLEE_IDENTITIES) >= _IDENTITIES_SIZE:
+            _CALLEE_IDENTITIES.clear()
+        entry = _CALLEE_IDENTITIES[id(method)] = (
+            method, f"{method.__module__}:{method.__qualname__}:{method.__code__.co_firstlineno}")
+    return entry[1]
+
+
+def _pair(caller_frame, method: Member) -> Pair:
+    """Return the identities of the method and of the caller code."""
+    return _callee_identity(method), _identity(caller_frame.f_code, caller_frame.f_globals.get("__name__", ""))
+
+
+def _read_pairs(path: str) -> Set[Pair]:
+    """Read the pairs from the allowlist file."""
+    with open(path, encoding="utf-8") as allowlist_file:
+        return _parse_pairs(allowlist_file, path)
+
+
+def _parse_pairs(allowlist_file: IO[str], path: str) -> Set[Pair]:
+    """Parse the pairs in the allowlist file: one pair per line, the identities separated by a tab."""
+    pairs = set()
+    for line_number, line in enumerate(allowlist_file, start=1):
+        pair = tuple(line.rstrip("\n").split("\t"))
+        if len(pair) != 2:
+            raise ValueError(f"Expected two tab-separated identities on line {line_number} of {path}")
+        pairs.add(cast(Pair, pair))
+    return pairs
+
+
+def _lock(file: IO[str]) -> None:
+    """Lock the file until it's closed, waiting while another process has it locked."""
+    if sys.platform == "win32":  # pragma: nocover
+        import msvcrt  # pylint: disable=import-outside-toplevel,import-error
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)  # Locks the first byte, which needn't exist
+    else:
+        import fcntl  # pylint: disable=import-outside-toplevel
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+
+class AllowlistRecorder:
+    """Record the pairs of methods with access modifiers and the code the access checks allow to call them, and write
+    them to the allowlist file, together with the pairs in it, when recording stops and at exit."""
+
+    __slots__ = ("path", "pairs")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.pairs = _read_pairs(path) if os.path.exists(path) else set()
+        atexit.register(self.save)
+
+    def add(self, caller_frame, method: Member) -> None:
+        """Record that the caller may call the method."""
+        self.pairs.add(_pair(caller_frame, method))
+
+    def save(self) -> None:
+        """Add the pairs to the allowlist file. The file is locked while it's read and written, so processes that
+        record at the same time keep each other's pairs."""
+        with open(self.path, "a+", encoding="utf-8") as allowlist_file:
+            _lock(allowlist_file)
+            allowlist_file.seek(0)
+            pairs = _parse_pairs(allowlist_file, self.path).union(list(self.pairs))
+            allowlist_file.seek(0)
+            allowlist_file.truncate()
+            allowlist_file.writelines(sorted(f"{method}\t{caller}\n" for method, caller in pairs))
+
+
+class Allowlist:  # pylint: disable=too-few-public-methods
+    """Allowed pairs of methods with access modifiers and the code that may call them, read from the allowlist file.
+    Checking a call is one lookup of the pair; calls of other pairs are violations."""
+
+    __slots__ = ("pairs",)
+
+    def __init__(self, path: str) -> None:
+        self.pairs: FrozenSet[Pair] = frozenset(_read_pairs(path))
+
+    def check(self, caller_frame, method: Member, modifier: str) -> int:
+        """Check whether the caller may call the method."""
+        if _pair(caller_frame, method) in self.pairs:
+            return _CACHED
+        return _violation(method, modifier, caller_frame)
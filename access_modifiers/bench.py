@@ -0,0 +1,462 @@
+"""Benchmark suite for the access modifiers.
+
+Usage:
+    python -m access_modifiers.bench [--filter TEXT] [--repeat N] [--number N] [--output FILE]
+    python -m access_modifiers.bench --compare BASELINE [--threshold PERCENT] [...]
+    python -m access_modifiers.bench --threads [--filter TEXT] [--number N] [--output FILE]
+
+Each benchmark is measured with and without access modifier, so the overhead can be read from the results. Since
+Python 3.12, the benchmarks with access modifier are measured with both the wrapper and the sys.monitoring backend.
+The benchmarks vary the depth of the class hierarchy, the nesting depth of lambdas, comprehensions, and generator
+expressions, also in methods added to a class after it was created, the number of methods with access modifiers per
+class, given method by method or by the access_controlled class decorator in one pass, static methods, class methods,
+thousands of concurrent asyncio tasks calling private coroutine methods, and calls that raise an AccessException.
+Calls of protected methods are also measured with the wrapper of version 0.3.1, the baseline for their overhead.
+Each benchmark is warmed up and then repeated; the results contain the mean, median, standard deviation, and minimum
+time per statement in nanoseconds. Use --output to save the results as JSON and --compare to compare the results with
+saved results; benchmarks whose median got slower than the threshold are reported as regressions.
+
+With --threads, the benchmarks call methods with and without access modifier from 1 to 16 threads at once instead, and
+report the throughput and how it scales with the number of threads. Calls only scale on free-threaded Python builds.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import timeit
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .access_modifiers import use_backend
+
+
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+THREADED_NUMBER = 20_000  # Default number of calls per thread of the threaded benchmarks
+MINIMUM_DURATION = 0.01  # Minimum duration of one repetition, in seconds, when calibrating the number of statements
+UNDECORATED = "undecorated"
+BASELINE = "baseline"
+# Protected method decorator of version 0.3.1, which compared the caller's self with the instance and nothing else
+_BASELINE_PROTECTED_METHOD = """
+from functools import wraps
+from sys import _getframe as getframe
+from access_modifiers import AccessException
+def baselineprotectedmethod(method):
+    @wraps(method)
+    def protected_method_wrapper(*args, **kwargs):
+        if getframe(1).f_locals.get("self") is not args[0]:
+            raise AccessException
+        return method(*args, **kwargs)
+    return protected_method_wrapper
+"""
+
+Results = Dict[str, Dict[str, Any]]
+
+
+class Benchmark(NamedTuple):
+    """Statement to time, and the setup code to run before timing it."""
+
+    name: str
+    stmt: str
+    setup: str
+
+
+def _class_hierarchy(decorator: str, depth: int) -> str:
+    """Return the code of a class with a private method and a chain of subclasses of the given depth."""
+    return f"""
+from access_modifiers import privatemethod
+class C0:
+    {decorator}
+    def private_method(self):
+        pass
+    def public_method(self):
+        self.private_method()
+""" + "".join(f"class C{index}(C{index - 1}):\n    pass\n" for index in range(1, depth + 1)) + f"c = C{depth}()\n"
+
+
+def _nested_lambdas(decorator: str, depth: int) -> str:
+    """Return the code of a class whose public method calls a private method via nested lambdas."""
+    lambdas = "self.private_method()"
+    for _ in range(depth):
+        lambdas = f"(lambda: {lambdas})()"
+    return f"""
+from access_modifiers import privatemethod
+class C:
+    {decorator}
+    def private_method(self):
+        pass
+    def public_method(self):
+        {lambdas}
+c = C()
+"""
+
+
+def _nested_generator_expressions(decorator: str, depth: int) -> str:
+    """Return the code of a class whose public method calls a private method via nested generator expressions."""
+    generator_expressions = "self.private_method()"
+    for _ in range(depth):
+        generator_expressions = f"next({generator_expressions} for _ in (0,))"
+    return f"""
+from access_modifiers import privatemethod
+class C:
+    {decorator}
+    def private_method(self):
+        pass
+    def public_method(self):
+        {generator_expressions}
+c = C()
+"""
+
+
+def _method_added_later(decorator: str, depth: int) -> str:
+    """Return the code of a class with a public method, added after the class was created, that calls a private
+    method via nested lambdas. The public method is not lexically part of the class, so the access check needs to
+    skip the frames of the lambdas to find it."""
+    lambdas = "self.private_method()"
+    for _ in range(depth):
+        lambdas = f"(lambda: {lambdas})()"
+    return f"""
+from access_modifiers import privatemethod
+class C:
+    {decorator}
+    def private_method(self):
+        pass
+def public_method(self):
+    {lambdas}
+C.public_method = public_method
+c = C()
+"""
+
+
+def _nested_comprehensions(decorator: str, depth: int) -> str:
+    """Return the code of a class whose public method calls a private method via nested comprehensions."""
+    comprehensions = "self.private_method()"
+    for _ in range(depth):
+        comprehensions = f"[{comprehensions} for _ in (0,)]"
+    return f"""
+from access_modifiers import privatemethod
+class C:
+    {decorator}
+    def private_method(self):
+        pass
+    def public_method(self):
+        {comprehensions}
+c = C()
+"""
+
+
+def _asyncio_tasks(decorator: str, number_of_tasks: int) -> str:
+    """Return the code of a class whose coroutine method runs the number of concurrent asyncio tasks, each calling a
+    private coroutine method."""
+    return f"""
+import asyncio
+from access_modifiers import privatemethod
+class C:
+    {decorator}
+    async def private_method(self):
+        await asyncio.sleep(0)
+    async def public_method(self):
+        await self.private_method()
+    async def run_tasks(self):
+        await asyncio.gather(*(self.public_method() for _ in range({number_of_tasks})))
+c = C()
+"""
+
+
+def _class_creation(decorator: str, number_of_methods: int, class_decorator: str = "", bases: str = "",
+                    prefix: str = "") -> str:
+    """Return the code of a class with the number of methods, whose names have the prefix."""
+    methods = "".join(f"""
+    {decorator}
+    def {prefix}method{index}(self):
+        pass
+""" for index in range(number_of_methods))
+    return f"{class_decorator}\nclass C{bases}:{methods}"
+
+
+def _static_method(decorator: str) -> str:
+    """Return the code of a class whose public method calls a static private method."""
+    return f"""
+from access_modifiers import privatemethod
+class C:
+    @staticmethod
+    {decorator}
+    def private_method():
+        pass
+    def public_method(self):
+        self.private_method()
+c = C()
+"""
+
+
+def _class_method(decorator: str) -> str:
+    """Return the code of a class whose factory class method calls a private class method."""
+    return f"""
+from access_modifiers import privatemethod
+class C:
+    {decorator}
+    @classmethod
+    def private_method(cls):
+        pass
+    @classmethod
+    def create(cls):
+        cls.private_method()
+"""
+
+
+def _protected_method(decorator: str) -> str:
+    """Return the code of a class whose public method calls a protected method."""
+    return f"""
+from access_modifiers import protectedmethod
+{_BASELINE_PROTECTED_METHOD}
+class C:
+    def public_method(self):
+        self.protected_method()
+    {decorator}
+    def protected_method(self):
+        pass
+c = C()
+"""
+
+
+def _violation(decorator: str, modifier: str) -> str:
+    """Return the code of a function that calls a private or protected method from outside its class."""
+    return f"""
+from access_modifiers import AccessException, {modifier}
+class C:
+    {decorator}
+    def method(self):
+        raise AccessException
+def call(c):
+    try:
+        c.method()
+    except AccessException:
+        pass
+c = C()
+"""
+
+
+def _threaded_calls(decorator: str, modifier: str) -> str:
+    """Return the code of a class whose public method calls a method with the access modifier."""
+    return f"""
+from access_modifiers import {modifier}
+class C:
+    {decorator}
+    def method(self):
+        pass
+    def public_method(self):
+        self.method()
+"""
+
+
+def _backend(backend: str, setup: str) -> str:
+    """Return the setup code, preceded by code to select the backend of the access modifiers."""
+    return f"from access_modifiers import use_backend\nuse_backend({backend!r})\n{setup}"
+
+
+def _variants(modifier: str) -> Iterator[Tuple[str, str, str]]:
+    """Yield the variant name, decorator, and backend of the benchmarks without and with access modifier. The
+    monitoring backend is only available since Python 3.12."""
+    yield UNDECORATED, "", "wrapper"
+    yield modifier, f"@{modifier}", "wrapper"
+    if sys.version_info >= (3, 12):
+        yield f"{modifier}-monitoring", f"@{modifier}", "monitoring"  # pragma: nocover
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    """Yield all benchmarks, each once without and once or more with access modifier."""
+    for variant, decorator, backend in _variants("privatemethod"):
+        for depth in (0, 4, 16, 64):
+            yield Benchmark(f"call/mro-depth-{depth}/{variant}", "c.public_method()",
+                            _backend(backend, _class_hierarchy(decorator, depth)))
+        for depth in (1, 2, 5, 10):
+            yield Benchmark(f"call/lambda-depth-{depth}/{variant}", "c.public_method()",
+                            _backend(backend, _nested_lambdas(decorator, depth)))
+            yield Benchmark(f"call/comprehension-depth-{depth}/{variant}", "c.public_method()",
+                            _backend(backend, _nested_comprehensions(decorator, depth)))
+            yield Benchmark(f"call/genexpr-depth-{depth}/{variant}", "c.public_method()",
+                            _backend(backend, _nested_generator_expressions(decorator, depth)))
+            yield Benchmark(f"call/added-later-lambda-depth-{depth}/{variant}", "c.public_method()",
+                            _backend(backend, _method_added_later(decorator, depth)))
+        for number_of_methods in (1, 10, 100):
+            yield Benchmark(f"create/methods-{number_of_methods}/{variant}",
+                            _class_creation(decorator, number_of_methods),
+                            _backend(backend, "from access_modifiers import privatemethod"))
+        yield Benchmark(
+            f"call/staticmethod/{variant}", "c.public_method()", _backend(backend, _static_method(decorator)))
+        yield Benchmark(f"call/classmethod/{variant}", "C.create()", _backend(backend, _class_method(decorator)))
+        for number_of_tasks in (1_000, 10_000) if sys.version_info >= (3, 7) else ():  # Needs asyncio.run()
+            yield Benchmark(f"asyncio/tasks-{number_of_tasks}/{variant}", "asyncio.run(c.run_tasks())",
+                            _backend(backend, _asyncio_tasks(decorator, number_of_tasks)))
+    for variant, decorator, backend in list(_variants("privatemethod"))[1:]:
+        # Compare making the methods private and indexing the class in one pass with doing it method by method
+        setup = _backend(backend, "from access_modifiers import access_controlled, privatemethod, AccessControlled")
+        for number_of_methods in (1, 10, 100):
+            yield Benchmark(f"create/methods-{number_of_methods}/{variant}-indexed",
+                            _class_creation(decorator, number_of_methods, bases="(AccessControlled)"), setup)
+            yield Benchmark(
+                f"create/methods-{number_of_methods}/" + variant.replace("privatemethod", "access_controlled"),
+                _class_creation("", number_of_methods, class_decorator="@access_controlled", prefix="__"), setup)
+    for variant, decorator, backend in (*_variants("protectedmethod"),
+                                        (BASELINE, "@baselineprotectedmethod", "wrapper")):
+        yield Benchmark(
+            f"call/protected/{variant}", "c.public_method()", _backend(backend, _protected_method(decorator)))
+    for modifier in ("privatemethod", "protectedmethod"):
+        for variant, decorator, backend in _variants(modifier):
+            yield Benchmark(f"violation/{modifier}/{variant}", "call(c)",
+                            _backend(backend, _violation(decorator, modifier)))
+
+
+def measure(benchmark: Benchmark, repeat: int, number: Optional[int] = None) -> Dict[str, Any]:
+    """Warm up and time the benchmark. Return statistics of the time per statement in nanoseconds."""
+    timer = timeit.Timer(benchmark.stmt, benchmark.setup)
+    if number is None:
+        number = 1
+        while timer.timeit(number) < MINIMUM_DURATION:  # Calibrating also warms up
+            number *= 2
+    else:
+        timer.timeit(number)  # Warm up
+    times = [duration * 1e9 / number for duration in timer.repeat(repeat, number)]
+    use_backend()  # Don't leave the backend selected by the setup code in place
+    return dict(mean_ns=statistics.mean(times), median_ns=statistics.median(times),
+                stdev_ns=statistics.stdev(times) if len(times) > 1 else 0.0, min_ns=min(times), repeat=repeat,
+                number=number)
+
+
+def threaded_benchmarks() -> Iterator[Benchmark]:
+    """Yield the threaded benchmarks, each once without and once or more with access modifier. The statement is the
+    name of the method each thread calls on its own instance of class C."""
+    for modifier in ("privatemethod", "protectedmethod"):
+        for variant, decorator, backend in _variants(modifier):
+            yield Benchmark(f"threads/{modifier}/{variant}", "public_method",
+                            _backend(backend, _threaded_calls(decorator, modifier)))
+
+
+def measure_threads(benchmark: Benchmark, threads: int, number: int) -> float:
+    """Call the method number times from each of the threads at once. Return the number of calls per second."""
+    namespace: Dict[str, Any] = {}
+    exec(benchmark.setup, namespace)  # pylint: disable=exec-used
+    use_backend()  # Don't leave the backend selected by the setup code in place
+    barrier = threading.Barrier(threads + 1)
+
+    def call() -> None:
+        """Wait for the other threads and then call the method of a new instance."""
+        method = getattr(namespace["C"](), benchmark.stmt)
+        barrier.wait()
+        for _ in range(number):
+            method()
+
+    workers = [threading.Thread(target=call) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return threads * number / (time.perf_counter() - start)
+
+
+def run(name_filter: str = "", repeat: int = 5, number: Optional[int] = None) -> Dict[str, Any]:
+    """Run the benchmarks whose name contains the filter and return the results."""
+    results = {benchmark.name: measure(benchmark, repeat, number)
+               for benchmark in benchmarks() if name_filter in benchmark.name}
+    return dict(python=platform.python_version(), implementation=platform.python_implementation(), results=results)
+
+
+def run_threads(name_filter: str = "", number: int = THREADED_NUMBER,
+                thread_counts: Sequence[int] = THREAD_COUNTS) -> Dict[str, Any]:
+    """Run the threaded benchmarks whose name contains the filter and return the throughput per number of threads,
+    and its scaling compared to the first number of threads."""
+    results = {}
+    for benchmark in threaded_benchmarks():
+        if name_filter not in benchmark.name:
+            continue
+        measure_threads(benchmark, thread_counts[0], number)  # Warm up
+        throughputs = [measure_threads(benchmark, threads, number) for threads in thread_counts]
+        results[benchmark.name] = [
+            dict(threads=threads, calls_per_second=throughput, scaling=throughput / throughputs[0])
+            for threads, throughput in zip(thread_counts, throughputs)]
+    return dict(python=platform.python_version(), implementation=platform.python_implementation(),
+                gil=getattr(sys, "_is_gil_enabled", lambda: True)(), number=number, results=results)
+
+
+def report(results: Results) -> List[str]:
+    """Return a table with the results, including the overhead compared to the benchmark without access modifier."""
+    lines = [f"{'benchmark':<48} {'median ns':>12} {'stdev ns':>10} {'overhead':>9}"]
+    for name, result in sorted(results.items()):
+        undecorated = results.get(name.rsplit("/", 1)[0] + "/" + UNDECORATED)
+        overhead = f"{result['median_ns'] / undecorated['median_ns']:.1f}x" if undecorated else ""
+        lines.append(f"{name:<48} {result['median_ns']:>12.0f} {result['stdev_ns']:>10.0f} {overhead:>9}")
+    return lines
+
+
+def report_threads(results: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+    """Return a table with the throughput of the threaded benchmarks, and its scaling with the number of threads."""
+    lines: List[str] = []
+    for name, measurements in sorted(results.items()):
+        if not lines:
+            lines.append(f"{'benchmark':<48} {'calls/s':>12}" + "".join(
+                f" {str(measurement['threads']) + ' thr':>8}" for measurement in measurements))
+        lines.append(f"{name:<48} {measurements[0]['calls_per_second']:>12.0f}" + "".join(
+            f" {measurement['scaling']:>7.1f}x" for measurement in measurements))
+    return lines
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> List[str]:
+    """Return a table comparing the results with the baseline. Medians that are more than the threshold percentage
+    slower than the baseline are marked as regression."""
+    lines = [f"{'benchmark':<48} {'baseline ns':>12} {'median ns':>12} {'change':>8}"]
+    for name in results.keys() & baseline.keys():
+        change = (results[name]["median_ns"] / baseline[name]["median_ns"] - 1) * 100
+        regression = "  REGRESSION" if change > threshold else ""
+        lines.append(f"{name:<48} {baseline[name]['median_ns']:>12.0f} {results[name]['median_ns']:>12.0f} "
+                     f"{change:>+7.1f}%{regression}")
+    return lines[:1] + sorted(lines[1:])
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Return the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m access_modifiers.bench", description="Benchmark the access modifiers.")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions per benchmark (default: 5)")
+    parser.add_argument("--number", type=int, help="number of statements per repetition (default: calibrated)")
+    parser.add_argument("--output", help="save the results as JSON in this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare the results with the results in this file")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percentage a median may be slower than the baseline (default: 10)")
+    parser.add_argument("--threads", action="store_true",
+                        help=f"measure the throughput of calls from {', '.join(map(str, THREAD_COUNTS))} threads "
+                             f"instead (default number of calls per thread: {THREADED_NUMBER})")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmarks and print the results. Return 1 if there are regressions, 0 otherwise."""
+    args = parse_arguments(argv)
+    if args.threads:
+        results = run_threads(args.filter, args.number or THREADED_NUMBER)
+        lines = report_threads(results["results"])
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output_file:
+                json.dump(results, output_file, indent=2)
+        print("\n".join(lines))
+        return 0
+    results = run(args.filter, args.repeat, args.number)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        lines = compare(results["results"], baseline["results"], args.threshold)
+    else:
+        lines = report(results["results"])
+    print("\n".join(lines))
+    return 1 if any(line.endswith("REGRESSION") for line in lines) else 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
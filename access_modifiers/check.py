@@ -0,0 +1,337 @@
+"""Static access checker for the access modifiers.
+
+Usage: python -m access_modifiers.check [--jobs N] [--cache FILE | --no-cache] path [path ...]
+
+The checker parses the Python files with the ast module, finds methods decorated with @privatemethod and
+@protectedmethod, and reports call sites that would raise an AccessException at runtime. Like the runtime checks,
+lambdas and comprehensions count as part of the method they are defined in, nested functions don't. Calls are only
+checked if the type of the receiver is known: self, super(), a class, an instance created by calling a class, or a
+variable assigned such an instance in the same function. Files are summarized in parallel and the summaries are
+cached by modification time and hash, so unchanged files are not parsed again.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = ".access-modifiers-cache.json"
+ACCESS_MODIFIERS = {"privatemethod": "private", "protectedmethod": "protected"}
+
+Summary = Dict[str, Any]  # JSON-serializable summary of the classes and calls in one file
+
+
+class Violation(NamedTuple):
+    """Call site that would raise an AccessException."""
+
+    path: str
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}:{self.column}: {self.message}"
+
+
+class _Summarizer(ast.NodeVisitor):
+    """Collect the classes, their methods with access modifiers, and the method calls in a module."""
+
+    def __init__(self) -> None:
+        self.classes: List[Dict[str, Any]] = []
+        self.calls: List[Dict[str, Any]] = []
+        self.scopes: List[Tuple[str, str]] = []  # (kind, qualname) with kind class, function, or transparent
+        self.instances: List[Dict[str, str]] = [{}]  # Per function, variables assigned an instance of a class
+
+    def qualname(self, name: str) -> str:
+        """Return the qualified name of a class or function defined in the current scope."""
+        if not self.scopes:
+            return name
+        kind, qualname = self.scopes[-1]  # Classes and functions can't be defined in lambdas or comprehensions
+        return f"{qualname}.{name}" if kind == "class" else f"{qualname}.<locals>.{name}"
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:  # pylint: disable=invalid-name
+        """Summarize the class and its methods."""
+        qualname = self.qualname(node.name)
+        methods = {}
+        for child in node.body:
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                access = [ACCESS_MODIFIERS[name] for name in map(_decorator_name, child.decorator_list)
+                          if name in ACCESS_MODIFIERS]
+                methods[child.name] = access[0] if access else "public"
+        bases = [base for base in map(_decorator_name, node.bases) if base]
+        self.classes.append(dict(qualname=qualname, name=node.name, bases=bases, methods=methods))
+        self.scopes.append(("class", qualname))
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    def visit_FunctionDef(self, node) -> None:  # pylint: disable=invalid-name
+        """Visit the function body in a new scope."""
+        for child in node.decorator_list + node.args.defaults + node.args.kw_defaults:
+            if child is not None:
+                self.visit(child)
+        self.scopes.append(("function", self.qualname(node.name)))
+        self.instances.append({})
+        for child in node.body:
+            self.visit(child)
+        self.instances.pop()
+        self.scopes.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_transparent(self, node) -> None:
+        """Visit a lambda or comprehension. Like at runtime, these count as part of the enclosing function."""
+        self.scopes.append(("transparent", ""))
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    visit_Lambda = visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = visit_transparent
+
+    def visit_Assign(self, node: ast.Assign) -> None:  # pylint: disable=invalid-name
+        """Remember variables that are assigned an instance of a class."""
+        self.generic_visit(node)
+        if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            class_name = _instantiated_class(node.value)
+            if class_name:
+                self.instances[-1][node.targets[0].id] = class_name
+            else:
+                self.instances[-1].pop(node.targets[0].id, None)
+
+    def visit_Call(self, node: ast.Call) -> None:  # pylint: disable=invalid-name
+        """Summarize calls of methods on receivers with a known type."""
+        self.generic_visit(node)
+        if not isinstance(node.func, ast.Attribute):
+            return
+        receiver, receiver_class = self.receiver(node.func.value)
+        if not receiver:
+            return
+        caller_class, self_class = self.caller()
+        first_arg_is_self = bool(node.args) and isinstance(node.args[0], ast.Name) and node.args[0].id == "self"
+        self.calls.append(
+            dict(line=node.lineno, column=node.col_offset, method=node.func.attr, receiver=receiver,
+                 receiver_class=receiver_class, caller_class=caller_class, self_class=self_class,
+                 first_arg_is_self=first_arg_is_self))
+
+    def receiver(self, node: ast.expr) -> Tuple[str, str]:
+        """Return the kind of receiver and, if applicable, the name of its class."""
+        if isinstance(node, ast.Name):
+            if node.id == "self":
+                return "self", ""
+            if node.id in self.instances[-1]:
+                return "instance", self.instances[-1][node.id]
+            return "class", node.id
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "super":
+            return "super", ""
+        class_name = _instantiated_class(node)
+        return ("instance", class_name) if class_name else ("", "")
+
+    def caller(self) -> Tuple[Optional[str], Optional[str]]:
+        """Return the class of the method the current code is part of, if it is part of a method, and the class of
+        the nearest enclosing method, whose self is visible in the current code."""
+        scopes = [scope for scope in self.scopes if scope[0] != "transparent"]
+        caller_class = self_class = None
+        for index in range(len(scopes) - 1, 0, -1):
+            if scopes[index][0] == "function" and scopes[index - 1][0] == "class":
+                self_class = scopes[index - 1][1]
+                if index == len(scopes) - 1:
+                    caller_class = self_class
+                break
+        return caller_class, self_class
+
+
+def _decorator_name(node: ast.expr) -> str:
+    """Return the name of a decorator or base class, without the module."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ""
+
+
+def _instantiated_class(node: ast.expr) -> str:
+    """Return the name of the class if the node instantiates a class by calling a capitalized name."""
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id[:1].isupper():
+        return node.func.id
+    return ""
+
+
+def summarize(source: str, filename: str = "<unknown>") -> Summary:
+    """Summarize the classes and method calls in the source code."""
+    try:
+        tree = ast.parse(source, filename)
+    except SyntaxError as reason:
+        return dict(classes=[], calls=[], error=dict(line=reason.lineno or 0, column=reason.offset or 0,
+                                                     message=f"syntax error: {reason.msg}"))
+    summarizer = _Summarizer()
+    summarizer.visit(tree)
+    return dict(classes=summarizer.classes, calls=summarizer.calls)
+
+
+def _summarize_file(path: str, cached_hash: str) -> Tuple[str, float, str, Optional[Summary]]:
+    """Summarize the file, unless its contents have the cached hash. Runs in a worker process."""
+    mtime = os.stat(path).st_mtime
+    with open(path, "rb") as source_file:
+        source = source_file.read()
+    file_hash = hashlib.sha256(source).hexdigest()
+    summary = None if file_hash == cached_hash else summarize(source.decode("utf-8", "replace"), path)
+    return path, mtime, file_hash, summary
+
+
+class _ClassIndex:
+    """Index of the classes in all summarized files, to resolve base classes and methods."""
+
+    def __init__(self, summaries: Dict[str, Summary]) -> None:
+        self.classes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.by_name: Dict[str, List[Tuple[str, str]]] = {}
+        for path, summary in summaries.items():
+            for cls in summary["classes"]:
+                self.classes[(path, cls["qualname"])] = cls
+                self.by_name.setdefault(cls["name"], []).append((path, cls["qualname"]))
+
+    def lookup(self, path: str, name: str) -> Optional[Tuple[str, str]]:
+        """Look up a class by name, preferring classes in the same file. Return None if the name is ambiguous."""
+        candidates = self.by_name.get(name, [])
+        local = [candidate for candidate in candidates if candidate[0] == path]
+        candidates = local or candidates
+        return candidates[0] if len(candidates) == 1 else None
+
+    def mro(self, key: Tuple[str, str]) -> List[Tuple[str, str]]:
+        """Return an approximation of the method resolution order: depth first, left to right, without duplicates."""
+        result: List[Tuple[str, str]] = []
+        stack = [key]
+        while stack:
+            current = stack.pop(0)
+            if current in result:
+                continue
+            result.append(current)
+            bases = [self.lookup(current[0], base) for base in self.classes[current]["bases"]]
+            stack = [base for base in bases if base] + stack
+        return result
+
+    def resolve(self, key: Tuple[str, str], method: str, skip_first: bool = False) -> Optional[Tuple[str, str, str]]:
+        """Return the class qualname that defines the method, with its path and access."""
+        for current in self.mro(key)[1 if skip_first else 0:]:
+            access = self.classes[current]["methods"].get(method)
+            if access:
+                return current[0], current[1], access
+        return None
+
+
+def _check_call(index: _ClassIndex, path: str, call: Dict[str, Any]) -> Optional[str]:
+    """Return the violation message if the call would raise an AccessException."""
+    receiver = call["receiver"]
+    if receiver in ("self", "super"):
+        if not call["self_class"]:
+            return None
+        key: Optional[Tuple[str, str]] = (path, call["self_class"])
+    else:
+        key = index.lookup(path, call["receiver_class"])
+    if key is None:
+        return None
+    resolved = index.resolve(key, call["method"], skip_first=receiver == "super")
+    if resolved is None:
+        return None
+    owner_path, owner, access = resolved
+    if access == "private" and (receiver == "super" or (owner_path, owner) != (path, call["caller_class"])):
+        return f"call to private method {owner}.{call['method']} from outside its class"
+    if access == "protected" and (
+            receiver == "instance" or (receiver == "class" and not call["first_arg_is_self"])):
+        return f"call to protected method {owner}.{call['method']} from another object"
+    return None
+
+
+def find_violations(summaries: Dict[str, Summary]) -> List[Violation]:
+    """Return the calls in the summarized files that would raise an AccessException, and the syntax errors."""
+    index = _ClassIndex(summaries)
+    violations = []
+    for path, summary in summaries.items():
+        if "error" in summary:
+            error = summary["error"]
+            violations.append(Violation(path, error["line"], error["column"], error["message"]))
+        for call in summary["calls"]:
+            message = _check_call(index, path, call)
+            if message:
+                violations.append(Violation(path, call["line"], call["column"], message))
+    return sorted(violations)
+
+
+def python_files(paths: Sequence[str]) -> Iterator[str]:
+    """Yield the Python files in the paths, recursively."""
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, filenames in sorted(os.walk(path)):
+                yield from (os.path.join(directory, name) for name in sorted(filenames) if name.endswith(".py"))
+        else:
+            yield path
+
+
+def summarize_files(paths: Sequence[str], cache: Dict[str, Any], jobs: int = 1) -> Dict[str, Summary]:
+    """Summarize the files, reusing and updating the cached summaries of files whose mtime or hash is unchanged."""
+    summaries: Dict[str, Summary] = {}
+    stale = []
+    for path in paths:
+        cached = cache.get(path)
+        if cached and cached["mtime"] == os.stat(path).st_mtime:
+            summaries[path] = cached["summary"]
+        else:
+            stale.append((path, cached["hash"] if cached else ""))
+    if jobs > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_summarize_file, *zip(*stale), chunksize=max(1, len(stale) // (jobs * 4))))
+    else:
+        results = [_summarize_file(path, cached_hash) for path, cached_hash in stale]
+    for path, mtime, file_hash, summary in results:
+        summary = cache[path]["summary"] if summary is None else summary
+        cache[path] = dict(mtime=mtime, hash=file_hash, summary=summary)
+        summaries[path] = summary
+    return summaries
+
+
+def load_cache(filename: str) -> Dict[str, Any]:
+    """Load the cached file summaries. Return an empty cache if the file is missing, corrupt, or outdated."""
+    try:
+        with open(filename, encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("files", {}) if cache.get("version") == CACHE_VERSION else {}
+
+
+def save_cache(filename: str, cache: Dict[str, Any]) -> None:
+    """Save the cached file summaries."""
+    with open(filename, "w", encoding="utf-8") as cache_file:
+        json.dump(dict(version=CACHE_VERSION, files=cache), cache_file)
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Return the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m access_modifiers.check",
+        description="Report calls of private and protected methods that would raise an AccessException.")
+    parser.add_argument("paths", nargs="+", metavar="path", help="Python file or directory to check")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help=f"cache file (default: {DEFAULT_CACHE})")
+    parser.add_argument("--no-cache", dest="cache", action="store_const", const="", help="don't use a cache file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Check the files and print the violations. Return 1 if there are violations, 0 otherwise."""
+    args = parse_arguments(argv)
+    cache = load_cache(args.cache) if args.cache else {}
+    summaries = summarize_files(list(python_files(args.paths)), cache, args.jobs)
+    if args.cache:
+        save_cache(args.cache, cache)
+    violations = find_violations(summaries)
+    for violation in violations:
+        print(violation)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Access modifiers for all methods of a class: the access_controlled class decorator, which gives the methods access
+modifiers according to their names, and the AccessControlled mixin. Both index the class when it's created, so the
+access checks of its private methods are a single membership test.
+"""
+
+from types import FunctionType
+from typing import Any, Dict, List, Optional, Tuple
+
+from .access_modifiers import (
+    _VERDICT_CACHES, _WRAPPERS, _MethodWithAccessModifier, _PrivateAttribute, _VerdictCache, _functions, _level,
+    _private_method, _protected_method, _transparent_codes)
+from .monitoring import monitored
+from .policies import WARN_METHODS
+
+
+def _index(cls: type) -> None:
+    """Precompute the code objects that may call the private methods and access the private attributes of the
+    class."""
+    attributes = list(vars(cls).values())
+    functions = [function for attribute in attributes for function in _functions(attribute)]
+    members = functions + [attribute for attribute in attributes if isinstance(attribute, _PrivateAttribute)]
+    _index_members(cls, functions, [_VERDICT_CACHES[member] for member in members if member in _VERDICT_CACHES])
+
+
+def _index_members(cls: type, functions: List[FunctionType], caches: List[_VerdictCache]) -> None:
+    """Set the code of the functions of the class as the code that may call its private methods and access its private
+    attributes, whose caches are given, on behalf of instances of the class. These are the calls the access check
+    allows after finding the calling method, so the index only saves looking the caller code up in the class."""
+    callers = tuple(code for function in functions for code in _transparent_codes(function.__code__))
+    # Shared by the caches, so indexing takes time linear in the class size
+    caller_keys = frozenset((id(code), id(cls)) for code in callers)
+    for cache in caches:
+        cache.set_callers(cls, callers, caller_keys)
+
+
+class AccessControlled:  # pylint: disable=too-few-public-methods
+    """Mixin that indexes the methods of its subclasses when they are created, so that checking whether a private
+    method may be called by a method of the class is a single membership test, like a cached verdict."""
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        _index(cls)
+
+
+_MODIFIERS = ("private", "protected", "public")
+
+
+def _conventional_modifier(name: str, private_prefixes: Tuple[str, str]) -> str:
+    """Return the access modifier the naming convention gives the method: private for __name, which Python mangles to
+    _Class__name, protected for _name, and public for other names, including __dunder__ names."""
+    if name.endswith("__") or not name.startswith("_"):
+        return "public"
+    return "private" if name.startswith(private_prefixes) else "protected"
+
+
+def _control_access(cls: type, modifiers: Dict[str, str]) -> type:
+    """Give the methods of the class access modifiers and index the class, in one pass over its attributes."""
+    level = _level(cls.__module__)
+    if level == "off":
+        return cls
+    qualname, private_prefixes = cls.__qualname__, ("__", f"_{cls.__name__.lstrip('_')}__")
+    functions: List[FunctionType] = []
+    caches: List[_VerdictCache] = []
+    for name, attribute in list(vars(cls).items()):
+        is_class_level = isinstance(attribute, (staticmethod, classmethod))
+        function = attribute.__func__ if is_class_level else attribute
+        if isinstance(function, FunctionType) and "__wrapped__" not in function.__dict__:
+            functions.append(function)  # Fast path for plain methods, which have no verdict cache yet
+        else:
+            members: List[Any] = list(_functions(attribute))
+            functions.extend(members)
+            if isinstance(attribute, _PrivateAttribute):
+                members.append(attribute)
+            caches.extend(_VERDICT_CACHES[member] for member in members if member in _VERDICT_CACHES)
+            if not isinstance(function, FunctionType) or attribute in _WRAPPERS:
+                continue  # Not a method, or a method that already has an access modifier
+        reference = monitored(function)
+        if reference is not None:  # pragma: nocover, a method that has an access modifier checked by sys.monitoring
+            caches.extend([reference.cache] if reference.cache is not None else [])
+            continue
+        modifier = modifiers.get(name) or _conventional_modifier(name, private_prefixes)
+        if modifier == "public":
+            continue
+        if level == "warn":
+            WARN_METHODS.add(function)
+        method = _private_method(attribute, qualname) if modifier == "private" else _protected_method(attribute)
+        if modifier == "private" or is_class_level:
+            caches.append(_VERDICT_CACHES[function])
+        if isinstance(method, _MethodWithAccessModifier):  # pragma: no branch, monitored methods are not wrapped
+            method.__set_name__(cls, name)  # The class already exists, so set the name like type.__new__ would
+        type.__setattr__(cls, name, method)
+    _index_members(cls, functions, caches)
+    return cls
+
+
+def access_controlled(cls: Optional[type] = None, *, modifiers: Optional[Dict[str, str]] = None) -> Any:
+    """Class decorator that gives the methods of the class access modifiers according to their names: __name methods
+    become private and _name methods protected. The modifiers map method names, as in the dict of the class, to
+    "private", "protected", or "public", taking precedence over the naming convention. The class is indexed like
+    subclasses of AccessControlled."""
+    for name, modifier in (modifiers or {}).items():
+        if modifier not in _MODIFIERS:
+            raise ValueError(
+                f"Expected access modifier 'private', 'protected', or 'public' for {name!r}, got {modifier!r}")
+    if cls is None:
+        return lambda cls: _control_access(cls, modifiers or {})
+    return _control_access(cls, modifiers or {})
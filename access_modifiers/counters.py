@@ -0,0 +1,144 @@
+"""Counters of the access checks, collected when collecting stats is on, see access_modifiers.collect_stats()."""
+
+from threading import Lock, local
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from weakref import finalize
+
+try:
+    from time import perf_counter_ns
+except ImportError:  # pragma: nocover, Python < 3.7 has no nanosecond counter
+    from time import perf_counter
+
+    def perf_counter_ns() -> int:
+        """Return the value of the performance counter in nanoseconds."""
+        return int(perf_counter() * 1e9)
+
+from .access_modifiers import (
+    _CACHED, _CHECKED, _VIOLATION, AccessException, Member, _modifier, _qualified_name, _VerdictCache)
+
+
+_CounterKey = Tuple[Callable, int, int]  # Method with access modifier, id of the caller code, and line number
+_Location = Tuple[str, str, str]  # Qualified name and access modifier of the method, and caller code location
+
+
+class _ThreadMarker:  # pylint: disable=too-few-public-methods
+    """Object that only the thread-local storage of one thread refers to, so it's garbage collected when the thread
+    finishes."""
+
+    __slots__ = ("__weakref__",)
+
+
+class Stats:
+    """Counters of the access checks, per method with access modifier and per caller code location. Each thread has
+    its own counters, so counting needs no lock; the lock only guards the registration of new threads, the counts of
+    finished threads, and the snapshots. Only the thread that owns the counters changes them, so resetting them
+    records the counts at the time of the reset, to be subtracted from later snapshots, instead of clearing them. When a
+    thread finishes, its counts since the last reset are added to the counts of finished threads, which are keyed by
+    name, so they don't keep the caller code alive, and its counters are dropped."""
+
+    __slots__ = ("thread_local", "thread_counters", "reset_counts", "finished_counts", "lock")
+
+    def __init__(self) -> None:
+        self.thread_local = local()
+        self.thread_counters: Dict[int, Dict[_CounterKey, List[Any]]] = {}  # Counters of live threads, keyed by id
+        self.reset_counts: Dict[Tuple[int, _CounterKey], List[int]] = {}
+        self.finished_counts: Dict[_Location, List[int]] = {}
+        self.lock = Lock()
+
+    def counters(self) -> Dict[_CounterKey, List[Any]]:
+        """Return the counters of the current thread."""
+        try:
+            return self.thread_local.counters
+        except AttributeError:
+            counters = self.thread_local.counters = {}
+            marker = self.thread_local.marker = _ThreadMarker()
+            finalize(marker, self.finish, counters).atexit = False
+            with self.lock:
+                self.thread_counters[id(counters)] = counters
+            return counters
+
+    def finish(self, counters: Dict[_CounterKey, List[Any]]) -> None:
+        """Add the counts since the last reset of the counters of a finished thread to the counts of finished threads,
+        and drop the counters."""
+        with self.lock:
+            del self.thread_counters[id(counters)]
+            for key, counter in counters.items():
+                counts = self.counts_since_reset(id(counters), key, counter, reset=False)
+                self.reset_counts.pop((id(counters), key), None)
+                finished_counts = self.finished_counts.setdefault(self.location(key, counter[4]), [0, 0, 0, 0])
+                finished_counts[:] = [total + count for total, count in zip(finished_counts, counts)]
+
+    def measure(
+            self, check: Callable[..., int], caller_frame, cache: Optional[_VerdictCache], member: Member,
+            args: Tuple) -> None:
+        """Run the access check of the member and count it as a check of the caller's code location. The counters are
+        a list of the number of checks, cache hits, violations, and nanoseconds, and the caller code, keeping its id
+        from being reused."""
+        start = perf_counter_ns()
+        result = _CHECKED
+        try:
+            result = check(caller_frame, cache, member, args)
+        except AccessException:
+            result = _VIOLATION
+            raise
+        finally:
+            duration = perf_counter_ns() - start
+            caller_code = caller_frame.f_code
+            key = (member, id(caller_code), caller_frame.f_lineno)
+            counters = self.counters()
+            counter = counters.get(key)
+            if counter is None:
+                counter = counters[key] = [0, 0, 0, 0, caller_code]
+            counter[0] += 1
+            counter[1] += result == _CACHED
+            counter[2] += result == _VIOLATION
+            counter[3] += duration
+
+    def counts_since_reset(self, counters_id: int, key: _CounterKey, counter: List[Any], reset: bool) -> List[int]:
+        """Return the counts of the counter since the last reset, and record its counts as reset if reset is true.
+        Needs the lock."""
+        counts = counter[:4]
+        reset_counts = self.reset_counts.get((counters_id, key))
+        if reset:
+            self.reset_counts[(counters_id, key)] = counts
+        if reset_counts is None:
+            return counts
+        return [count - reset_count for count, reset_count in zip(counts, reset_counts)]
+
+    def snapshot(self, reset: bool) -> Dict[str, Any]:
+        """Return the totals of the counters of all threads since the last reset, per method and per caller code
+        location. The counters are copied, because other threads may be updating them."""
+        totals: Dict[str, Any] = dict(checks=0, cache_hits=0, violations=0, ns=0, methods={})
+        with self.lock:
+            for counters_id, counters in self.thread_counters.items():
+                for key, counter in counters.copy().items():
+                    counts = self.counts_since_reset(counters_id, key, counter, reset)
+                    if counts[0]:
+                        self.add_to_totals(totals, self.location(key, counter[4]), counts)
+            for location, counts in self.finished_counts.items():
+                if counts[0]:
+                    self.add_to_totals(totals, location, counts)
+            if reset:
+                self.finished_counts.clear()
+        return totals
+
+    @staticmethod
+    def location(key: _CounterKey, caller_code: CodeType) -> _Location:
+        """Return the qualified name and access modifier of the method and the caller code location of the key."""
+        method, _, lineno = key
+        return _qualified_name(method), _modifier(method), f"{caller_code.co_filename}:{lineno}"
+
+    @staticmethod
+    def add_to_totals(totals: Dict[str, Any], location: _Location, counts: List[int]) -> None:
+        """Add the counts of the method and caller code location to the totals."""
+        name, modifier, caller = location
+        method_totals = totals["methods"].setdefault(
+            name, dict(modifier=modifier, checks=0, cache_hits=0, violations=0, ns=0, callers={}))
+        caller_totals = method_totals["callers"].setdefault(caller, dict(checks=0, cache_hits=0, violations=0, ns=0))
+        checks, cache_hits, violations, duration = counts
+        for total in (totals, method_totals, caller_totals):
+            total["checks"] += checks
+            total["cache_hits"] += cache_hits
+            total["violations"] += violations
+            total["ns"] += duration
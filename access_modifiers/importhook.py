@@ -0,0 +1,181 @@
+"""Import hook that strips the access modifiers from modules when they are imported.
+
+Usage, at the start of the program, before importing the modules to strip:
+
+    from access_modifiers import importhook
+    importhook.install("mypackage", "myotherpackage")
+
+Modules imported via the hook have neither the decoration-time nor the call-time overhead of the access modifiers.
+The rewritten bytecode is cached next to the normal .pyc file, with an optimization tag in the file name, and is
+validated with the hash of the source code.
+"""
+
+import ast
+import hashlib
+import importlib.machinery
+import importlib.util
+import marshal
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+OPTIMIZATION_TAG = "noaccessmodifiers"  # Distinguishes the stripped bytecode from the normal bytecode
+ACCESS_MODIFIERS = ("privatemethod", "protectedmethod")
+CLASS_DECORATORS = ("access_controlled",)
+BASE_CLASSES = ("AccessControlled",)
+ATTRIBUTES = ("privateattribute", "protectedattribute")
+_NAMES = ACCESS_MODIFIERS + CLASS_DECORATORS + BASE_CLASSES + ATTRIBUTES
+_HASH_BASED_CHECKED_SOURCE = (0b11).to_bytes(4, "little")  # PEP 552 flags of a checked hash-based .pyc file
+
+
+def _refers_to(node: ast.expr, names: Sequence[str]) -> bool:
+    """Return whether the node is one of the names, possibly prefixed with its module, or a call of one of them."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    return isinstance(node, ast.Name) and node.id in names or isinstance(node, ast.Attribute) and node.attr in names
+
+
+def _string(node: ast.AST) -> Optional[str]:
+    """Return the value of the node if it's a string literal. Before Python 3.8, string literals are ast.Str nodes."""
+    value = node.value if hasattr(node, "value") else getattr(node, "s", None)
+    return value if isinstance(value, str) else None
+
+
+class _AccessModifierStripper(ast.NodeTransformer):
+    """Remove the access modifier decorators from function and class definitions, the AccessControlled base class
+    from class definitions, and the private and protected attributes from classes."""
+
+    def visit_FunctionDef(self, node):  # pylint: disable=invalid-name
+        """Remove the access modifier decorators."""
+        node.decorator_list = [
+            decorator for decorator in node.decorator_list if not _refers_to(decorator, ACCESS_MODIFIERS)]
+        return self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):  # pylint: disable=invalid-name
+        """Remove the access_controlled decorator, the AccessControlled base class, and the attributes with access
+        modifiers."""
+        node.decorator_list = [
+            decorator for decorator in node.decorator_list if not _refers_to(decorator, CLASS_DECORATORS)]
+        node.bases = [base for base in node.bases if not _refers_to(base, BASE_CLASSES)]
+        self.strip_attributes(node)
+        return self.generic_visit(node)
+
+    @staticmethod
+    def strip_attributes(node: ast.ClassDef) -> None:
+        """Remove the attributes with access modifiers and give the slots that store their values the names of the
+        attributes, so the attributes access the slots directly. The access modifiers remove the slots from the class,
+        so no other code accesses them by their own name. Attributes whose slots aren't in a literal __slots__ tuple or
+        list of the class are kept."""
+        slots = _literal_slots(node)
+        body = []
+        for statement in node.body:
+            name, slot = _attribute(statement)
+            if name and slot in slots:
+                elements, index = slots.pop(slot)
+                elements[index] = ast.copy_location(ast.Constant(value=name), elements[index])
+            else:
+                body.append(statement)
+        node.body = body
+
+
+def _name(node: ast.expr) -> Optional[str]:
+    """Return the name of the node if it's a plain name."""
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _literal_slots(node: ast.ClassDef) -> Dict[str, Tuple[List[ast.expr], int]]:
+    """Return the string literals in the __slots__ tuple or list of the class, with the list of elements they're in and
+    their index."""
+    slots: Dict[str, Tuple[List[ast.expr], int]] = {}
+    for statement in node.body:
+        if isinstance(statement, ast.Assign) and [_name(target) for target in statement.targets] == ["__slots__"] and \
+                isinstance(statement.value, (ast.Tuple, ast.List)):
+            elements = statement.value.elts
+            slots = {slot: (elements, index) for index, slot in enumerate(map(_string, elements)) if slot}
+    return slots
+
+
+def _attribute(statement: ast.stmt) -> Tuple[Optional[str], Optional[str]]:
+    """Return the name of the attribute with access modifier the statement creates and the name of its slot, or None
+    for both if the statement doesn't create one."""
+    if not (isinstance(statement, ast.Assign) and len(statement.targets) == 1 and
+            isinstance(statement.value, ast.Call) and _refers_to(statement.value, ATTRIBUTES)):
+        return None, None
+    name = _name(statement.targets[0])
+    arguments = statement.value.args + [keyword.value for keyword in statement.value.keywords]
+    return name, _string(arguments[0]) if arguments else f"_{name}"
+
+
+def _source_hash(source: bytes) -> bytes:
+    """Return the hash of the source code. Python 3.6 has no hash-based .pyc files (PEP 552), but only this loader
+    reads the bytecode it caches, so a hash from hashlib can be used instead."""
+    if sys.version_info >= (3, 7):
+        return importlib.util.source_hash(source)
+    return hashlib.blake2b(source, digest_size=8).digest()  # pragma: nocover
+
+
+class StrippingLoader(importlib.machinery.SourceFileLoader):
+    """Loader that compiles modules without the access modifiers."""
+
+    def get_code(self, fullname):
+        """Return the code of the module, from the cache if the source hash matches."""
+        source_path = self.get_filename(fullname)
+        source = self.get_data(source_path)
+        if not any(name.encode() in source for name in _NAMES):
+            return super().get_code(fullname)
+        source_hash = _source_hash(source)
+        bytecode_path = importlib.util.cache_from_source(source_path, optimization=OPTIMIZATION_TAG)
+        header = importlib.util.MAGIC_NUMBER + _HASH_BASED_CHECKED_SOURCE + source_hash
+        try:
+            bytecode = self.get_data(bytecode_path)
+        except OSError:
+            pass
+        else:
+            if bytecode[:len(header)] == header:
+                return marshal.loads(bytecode[len(header):])
+        code = self.source_to_code(source, source_path)
+        if not sys.dont_write_bytecode:
+            self.set_data(bytecode_path, header + marshal.dumps(code))
+        return code
+
+    def source_to_code(self, data, path, *, _optimize=-1):  # pylint: disable=arguments-differ
+        """Compile the source code without the access modifiers."""
+        tree = _AccessModifierStripper().visit(ast.parse(data, path))
+        return compile(tree, path, "exec", dont_inherit=True, optimize=_optimize)
+
+
+class StrippingFinder:  # pylint: disable=too-few-public-methods
+    """Meta path finder that loads the modules in the given packages with the stripping loader."""
+
+    def __init__(self, packages: Sequence[str]) -> None:
+        self.packages = tuple(packages)
+
+    def find_spec(self, fullname: str, path: Optional[Sequence[str]], target=None):
+        """Find the module spec and replace its loader, if the module is a source module in one of the packages."""
+        if self.packages and not any(
+                fullname == package or fullname.startswith(package + ".") for package in self.packages):
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec is None or type(spec.loader) is not importlib.machinery.SourceFileLoader:  # pylint: disable=unidiomatic-typecheck
+            return None
+        spec.loader = StrippingLoader(spec.loader.name, spec.loader.path)
+        return spec
+
+
+_FINDERS: List[StrippingFinder] = []
+
+
+def install(*packages: str) -> None:
+    """Strip the access modifiers from modules in the packages that are imported from now on. Strip the access
+    modifiers from all modules if no packages are given."""
+    finder = StrippingFinder(packages)
+    _FINDERS.append(finder)
+    sys.meta_path.insert(0, finder)
+
+
+def uninstall() -> None:
+    """Stop stripping the access modifiers from modules imported from now on."""
+    while _FINDERS:
+        sys.meta_path.remove(_FINDERS.pop())
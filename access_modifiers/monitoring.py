@@ -0,0 +1,111 @@
+"""Backend that checks the calls of methods with access modifiers using sys.monitoring, available since Python 3.12
+(PEP 669), see access_modifiers.use_backend().
+
+The methods are left unwrapped; the callback of the PY_START event checks the caller when a method starts.
+"""
+
+import sys
+from sys import _getframe as getframe
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Tuple
+from weakref import ref
+
+from .access_modifiers import AccessException, _check_access, _check_private, _check_protected, _VerdictCache
+
+
+# Tool ids not reserved for debuggers, coverage tools, profilers, and optimizers, see PEP 669
+_TOOL_IDS = (4, 3)
+_TOOL: Optional[int] = None
+
+
+class _MonitoredMethod(ref):  # pragma: nocover, pylint: disable=too-few-public-methods
+    """Weak reference to a method checked by the monitoring backend, with the verdict cache of private methods. When
+    the method is garbage collected, it's no longer monitored."""
+
+    __slots__ = ("cache", "key")
+    cache: Optional[_VerdictCache]
+    key: int  # The id of the code of the method
+
+    def __new__(cls, method: Callable, cache: Optional[_VerdictCache]) -> "_MonitoredMethod":
+        # pylint: disable=too-many-function-args
+        reference = super().__new__(cls, method, _forget)  # type: ignore[call-arg]
+        reference.cache = cache
+        reference.key = id(method.__code__)
+        return reference
+
+
+# Methods checked by the monitoring backend, keyed by the id of their code. Classes created by the same function have
+# methods that share code, so each code maps to the methods with that code; the callback uses the most recent one.
+# The methods are referenced weakly, so classes created dynamically can be garbage collected. The code stays alive as
+# long as one of its methods does, so its id can't be reused while it's in the dict.
+_MONITORED: Dict[int, List[_MonitoredMethod]] = {}
+
+
+def _forget(  # pragma: nocover, sys.monitoring is available since Python 3.12
+        reference: _MonitoredMethod) -> None:
+    """Forget the monitored method that was garbage collected."""
+    references = _MONITORED[reference.key]
+    references.remove(reference)
+    if not references:
+        del _MONITORED[reference.key]
+
+
+def monitored(method: Callable) -> Optional[_MonitoredMethod]:
+    """Return the reference to the method if it's checked by the monitoring backend, and None otherwise."""
+    for reference in _MONITORED.get(id(method.__code__), []):  # pragma: nocover, Python < 3.12 monitors no methods
+        if reference() is method:
+            return reference
+    return None
+
+
+def claim_tool() -> None:  # pragma: nocover, sys.monitoring is available since Python 3.12
+    """Claim a sys.monitoring tool id, unless claimed before, and register the callback that checks the calls."""
+    global _TOOL  # pylint: disable=global-statement
+    if _TOOL is not None:
+        return
+    monitoring = sys.monitoring  # type: ignore[attr-defined]  # pylint: disable=no-member
+    for tool_id in _TOOL_IDS:
+        if monitoring.get_tool(tool_id) is None:
+            monitoring.use_tool_id(tool_id, "access_modifiers")
+            monitoring.register_callback(tool_id, monitoring.events.PY_START, _on_py_start)
+            _TOOL = tool_id
+            return
+    raise RuntimeError("All sys.monitoring tool ids the monitoring backend can use are in use")
+
+
+def monitor(  # pragma: nocover, sys.monitoring is available since Python 3.12
+        method: Callable, cache: Optional[_VerdictCache]) -> None:
+    """Check the calls of the method when it starts."""
+    _MONITORED.setdefault(id(method.__code__), []).append(_MonitoredMethod(method, cache))
+    monitoring = sys.monitoring  # type: ignore[attr-defined]  # pylint: disable=no-member
+    monitoring.set_local_events(_TOOL, method.__code__, monitoring.events.PY_START)
+
+
+def set_monitoring(enabled: bool) -> None:
+    """Turn the checks of the methods checked by the monitoring backend on or off."""
+    if _MONITORED:  # pragma: nocover, Python < 3.12 monitors no methods
+        monitoring = sys.monitoring  # type: ignore[attr-defined]  # pylint: disable=no-member
+        events = monitoring.events.PY_START if enabled else monitoring.events.NO_EVENTS
+        for references in list(_MONITORED.values()):
+            method = references[-1]()
+            if method is not None:  # The method may have been garbage collected since the dict was copied
+                monitoring.set_local_events(_TOOL, method.__code__, events)
+
+
+def _on_py_start(  # pragma: nocover, sys.monitoring callbacks are not traced
+        code: CodeType, instruction_offset: int) -> None:  # pylint: disable=unused-argument
+    """Check the caller of the monitored method that is starting.
+
+    Returning sys.monitoring.DISABLE would turn off the event at the start of the method, so for all callers instead
+    of only the verified one. Hence, every call is checked, and verdicts are cached per caller like the wrappers do."""
+    reference = _MONITORED[id(code)][-1]
+    method, cache = reference(), reference.cache
+    args: Tuple = ()
+    if cache is None:
+        method_frame = getframe(1)
+        args = (method_frame.f_locals.get(code.co_varnames[0]) if code.co_argcount else None,)
+    try:
+        _check_access(_check_private if cache is not None else _check_protected, cache, method, args, 2)
+    except AccessException as exception:
+        exception.__traceback__ = None  # Trim the access check frames; the traceback ends in the method itself
+        raise
@@ -0,0 +1,100 @@
+"""Enforcement levels of the access modifiers per module or package prefix.
+
+The policy maps module or package prefixes to "strict", "warn", or "off". It's set with set_policy(), or read from the
+environment variable ACCESS_MODIFIERS_POLICY or the [tool.access_modifiers] section of the nearest pyproject.toml
+when the first method is decorated.
+"""
+
+import importlib
+import os
+import warnings
+from typing import Any, Dict, Optional
+from weakref import WeakSet
+
+
+_POLICY_LEVELS = ("strict", "warn", "off")
+_POLICY_VARIABLE = "ACCESS_MODIFIERS_POLICY"
+_POLICY: Optional[Dict[str, str]] = None  # Levels per module or package prefix, the empty prefix has the default level
+_LEVELS: Dict[str, str] = {}  # Resolved levels per module
+# Methods and attributes whose violations are recorded even if the mode is "raise"
+WARN_METHODS: "WeakSet[Any]" = WeakSet()
+
+
+def _validated_policy(policy: Dict[str, Any], source: str) -> Dict[str, str]:
+    """Return the policy if all levels are valid, raise a ValueError otherwise."""
+    for prefix, level in policy.items():
+        if level not in _POLICY_LEVELS:
+            raise ValueError(
+                f"Expected policy level 'strict', 'warn', or 'off' for {prefix!r} in {source}, got {level!r}")
+    return dict(policy)
+
+
+def _toml_parser() -> Any:
+    """Return the TOML parser of the standard library, added in Python 3.11, or of the tomli package, or None if
+    neither is available."""
+    for name in ("tomllib", "tomli"):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            pass
+    return None
+
+
+def _read_policy() -> Dict[str, str]:
+    """Read the policy from the environment variable or, if it isn't set, from the [tool.access_modifiers] section of
+    the nearest pyproject.toml, looking in the current directory and its parents."""
+    variable = os.environ.get(_POLICY_VARIABLE)
+    if variable is not None:
+        policy = {}
+        for item in variable.split(","):
+            prefix, _, level = item.rpartition("=")
+            if item.strip():
+                policy[prefix.strip()] = level.strip()
+        return _validated_policy(policy, _POLICY_VARIABLE)
+    directory = os.getcwd()
+    while not os.path.isfile(os.path.join(directory, "pyproject.toml")):
+        directory, child = os.path.dirname(directory), directory
+        if directory == child:
+            return {}
+    filename = os.path.join(directory, "pyproject.toml")
+    with open(filename, "rb") as pyproject:
+        contents = pyproject.read()
+    if b"access_modifiers" not in contents:
+        return {}  # No need to parse the file if it has no access_modifiers section
+    parser = _toml_parser()
+    try:
+        if parser is None:
+            raise ValueError("reading pyproject.toml needs Python 3.11 or newer, or the tomli package")
+        section = parser.loads(contents.decode("utf-8")).get("tool", {}).get("access_modifiers", {})
+    except ValueError as reason:  # TOML decode errors and Unicode decode errors are value errors
+        warnings.warn(f"Can't read the access modifiers policy from {filename}, {reason}", RuntimeWarning)
+        return {}
+    policy = dict(section.get("packages", {}))
+    if "level" in section:
+        policy[""] = section["level"]
+    return _validated_policy(policy, filename)
+
+
+def set_policy(policy: Optional[Dict[str, str]] = None) -> None:
+    """Set the enforcement level, "strict", "warn", or "off", per module or package prefix. The empty prefix sets the
+    default level, which is "strict" if not set. Without policy, read the policy from the environment variable
+    ACCESS_MODIFIERS_POLICY or the nearest pyproject.toml again. Only affects methods decorated from now on."""
+    global _POLICY  # pylint: disable=global-statement
+    _POLICY = _read_policy() if policy is None else _validated_policy(policy, "the policy")
+    _LEVELS.clear()
+
+
+def module_level(module: str) -> str:
+    """Return the enforcement level of the module, using the level of its longest matching prefix in the policy. The
+    policy is read when the first method is decorated."""
+    global _POLICY  # pylint: disable=global-statement
+    if module in _LEVELS:
+        return _LEVELS[module]
+    if _POLICY is None:
+        _POLICY = _read_policy()
+    policy = _POLICY
+    prefix = module
+    while prefix and prefix not in policy:
+        prefix = prefix.rpartition(".")[0]
+    level = _LEVELS[module] = policy.get(prefix, "strict")
+    return level
@@ -0,0 +1,162 @@
+"""Overhead attribution report for the call sites of private and protected methods.
+
+Usage: python -m access_modifiers.profile [--top N] [--output FILE] script.py [argument ...]
+
+The script is run with access check stats collected, see access_modifiers.stats(), and under cProfile. The report
+ranks the call sites by the time spent checking access, as distinct from the time spent in the methods themselves,
+and suggests for each hot call site whether to exempt it, cache its verdicts, or check it statically. The report also
+contains the profile of the script with the frames of the access modifier wrappers and checks collapsed out, so the
+time of the decorated methods is attributed to the methods instead of to the wrappers. The text summary is printed
+and the report is saved as JSON.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import runpy
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import access_modifiers, allowlists, counters, monitoring, sinks
+from .access_modifiers import collect_stats, stats
+
+
+DEFAULT_OUTPUT = "access-modifiers-profile.json"
+MINIMUM_CACHE_HIT_RATE = 0.5  # Call sites with a lower cache hit rate are advised to cache their verdicts
+
+Function = Tuple[str, int, str]  # Filename, line number, and name of a function in a cProfile profile
+# The files of the modules with the access modifier wrappers and checks
+CHECK_FILES = frozenset(os.path.normcase(os.path.abspath(filename)) for filename in (
+    access_modifiers.__file__, allowlists.__file__, counters.__file__, monitoring.__file__, sinks.__file__))
+
+SUGGESTIONS = {
+    "exempt": "never violated and, if private, the verdict is cached: exempt the module with the policy or strip the "
+              "decorators with the import hook",
+    "cache": "verdict rarely cached: inherit from AccessControlled, call from a method instead of a lambda, or "
+             "sample the checks",
+    "static-check": "violated: find these calls with python -m access_modifiers.check instead of at runtime"}
+
+
+def run_script(path: str, arguments: Sequence[str]) -> Tuple[Dict[str, Any], pstats.Stats]:
+    """Run the script as __main__ with stats collected and under cProfile. Return the stats and the profile."""
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    sys.argv = [path, *arguments]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+    profiler = cProfile.Profile()
+    collect_stats()
+    try:
+        profiler.runcall(runpy.run_path, path, run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        result = stats()
+        collect_stats(False)
+        sys.argv, sys.path[:] = saved_argv, saved_path
+    return result, pstats.Stats(profiler)
+
+
+def suggestion(site: Dict[str, Any]) -> str:
+    """Return the suggestion for the call site: check statically if it violates the access modifier, cache if it
+    calls a private method or accesses a private attribute and its verdicts are rarely cached, and exempt otherwise.
+    The verdicts of protected methods and attributes depend on the instance, so they aren't cached."""
+    if site["violations"]:
+        return "static-check"
+    if site["modifier"].startswith("private") and site["cache_hits"] < site["checks"] * MINIMUM_CACHE_HIT_RATE:
+        return "cache"
+    return "exempt"
+
+
+def call_sites(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the call sites in the stats, ranked by the time spent checking access."""
+    sites = []
+    for method, method_stats in result["methods"].items():
+        for caller, caller_stats in method_stats["callers"].items():
+            site = dict(method=method, modifier=method_stats["modifier"], caller=caller, **caller_stats)
+            site["suggestion"] = suggestion(site)
+            sites.append(site)
+    return sorted(sites, key=lambda site: site["ns"], reverse=True)
+
+
+def _is_access_check(function: Function) -> bool:
+    """Return whether the function is one of the access modifier wrappers or checks."""
+    return os.path.normcase(os.path.abspath(function[0])) in CHECK_FILES
+
+
+def collapse(profile: pstats.Stats) -> Tuple[List[Dict[str, Any]], float]:
+    """Return the functions in the profile, ranked by cumulative time, without the access modifier wrappers and checks
+    and the built-in functions only they call. Also return the time spent in the collapsed frames themselves."""
+    functions, check_seconds = [], 0.0
+    for function, (_, calls, tottime, cumtime, callers) in profile.stats.items():  # type: ignore[attr-defined]
+        checked_calls = {caller: timings for caller, timings in callers.items() if _is_access_check(caller)}
+        if _is_access_check(function) or function[0] == "~" and callers and len(checked_calls) == len(callers):
+            check_seconds += tottime
+            continue
+        filename, line, name = function
+        functions.append(dict(
+            function=name if filename == "~" else f"{filename}:{line}({name})", calls=calls, tottime=tottime,
+            cumtime=cumtime, decorated=bool(checked_calls),
+            decorated_cumtime=sum(timings[3] for timings in checked_calls.values())))
+    return sorted(functions, key=lambda function: function["cumtime"], reverse=True), check_seconds
+
+
+def report(result: Dict[str, Any], profile: pstats.Stats, top: int) -> Dict[str, Any]:
+    """Return the report: the totals, the hottest call sites, and the collapsed profile."""
+    functions, collapsed_seconds = collapse(profile)
+    return dict(
+        checks=result["checks"], cache_hits=result["cache_hits"], violations=result["violations"],
+        check_seconds=result["ns"] / 1e9, collapsed_seconds=collapsed_seconds,
+        decorated_seconds=sum(function["decorated_cumtime"] for function in functions),
+        call_sites=call_sites(result)[:top], profile=functions[:top])
+
+
+def summary(the_report: Dict[str, Any]) -> List[str]:
+    """Return the text summary of the report."""
+    lines = [
+        f"{the_report['checks']} access checks took {the_report['check_seconds']:.6f}s, "
+        f"{the_report['cache_hits']} cache hits, {the_report['violations']} violations",
+        f"decorated methods took {the_report['decorated_seconds']:.6f}s, excluding the access checks", "",
+        "call sites by time spent in access checks:",
+        f"{'check ms':>10} {'checks':>8} {'hits':>8} {'viol':>6}  {'suggestion':<13} method <- caller"]
+    for site in the_report["call_sites"]:
+        lines.append(f"{site['ns'] / 1e6:>10.3f} {site['checks']:>8} {site['cache_hits']:>8} {site['violations']:>6}  "
+                     f"{site['suggestion']:<13} {site['method']} <- {site['caller']}")
+    lines.extend(["", "suggestions:"] + [f"  {name}: {text}" for name, text in SUGGESTIONS.items()])
+    lines.extend([
+        "", f"profile without access modifier frames ({the_report['collapsed_seconds']:.6f}s collapsed), decorated "
+        "methods are marked with *:", f"{'ncalls':>8} {'tottime':>10} {'cumtime':>10}  function"])
+    for function in the_report["profile"]:
+        marker = "*" if function["decorated"] else " "
+        lines.append(f"{function['calls']:>8} {function['tottime']:>10.6f} {function['cumtime']:>10.6f} "
+                     f"{marker}{function['function']}")
+    return lines
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Return the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m access_modifiers.profile",
+        description="Rank the call sites of private and protected methods by the time spent checking access.")
+    parser.add_argument(
+        "--top", type=int, default=20, help="number of call sites and functions to report (default: 20)")
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT, help=f"save the report as JSON in this file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("script", help="Python script to run")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER, help="arguments of the script")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the script, print the summary, and save the report. Return 0."""
+    args = parse_arguments(argv)
+    result, profile = run_script(args.script, args.arguments)
+    the_report = report(result, profile, args.top)
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(the_report, output_file, indent=2)
+    print("\n".join(summary(the_report)))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
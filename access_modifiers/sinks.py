@@ -0,0 +1,114 @@
+"""Sinks for the violations recorded when access modifier violations are recorded instead of raised.
+
+Usage:
+
+    from access_modifiers import enforce
+    from access_modifiers.sinks import JSONLinesSink
+    enforce("record", sink=JSONLinesSink("violations.jsonl"))
+
+A sink is a callable that is passed a ViolationRecord. The sinks below only format the message of a record when they
+emit it. The records are deduplicated and rate limited by the recorder that hands them to the sink.
+"""
+
+import atexit
+import json
+import logging
+import warnings
+from threading import Lock
+from time import monotonic
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from .access_modifiers import ViolationRecord
+
+
+class AccessWarning(Warning):
+    """Warning issued for calls of private or protected methods that violate their access modifier."""
+
+
+class LoggingSink:  # pylint: disable=too-few-public-methods
+    """Log the records. Logging formats the message only if the logger is enabled for the level."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.WARNING) -> None:
+        self.logger = logger or logging.getLogger("access_modifiers")
+        self.level = level
+
+    def __call__(self, record: ViolationRecord) -> None:
+        self.logger.log(self.level, "%s", record)
+
+
+class WarningsSink:  # pylint: disable=too-few-public-methods
+    """Issue a warning for each record, attributed to the code location of the caller."""
+
+    def __init__(self, category: Type[Warning] = AccessWarning) -> None:
+        self.category = category
+
+    def __call__(self, record: ViolationRecord) -> None:
+        warnings.warn_explicit(str(record), self.category, record.filename, record.lineno)
+
+
+class JSONLinesSink:
+    """Buffer the records and append them to a file, one JSON object per line, when the buffer is full, when flushed,
+    and when the program exits."""
+
+    def __init__(self, path: str, buffer_size: int = 100) -> None:
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer: List[ViolationRecord] = []
+        self.lock = Lock()
+        atexit.register(self.flush)
+
+    def __call__(self, record: ViolationRecord) -> None:
+        with self.lock:
+            self.buffer.append(record)
+            if len(self.buffer) < self.buffer_size:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records to the file."""
+        with self.lock:
+            records, self.buffer = self.buffer, []
+            if records:
+                with open(self.path, "a", encoding="utf-8") as jsonl_file:
+                    jsonl_file.write("".join(json.dumps(record.as_dict()) + "\n" for record in records))
+
+
+_SEEN_SIZE = 4096  # Maximum number of violating (method, caller code location) pairs to remember
+_RECORDER_LOCK = Lock()  # Shared by the recorders, which only take it for violations not recorded before
+
+
+class Recorder:  # pylint: disable=too-few-public-methods
+    """Record violations instead of raising an AccessException. Records are deduplicated by method and caller code
+    location, rate limited, and handed to the sink."""
+
+    __slots__ = ("sink", "limit", "period", "seen", "window_start", "emitted", "suppressed")
+
+    def __init__(self, sink: Callable[[ViolationRecord], Any], limit: int, period: float) -> None:
+        self.sink = sink
+        self.limit = limit
+        self.period = period
+        self.seen: Dict[Tuple[Callable, int, int], CodeType] = {}  # Holds on to the code, so its id isn't reused
+        self.window_start = monotonic()
+        self.emitted = self.suppressed = 0
+
+    def record(self, method: Callable, modifier: str, caller_frame) -> None:
+        """Record the violation, unless it was recorded before or the rate limit has been reached."""
+        caller_code = caller_frame.f_code
+        key = (method, id(caller_code), caller_frame.f_lineno)
+        if key in self.seen:
+            return
+        with _RECORDER_LOCK:
+            if len(self.seen) >= _SEEN_SIZE:
+                self.seen.clear()
+            self.seen[key] = caller_code
+            now = monotonic()
+            if now - self.window_start >= self.period:
+                self.window_start, self.emitted = now, 0
+            if self.emitted >= self.limit:
+                self.suppressed += 1
+                return
+            self.emitted += 1
+            record = ViolationRecord(method, modifier, caller_code.co_filename, key[2], self.suppressed)
+            self.suppressed = 0
+        self.sink(record)
@@ -0,0 +1,241 @@
+"""Unit tests for the class decorator that gives methods access modifiers according to their names."""
+
+import functools
+import unittest
+
+from ..access_modifiers import disable, enable, privateattribute, privatemethod, AccessException
+from ..controlled import access_controlled
+from ..policies import set_policy
+
+
+# pylint: disable=missing-docstring,too-few-public-methods,no-self-use,unused-private-member,protected-access
+
+@access_controlled
+class Class:
+    __slots__ = ("_private_attribute",)
+
+    private_attribute = privateattribute()
+
+    def __init__(self):
+        self.private_attribute = "private attribute"
+
+    def __private_method(self):
+        return "Class.__private_method"
+
+    def _protected_method(self):
+        return "Class._protected_method"
+
+    @staticmethod
+    def __static_private_method():
+        return "Class.__static_private_method"
+
+    @staticmethod
+    def _static_method():
+        return "Class._static_method"
+
+    @privatemethod
+    def _explicitly_private_method(self):
+        return "Class._explicitly_private_method"
+
+    def public_method(self):
+        return self.__private_method()
+
+    def public_method_calling_static_private_method(self):
+        return self.__static_private_method()
+
+    def public_method_calling_explicitly_private_method(self):
+        return self._explicitly_private_method()
+
+    def public_method_reading_private_attribute(self):
+        return self.private_attribute
+
+    def public_method_returning_lambda(self):
+        return lambda: self.__private_method()  # pylint: disable=unnecessary-lambda
+
+    @staticmethod
+    def public_static_method(instance):
+        return instance.__private_method()
+
+    @classmethod
+    def __private_class_method(cls):
+        return cls.__name__
+
+    @classmethod
+    def _protected_class_method(cls):
+        return cls.__private_class_method()
+
+    def __repr__(self):
+        return "Class()"
+
+
+class Subclass(Class):
+    __slots__ = ()
+
+    def public_method_calling_protected_method(self):
+        return self._protected_method()
+
+    def public_method_calling_static_protected_method(self):
+        return self._static_method()
+
+    @classmethod
+    def create(cls):
+        return cls._protected_class_method()
+
+    def public_method_calling_private_method(self):
+        return self._Class__private_method()  # pylint: disable=no-member
+
+
+@access_controlled(modifiers={"helper": "private", "_hook": "public"})
+class ClassWithModifiers:
+    def helper(self):
+        return "ClassWithModifiers.helper"
+
+    def _hook(self):
+        return "ClassWithModifiers._hook"
+
+    def public_method(self):
+        return self.helper()
+
+
+class AccessControlledTests(unittest.TestCase):
+    """Unit tests for the access controlled class decorator."""
+
+    def test_private_method(self):
+        """Test that __name methods are private."""
+        self.assertEqual("Class.__private_method", Class().public_method())
+        self.assertRaises(AccessException, Class()._Class__private_method)  # pylint: disable=no-member
+        self.assertRaises(AccessException, Subclass().public_method_calling_private_method)
+
+    def test_private_method_via_static_method_and_escaped_lambda(self):
+        """Test that the index of the class doesn't allow calls the access check rejects: static methods and lambdas
+        returned by methods can't call private methods."""
+        self.assertRaises(AccessException, Class.public_static_method, Class())
+        self.assertRaises(AccessException, Class().public_method_returning_lambda())
+
+    def test_protected_method(self):
+        """Test that _name methods are protected."""
+        self.assertEqual("Class._protected_method", Subclass().public_method_calling_protected_method())
+        self.assertRaises(AccessException, Class()._protected_method)  # pylint: disable=protected-access
+
+    def test_static_private_method(self):
+        """Test that __name static methods are private."""
+        self.assertEqual("Class.__static_private_method", Class().public_method_calling_static_private_method())
+        self.assertRaises(AccessException, Class._Class__static_private_method)  # pylint: disable=no-member
+
+    def test_static_protected_method(self):
+        """Test that _name static methods are protected."""
+        self.assertEqual("Class._static_method", Subclass().public_method_calling_static_protected_method())
+        self.assertRaises(AccessException, Class._static_method)  # pylint: disable=protected-access
+
+    def test_class_methods(self):
+        """Test that __name class methods are private and _name class methods protected."""
+        self.assertEqual("Subclass", Subclass.create())
+        self.assertRaises(AccessException, Class._Class__private_class_method)  # pylint: disable=no-member
+        self.assertRaises(AccessException, Class._protected_class_method)  # pylint: disable=protected-access
+
+    def test_public_methods(self):
+        """Test that dunder methods and methods without underscore prefix are public."""
+        self.assertEqual("Class()", repr(Class()))
+        self.assertEqual("Class._explicitly_private_method", Class().public_method_calling_explicitly_private_method())
+
+    def test_explicit_access_modifier(self):
+        """Test that methods that already have an access modifier keep it."""
+        self.assertRaises(AccessException, Class()._explicitly_private_method)  # pylint: disable=protected-access
+
+    def test_private_attribute(self):
+        """Test that the private attributes of the class are indexed too."""
+        self.assertEqual("private attribute", Class().public_method_reading_private_attribute())
+        self.assertRaises(AccessException, getattr, Class(), "private_attribute")
+
+    def test_modifiers(self):
+        """Test that the modifiers take precedence over the naming convention."""
+        self.assertEqual("ClassWithModifiers.helper", ClassWithModifiers().public_method())
+        self.assertRaises(AccessException, ClassWithModifiers().helper)
+        self.assertEqual("ClassWithModifiers._hook", ClassWithModifiers()._hook())  # pylint: disable=protected-access
+
+    def test_invalid_modifier(self):
+        """Test that the modifiers are checked."""
+        self.assertRaises(ValueError, access_controlled, modifiers={"method": "friend"})
+
+    def test_decorate_directly(self):
+        """Test that the decorator can be called with the class and the modifiers."""
+        class ClassDecoratedDirectly:
+            def method(self):
+                return "ClassDecoratedDirectly.method"  # pragma: nocover
+
+        access_controlled(ClassDecoratedDirectly, modifiers={"method": "protected"})
+        self.assertRaises(AccessException, ClassDecoratedDirectly().method)
+
+    def test_disabled(self):
+        """Test that classes decorated while access checks are disabled are left alone."""
+        disable()
+        try:
+            @access_controlled
+            class ClassDecoratedWhileDisabled:
+                def __private_method(self):
+                    return "ClassDecoratedWhileDisabled.__private_method"
+        finally:
+            enable()
+        self.assertEqual("ClassDecoratedWhileDisabled.__private_method",
+                         ClassDecoratedWhileDisabled()._ClassDecoratedWhileDisabled__private_method())
+
+    def test_disable_after_decorating(self):
+        """Test that disabling access checks puts the original methods back."""
+        instance = Class()
+        disable()
+        try:
+            self.assertEqual(
+                "Class._protected_method", instance._protected_method())  # pylint: disable=protected-access
+        finally:
+            enable()
+        self.assertRaises(AccessException, instance._protected_method)  # pylint: disable=protected-access
+
+    def test_policy_off(self):
+        """Test that methods of classes in modules with level off are left alone."""
+        set_policy({"access_modifiers.tests": "off"})
+        try:
+            @access_controlled
+            class ClassWithoutChecks:
+                def _protected_method(self):
+                    return "ClassWithoutChecks._protected_method"
+        finally:
+            set_policy({})
+        self.assertEqual("ClassWithoutChecks._protected_method", ClassWithoutChecks()._protected_method())
+
+    def test_policy_warn(self):
+        """Test that violations of methods of classes in modules with level warn are logged instead of raised."""
+        set_policy({"access_modifiers.tests.test_access_controlled": "warn"})
+        try:
+            @access_controlled
+            class ClassWithWarnings:
+                def _protected_method(self):
+                    return "ClassWithWarnings._protected_method"
+        finally:
+            set_policy({})
+        with self.assertLogs("access_modifiers") as logs:
+            self.assertEqual("ClassWithWarnings._protected_method", ClassWithWarnings()._protected_method())
+        self.assertEqual(1, len(logs.records))
+
+    def test_decorated_method(self):
+        """Test that methods wrapped by other decorators get access modifiers too, and can call private methods."""
+        def decorator(method):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                return method(*args, **kwargs)
+            return wrapper
+
+        @access_controlled
+        class ClassWithDecoratedMethods:
+            def __private_method(self):
+                return "ClassWithDecoratedMethods.__private_method"
+
+            @decorator
+            def _protected_method(self):
+                return self.__private_method()
+
+            @decorator
+            def public_method(self):
+                return self._protected_method()
+
+        self.assertEqual("ClassWithDecoratedMethods.__private_method", ClassWithDecoratedMethods().public_method())
+        self.assertRaises(AccessException, ClassWithDecoratedMethods()._protected_method)
@@ -0,0 +1,208 @@
+"""Unit tests for recording and enforcing the allowlist."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ..access_modifiers import (
+    allowlist, collect_stats, enforce, privateattribute, privatemethod, protectedmethod, stats, AccessException)
+from ..controlled import AccessControlled
+
+
+class AllowlistTests(unittest.TestCase):
+    """Unit tests for recording the allowed calls and only allowing the recorded calls."""
+
+    # pylint: disable=missing-docstring
+
+    class Class:
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"
+
+        @protectedmethod
+        def protected_method(self):  # pylint: disable=no-self-use
+            return "Class.protected_method"
+
+        def public_method(self):
+            return self.private_method() + " " + self.protected_method()
+
+        def public_method_using_lambda(self):
+            return (lambda: self.private_method())()  # pylint: disable=unnecessary-lambda
+
+        def other_public_method(self):
+            return self.private_method()
+
+    class Subclass(Class):
+        pass
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, "allowlist.txt")
+
+    def tearDown(self):
+        allowlist()
+        enforce()
+        collect_stats(False)
+        self.directory.cleanup()
+
+    def read_allowlist(self):
+        with open(self.path, encoding="utf-8") as allowlist_file:
+            return allowlist_file.read().splitlines()
+
+    def test_record(self):
+        """Test that the allowed calls are written to the allowlist when recording stops."""
+        allowlist("record", self.path)
+        self.Class().public_method()
+        self.Class().public_method()
+        self.assertRaises(AccessException, self.Class().private_method)
+        allowlist()
+        lines = self.read_allowlist()
+        self.assertEqual(2, len(lines))
+        method, caller = lines[0].split("\t")
+        private_method = self.Class.private_method.__wrapped__  # pylint: disable=no-member
+        self.assertEqual(
+            f"{__name__}:AllowlistTests.Class.private_method:{private_method.__code__.co_firstlineno}", method)
+        self.assertTrue(caller.startswith(f"{__name__}:"))
+        self.assertTrue(caller.endswith(f"public_method:{self.Class.public_method.__code__.co_firstlineno}"))
+
+    def test_record_cached_verdicts(self):
+        """Test that calls are recorded when the verdict was cached before recording started."""
+        instance = self.Subclass()
+
+        def method_added_later(self):
+            return (lambda: self.private_method())()  # pylint: disable=unnecessary-lambda
+
+        self.Class.method_added_later = method_added_later
+        try:
+            instance.public_method_using_lambda()
+            instance.method_added_later()
+            allowlist("record", self.path)
+            instance.public_method_using_lambda()
+            instance.method_added_later()
+        finally:
+            del self.Class.method_added_later
+        allowlist()
+        self.assertEqual(2, len(self.read_allowlist()))
+
+    def test_record_adds_to_existing_allowlist(self):
+        """Test that recording adds the recorded pairs to the pairs already in the allowlist."""
+        allowlist("record", self.path)
+        self.Class().public_method()
+        allowlist("record", self.path)
+        self.Class().other_public_method()
+        allowlist()
+        self.assertEqual(3, len(self.read_allowlist()))
+
+    def test_record_keeps_pairs_of_other_processes(self):
+        """Test that pairs other processes wrote to the allowlist while recording are kept."""
+        allowlist("record", self.path)
+        self.Class().public_method()
+        with open(self.path, "w", encoding="utf-8") as allowlist_file:
+            allowlist_file.write("method\tcaller\n")
+        allowlist()
+        self.assertEqual(3, len(self.read_allowlist()))
+        self.assertIn("method\tcaller", self.read_allowlist())
+
+    @unittest.skipIf(sys.platform == "win32", "Windows has no fcntl module")
+    def test_record_locks_allowlist(self):
+        """Test that the allowlist is locked while the pairs are added, so processes don't save at the same time."""
+        allowlist("record", self.path)
+        self.Class().public_method()
+        with patch("fcntl.flock") as flock:
+            allowlist()
+        flock.assert_called_once()
+        self.assertEqual(2, len(self.read_allowlist()))
+
+    def test_enforce(self):
+        """Test that only the recorded calls are allowed when enforcing the allowlist."""
+        allowlist("record", self.path)
+        self.Class().public_method()
+        allowlist("enforce", self.path)
+        self.assertEqual("Class.private_method Class.protected_method", self.Class().public_method())
+        self.assertRaises(AccessException, self.Class().other_public_method)
+        self.assertRaises(AccessException, self.Class().protected_method)
+
+    def test_enforce_with_record_mode(self):
+        """Test that calls not in the allowlist are recorded if violations are recorded instead of raised."""
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        allowlist("enforce", self.path)
+        records = []
+        enforce("record", sink=records.append)
+        self.assertEqual("Class.private_method", self.Class().other_public_method())
+        self.assertEqual(1, len(records))
+
+    def test_enforce_is_one_lookup(self):
+        """Test that enforcing the allowlist doesn't need the cached verdicts."""
+        allowlist("record", self.path)
+        self.Class().public_method()
+        allowlist("enforce", self.path)
+        collect_stats()
+        self.Class().public_method()
+        self.assertEqual(2, stats()["cache_hits"])
+
+    def test_enforce_attributes(self):
+        """Test that only the recorded accesses of attributes with access modifiers are allowed."""
+
+        class ClassWithAttribute:
+            __slots__ = ("_private_attribute",)
+            private_attribute = privateattribute()
+
+            def __init__(self):
+                self.private_attribute = "private"
+
+            def get_private_attribute(self):
+                return self.private_attribute
+
+            def get_private_attribute_again(self):
+                return self.private_attribute
+
+        allowlist("record", self.path)
+        instance = ClassWithAttribute()
+        instance.get_private_attribute()
+        allowlist("enforce", self.path)
+        self.assertEqual("private", ClassWithAttribute().get_private_attribute())
+        self.assertRaises(AccessException, instance.get_private_attribute_again)
+        self.assertIn(f"{__name__}.{ClassWithAttribute.__qualname__}.private_attribute", self.read_allowlist()[0])
+
+    def test_indexed_class(self):
+        """Test that calls from the methods of an indexed class are checked against the allowlist like other calls."""
+
+        class Indexed(AccessControlled):
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                return "Indexed.private_method"  # pragma: nocover
+
+            def public_method(self):
+                return self.private_method()
+
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        allowlist("enforce", self.path)
+        self.assertRaises(AccessException, Indexed().public_method)
+
+    @patch("access_modifiers.allowlists._IDENTITIES_SIZE", 1)
+    def test_bounded_identity_cache(self):
+        """Test that the caches of code identities are bounded."""
+        allowlist("record", self.path)
+        self.Class().public_method()
+        self.Class().other_public_method()
+        allowlist("enforce", self.path)
+        self.assertEqual("Class.private_method Class.protected_method", self.Class().public_method())
+        self.assertEqual("Class.private_method", self.Class().other_public_method())
+
+    def test_missing_allowlist(self):
+        """Test that the allowlist to enforce must exist."""
+        self.assertRaises(FileNotFoundError, allowlist, "enforce", self.path)
+
+    def test_invalid_allowlist(self):
+        """Test that the lines of the allowlist are checked."""
+        with open(self.path, "w", encoding="utf-8") as allowlist_file:
+            allowlist_file.write("method caller\n")
+        self.assertRaises(ValueError, allowlist, "enforce", self.path)
+
+    def test_invalid_mode(self):
+        """Test that the allowlist mode is checked."""
+        self.assertRaises(ValueError, allowlist, "freeze")
@@ -0,0 +1,141 @@
+"""Unit tests for access modifiers of coroutine methods and for calls from coroutines and generators."""
+
+import asyncio
+import inspect
+import sys
+import unittest
+
+from ..access_modifiers import privatemethod, protectedmethod, use_backend, AccessException
+
+
+def create_class():
+    """Return a class with coroutine methods and generator methods with access modifiers."""
+
+    # pylint: disable=missing-docstring
+
+    class Class:
+        @privatemethod
+        async def private_coroutine_method(self):  # pylint: disable=no-self-use
+            return "Class.private_coroutine_method"
+
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"
+
+        @protectedmethod
+        async def protected_coroutine_method(self):  # pylint: disable=no-self-use
+            return "Class.protected_coroutine_method"
+
+        @privatemethod
+        def private_generator_method(self):  # pylint: disable=no-self-use
+            yield "Class.private_generator_method"
+
+        @privatemethod
+        async def private_async_generator_method(self):  # pylint: disable=no-self-use
+            yield "Class.private_async_generator_method"
+
+        async def public_method(self):
+            return await self.private_coroutine_method()
+
+        async def public_method_using_async_comprehension(self):
+            return [item async for item in self.private_async_generator_method()] + \
+                [self.private_method() async for _ in self.private_async_generator_method()]
+
+        async def public_method_using_tasks(self):
+            return await asyncio.gather(
+                self.private_coroutine_method(), asyncio.create_task(self.protected_coroutine_method()))
+
+        async def public_method_using_callback(self):
+            future = asyncio.get_running_loop().create_future()
+            asyncio.get_running_loop().call_soon(self.set_result, future)
+            return await future
+
+        def set_result(self, future):
+            future.set_result(self.private_method())
+
+        def public_method_using_generator(self):
+            return list(self.private_generator_method())
+
+        async def public_async_generator_method(self):
+            yield self.private_method()
+
+    return Class
+
+
+needs_asyncio_run = unittest.skipIf(sys.version_info < (3, 7), "asyncio.run() is available since Python 3.7")
+
+
+class AsyncTests(unittest.TestCase):
+    """Unit tests for coroutine methods with access modifiers and calls from coroutines."""
+
+    backend = "wrapper"
+
+    def setUp(self):
+        use_backend(self.backend)
+        self.instance = create_class()()
+        use_backend()
+
+    @needs_asyncio_run
+    def test_call_private_coroutine_method_from_coroutine_method(self):
+        """Test that a coroutine method can await a private coroutine method."""
+        self.assertEqual("Class.private_coroutine_method", asyncio.run(self.instance.public_method()))
+
+    def test_call_private_coroutine_method_from_outside(self):
+        """Test that a private coroutine method can't be called from outside its class."""
+        self.assertRaises(AccessException, self.instance.private_coroutine_method)
+
+    def test_call_protected_coroutine_method_from_outside(self):
+        """Test that a protected coroutine method can't be called from outside its class."""
+        self.assertRaises(AccessException, self.instance.protected_coroutine_method)
+
+    @needs_asyncio_run
+    def test_call_private_methods_from_async_comprehension(self):
+        """Test that private methods can be called from async comprehensions in coroutine methods."""
+        self.assertEqual(
+            ["Class.private_async_generator_method", "Class.private_method"],
+            asyncio.run(self.instance.public_method_using_async_comprehension()))
+
+    @needs_asyncio_run
+    def test_call_private_methods_from_tasks(self):
+        """Test that coroutines of private and protected methods can be run as tasks."""
+        self.assertEqual(
+            ["Class.private_coroutine_method", "Class.protected_coroutine_method"],
+            asyncio.run(self.instance.public_method_using_tasks()))
+
+    @needs_asyncio_run
+    def test_call_private_method_from_callback(self):
+        """Test that a private method can be called from a method that a coroutine method runs as callback."""
+        self.assertEqual("Class.private_method", asyncio.run(self.instance.public_method_using_callback()))
+
+    @needs_asyncio_run
+    def test_call_private_method_from_async_generator(self):
+        """Test that a private method can be called from an async generator method."""
+
+        async def first_item():
+            return [item async for item in self.instance.public_async_generator_method()][0]
+
+        self.assertEqual("Class.private_method", asyncio.run(first_item()))
+
+    def test_call_private_generator_method(self):
+        """Test that private generator methods are checked when called, not when iterated."""
+        self.assertEqual(["Class.private_generator_method"], self.instance.public_method_using_generator())
+        self.assertRaises(AccessException, self.instance.private_generator_method)
+
+    def test_coroutine_function(self):
+        """Test that asyncio recognizes private and protected coroutine methods as coroutine functions."""
+        self.assertTrue(asyncio.iscoroutinefunction(self.instance.private_coroutine_method))
+        self.assertTrue(asyncio.iscoroutinefunction(self.instance.protected_coroutine_method))
+        self.assertFalse(asyncio.iscoroutinefunction(self.instance.private_method))
+
+    @unittest.skipIf(sys.version_info < (3, 12), "inspect recognizes marked coroutine functions since Python 3.12")
+    def test_inspect_coroutine_function(self):  # pragma: nocover
+        """Test that inspect recognizes private coroutine methods as coroutine functions."""
+        self.assertTrue(inspect.iscoroutinefunction(self.instance.private_coroutine_method))
+
+
+@unittest.skipIf(sys.version_info < (3, 12), "sys.monitoring is available since Python 3.12")
+class MonitoringBackendAsyncTests(AsyncTests):  # pragma: nocover
+    """Unit tests for coroutine methods with access modifiers and the sys.monitoring backend, which wraps coroutine
+    and generator methods, because their code starts when they are first resumed instead of when they are called."""
+
+    backend = "monitoring"
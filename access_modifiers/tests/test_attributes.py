@@ -0,0 +1,349 @@
+"""Unit tests for the private and protected attribute access modifiers."""
+
+import copy
+import pickle
+import unittest
+
+from ..access_modifiers import (
+    AccessException, collect_stats, disable, enable, enforce, privateattribute, protectedattribute, sample, stats)
+from ..controlled import AccessControlled
+from ..policies import set_policy
+
+
+# pylint: disable=missing-docstring,too-few-public-methods,attribute-defined-outside-init
+
+class Class:
+    __slots__ = ("_private_attribute", "_protected_attribute", "storage")
+
+    private_attribute = privateattribute()
+    protected_attribute = protectedattribute()
+    attribute_with_named_slot = privateattribute(slot="storage")
+
+    def __init__(self):
+        self.private_attribute = "private"
+        self.protected_attribute = "protected"
+
+    def get_private_attribute(self):
+        return self.private_attribute
+
+    def get_private_attribute_via_lambda(self):
+        return (lambda: self.private_attribute)()  # pylint: disable=unnecessary-lambda
+
+    def get_private_attribute_of(self, other):  # pylint: disable=no-self-use
+        return other.private_attribute
+
+    def get_protected_attribute_of(self, other):  # pylint: disable=no-self-use
+        return other.protected_attribute
+
+    def delete_private_attribute(self):
+        del self.private_attribute
+
+
+class Subclass(Class):
+    __slots__ = ()
+
+    def get_private_attribute_from_subclass(self):
+        return self.private_attribute
+
+    def get_protected_attribute_from_subclass(self):
+        return self.protected_attribute
+
+    def set_protected_attribute_from_subclass(self, value):
+        self.protected_attribute = value
+
+
+class IndexedClass(AccessControlled):
+    __slots__ = ("_private_attribute",)
+
+    private_attribute = privateattribute()
+
+    def __init__(self):
+        self.private_attribute = "private"
+
+    def get_private_attribute(self):
+        return self.private_attribute
+
+
+class ClassWithDict:
+    __slots__ = ("__private_attribute", "__dict__")
+
+    private_attribute = privateattribute(slot="_ClassWithDict__private_attribute")
+
+    def __init__(self):
+        self.private_attribute = "private"
+        self.public_attribute = "public"
+
+    def get_private_attribute(self):
+        return self.private_attribute
+
+
+class ClassWithState:
+    __slots__ = ("_private_attribute",)
+
+    private_attribute = privateattribute()
+
+    def __init__(self):
+        self.private_attribute = "private"
+
+    def __getstate__(self):
+        return {"private_attribute": self.private_attribute.upper()}
+
+    def __setstate__(self, state):
+        self.private_attribute = state["private_attribute"]
+
+    def get_private_attribute(self):
+        return self.private_attribute
+
+
+class PrivateAttributeTests(unittest.TestCase):
+    """Unit tests for the private attribute access modifier."""
+
+    def test_get_from_method(self):
+        """Test that methods of the class can read private attributes."""
+        self.assertEqual("private", Class().get_private_attribute())
+        self.assertEqual("private", Class().get_private_attribute_via_lambda())
+
+    def test_get_from_outside(self):
+        """Test that code outside the class can't read private attributes."""
+        self.assertRaises(AccessException, getattr, Class(), "private_attribute")
+
+    def test_set_and_delete_from_outside(self):
+        """Test that code outside the class can't write or delete private attributes."""
+        instance = Class()
+        self.assertRaises(AccessException, setattr, instance, "private_attribute", "changed")
+        self.assertRaises(AccessException, delattr, instance, "private_attribute")
+        self.assertEqual("private", instance.get_private_attribute())
+
+    def test_delete_from_method(self):
+        """Test that methods of the class can delete private attributes."""
+        instance = Class()
+        instance.delete_private_attribute()
+        self.assertRaises(AttributeError, instance.get_private_attribute)
+
+    def test_get_from_subclass(self):
+        """Test that subclasses can't read private attributes, but inherited methods can."""
+        self.assertRaises(AccessException, Subclass().get_private_attribute_from_subclass)
+        self.assertEqual("private", Subclass().get_private_attribute())
+
+    def test_get_of_other_instance(self):
+        """Test that methods of the class can read private attributes of other instances of the class."""
+        self.assertEqual("private", Class().get_private_attribute_of(Class()))
+
+    def test_indexed_class(self):
+        """Test that methods of classes that index their methods can read private attributes."""
+        self.assertEqual("private", IndexedClass().get_private_attribute())
+        self.assertRaises(AccessException, getattr, IndexedClass(), "private_attribute")
+
+    def test_named_slot(self):
+        """Test that the value of the private attribute is stored in the named slot."""
+        instance = Class()
+        slot = Class.attribute_with_named_slot.__wrapped__
+        self.assertEqual("storage", slot.__name__)
+        slot.__set__(instance, "stored")
+        self.assertRaises(AccessException, getattr, instance, "attribute_with_named_slot")
+        self.assertFalse(hasattr(instance, "__dict__"))
+
+    def test_slot_is_hidden(self):
+        """Test that code outside the class can't bypass the access checks by accessing the slot."""
+        instance = Class()
+        self.assertNotIn("_private_attribute", vars(Class))
+        self.assertRaises(AttributeError, getattr, instance, "_private_attribute")
+        self.assertRaises(AttributeError, setattr, instance, "_private_attribute", "changed")
+        self.assertRaises(AttributeError, delattr, instance, "_protected_attribute")
+        self.assertRaises(AttributeError, getattr, instance, "storage")
+        self.assertEqual("private", instance.get_private_attribute())
+
+    def test_slot_of_base_class(self):
+        """Test that the slot can be declared in a base class, which keeps its descriptor."""
+
+        class Base:
+            __slots__ = ("_private_attribute",)
+
+        class ClassWithSlotOfBase(Base):
+            __slots__ = ()
+            private_attribute = privateattribute()
+
+            def __init__(self):
+                self.private_attribute = "private"
+
+        self.assertIn("_private_attribute", vars(Base))
+        self.assertRaises(AccessException, getattr, ClassWithSlotOfBase(), "private_attribute")
+
+    def test_class_access(self):
+        """Test that reading the attribute from the class returns the descriptor."""
+        self.assertEqual(
+            "<private attribute access_modifiers.tests.test_attributes.Class.private_attribute>",
+            repr(Class.private_attribute))
+
+    def test_missing_slot(self):
+        """Test that private attributes need a slot."""
+        with self.assertRaises((TypeError, RuntimeError)):
+            class ClassWithoutSlot:  # pylint: disable=unused-variable
+                private_attribute = privateattribute()
+
+    def test_disable(self):
+        """Test that disabling access checks replaces the attribute with its slot and enabling restores it."""
+        instance = Class()
+        disable()
+        try:
+            self.assertEqual("private", instance.private_attribute)
+            self.assertEqual("_private_attribute", Class.__dict__["private_attribute"].__name__)
+        finally:
+            enable()
+        self.assertRaises(AccessException, getattr, instance, "private_attribute")
+
+    def test_decorated_while_disabled(self):
+        """Test that private attributes created while access checks are disabled access the slot directly."""
+        disable()
+        try:
+            class ClassCreatedWhileDisabled:
+                __slots__ = ("_private_attribute",)
+                private_attribute = privateattribute()
+        finally:
+            enable()
+        instance = ClassCreatedWhileDisabled()
+        instance.private_attribute = "private"
+        self.assertEqual("private", instance.private_attribute)
+
+    def test_policy_off(self):
+        """Test that private attributes in modules with level off access the slot directly."""
+        set_policy({"access_modifiers.tests": "off"})
+        try:
+            class ClassWithoutChecks:
+                __slots__ = ("_private_attribute",)
+                private_attribute = privateattribute()
+        finally:
+            set_policy({})
+        instance = ClassWithoutChecks()
+        instance.private_attribute = "private"
+        self.assertEqual("private", instance.private_attribute)
+
+    def test_record_mode(self):
+        """Test that violations of private attributes can be recorded."""
+        records = []
+        enforce("record", sink=records.append)
+        try:
+            self.assertEqual("private", Class().private_attribute)
+        finally:
+            enforce()
+        self.assertTrue(str(records[0]).endswith(
+            ": Attempted access to <private attribute access_modifiers.tests.test_attributes.Class.private_attribute> "
+            "from outside its class"))
+        self.assertEqual("private attribute", records[0].as_dict()["modifier"])
+
+    def test_stats(self):
+        """Test that the access checks of private attributes are measured."""
+        collect_stats()
+        try:
+            instance = Class()
+            instance.get_private_attribute()
+            instance.get_private_attribute()
+        finally:
+            result = stats()
+            collect_stats(False)
+        method = result["methods"]["access_modifiers.tests.test_attributes.Class.private_attribute"]
+        self.assertEqual(3, method["checks"])  # One write in __init__ and two reads
+        self.assertEqual(0, method["violations"])
+
+    def test_sampling(self):
+        """Test that the access checks of private attributes can be sampled."""
+        sample(every=2)
+        try:
+            instance = Class()  # Checked
+            self.assertEqual("private", instance.private_attribute)  # Skipped
+            self.assertRaises(AccessException, setattr, instance, "private_attribute", "changed")  # Checked
+            del instance.private_attribute  # Skipped
+        finally:
+            sample()
+
+
+class ProtectedAttributeTests(unittest.TestCase):
+    """Unit tests for the protected attribute access modifier."""
+
+    def test_get_from_subclass(self):
+        """Test that methods of subclasses can read and write protected attributes of their own instance."""
+        instance = Subclass()
+        instance.set_protected_attribute_from_subclass("changed")
+        self.assertEqual("changed", instance.get_protected_attribute_from_subclass())
+
+    def test_get_from_outside(self):
+        """Test that code outside the class can't read, write, or delete protected attributes."""
+        instance = Class()
+        self.assertRaises(AccessException, getattr, instance, "protected_attribute")
+        self.assertRaises(AccessException, setattr, instance, "protected_attribute", "changed")
+        self.assertRaises(AccessException, delattr, instance, "protected_attribute")
+
+    def test_get_of_other_instance(self):
+        """Test that methods can't read protected attributes of other instances."""
+        self.assertRaises(AccessException, Class().get_protected_attribute_of, Class())
+
+    def test_class_access(self):
+        """Test that reading the attribute from the class returns the descriptor."""
+        self.assertEqual(
+            "<protected attribute access_modifiers.tests.test_attributes.Class.protected_attribute>",
+            repr(Class.protected_attribute))
+
+    def test_stats(self):
+        """Test that the access checks of protected attributes are measured."""
+        collect_stats()
+        try:
+            Subclass().get_protected_attribute_from_subclass()
+        finally:
+            result = stats()
+            collect_stats(False)
+        method = result["methods"]["access_modifiers.tests.test_attributes.Class.protected_attribute"]
+        self.assertEqual(2, method["checks"])  # One write in __init__ and one read
+
+    def test_sampling(self):
+        """Test that the access checks of protected attributes can be sampled."""
+        sample(every=2)
+        try:
+            instance = Class()  # Checked
+            instance.protected_attribute = "changed"  # Skipped
+            self.assertRaises(AccessException, getattr, instance, "protected_attribute")  # Checked
+            self.assertEqual("changed", instance.protected_attribute)  # Skipped
+        finally:
+            sample()
+
+
+class CopyTests(unittest.TestCase):
+    """Unit tests for copying and pickling instances of classes with attributes with access modifiers."""
+
+    @staticmethod
+    def copies(instance):
+        """Return copies of the instance made with copy and pickle."""
+        return copy.copy(instance), copy.deepcopy(instance), pickle.loads(pickle.dumps(instance))
+
+    def test_copy(self):
+        """Test that the values of the attributes are copied, although their slots are removed from the class."""
+        instance = Subclass()
+        instance.set_protected_attribute_from_subclass("changed")
+        for duplicate in self.copies(instance):
+            self.assertIsInstance(duplicate, Subclass)
+            self.assertEqual(("private", "changed"), (
+                duplicate.get_private_attribute(), duplicate.get_protected_attribute_from_subclass()))
+            self.assertRaises(AccessException, getattr, duplicate, "private_attribute")
+
+    def test_copy_unset_attributes(self):
+        """Test that attributes without value stay without value in the copies."""
+        instance = Class()
+        instance.delete_private_attribute()
+        for duplicate in self.copies(instance):
+            self.assertRaises(AttributeError, duplicate.get_private_attribute)
+
+    def test_copy_instance_with_dict(self):
+        """Test that the instance dict and the attributes stored in private slots are copied."""
+        for duplicate in self.copies(ClassWithDict()):
+            self.assertEqual("private", duplicate.get_private_attribute())
+            self.assertEqual("public", duplicate.public_attribute)
+
+    def test_copy_without_values(self):
+        """Test that instances without any values can be copied."""
+        instance = ClassWithDict.__new__(ClassWithDict)
+        for duplicate in self.copies(instance):
+            self.assertEqual({}, vars(duplicate))
+
+    def test_own_state(self):
+        """Test that the __getstate__ and __setstate__ of the class are kept."""
+        for duplicate in self.copies(ClassWithState()):
+            self.assertEqual("PRIVATE", duplicate.get_private_attribute())
@@ -0,0 +1,93 @@
+"""Unit tests for the benchmark suite."""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from .. import bench
+
+
+class BenchmarkTest(unittest.TestCase):
+    """Unit tests for the benchmark suite."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.output = os.path.join(self.directory.name, "results.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @staticmethod
+    def run_main(*args: str):
+        """Run the benchmarks and return the exit code and the output."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exit_code = bench.main(args)
+        return exit_code, output.getvalue().splitlines()
+
+    @staticmethod
+    def number_of_benchmarks(name_filter: str) -> int:
+        """Return the number of benchmarks whose name contains the filter."""
+        return len([benchmark for benchmark in bench.benchmarks() if name_filter in benchmark.name])
+
+    def test_benchmarks_run(self):
+        """Test that all benchmarks can be run."""
+        for benchmark in bench.benchmarks():
+            with self.subTest(benchmark=benchmark.name):
+                self.assertLess(0, bench.measure(benchmark, repeat=1, number=1)["median_ns"])
+
+    def test_report(self):
+        """Test that the results are reported, including the overhead."""
+        exit_code, lines = self.run_main("--filter", "staticmethod", "--repeat", "2", "--number", "10")
+        self.assertEqual(0, exit_code)
+        self.assertEqual(self.number_of_benchmarks("staticmethod") + 1, len(lines))
+        self.assertTrue(lines[1].startswith("call/staticmethod/privatemethod"))
+        self.assertTrue(lines[1].endswith("x"))
+
+    def test_calibrate(self):
+        """Test that the number of statements is calibrated if not specified."""
+        benchmark = next(bench.benchmarks())
+        self.assertLess(1, bench.measure(benchmark, repeat=1)["number"])
+
+    def test_compare(self):
+        """Test that the results can be compared with a baseline."""
+        self.run_main("--filter", "mro-depth-0", "--repeat", "1", "--number", "10", "--output", self.output)
+        with open(self.output) as output_file:
+            results = json.load(output_file)
+        self.assertEqual(self.number_of_benchmarks("mro-depth-0"), len(results["results"]))
+        exit_code, lines = self.run_main(
+            "--filter", "mro-depth-0", "--repeat", "1", "--number", "10", "--compare", self.output,
+            "--threshold", "1000")
+        self.assertEqual(0, exit_code)
+        self.assertEqual(self.number_of_benchmarks("mro-depth-0") + 1, len(lines))
+
+    def test_regression(self):
+        """Test that regressions are flagged."""
+        baseline = dict(results={name: dict(median_ns=1e-3) for name in bench.run("mro-depth-0", 1, 10)["results"]})
+        with open(self.output, "w") as output_file:
+            json.dump(baseline, output_file)
+        exit_code, lines = self.run_main("--filter", "mro-depth-0", "--repeat", "1", "--number", "10",
+                                         "--compare", self.output)
+        self.assertEqual(1, exit_code)
+        self.assertTrue(lines[1].endswith("REGRESSION"))
+
+    def test_threads(self):
+        """Test that the throughput of calls from multiple threads is reported, including the scaling."""
+        exit_code, lines = self.run_main(
+            "--threads", "--filter", "privatemethod/", "--number", "10", "--output", self.output)
+        self.assertEqual(0, exit_code)
+        self.assertTrue(lines[0].endswith("16 thr"))
+        self.assertTrue(lines[1].startswith("threads/privatemethod/privatemethod"))
+        self.assertTrue(lines[1].endswith("x"))
+        with open(self.output) as output_file:
+            results = json.load(output_file)
+        self.assertEqual(1.0, results["results"]["threads/privatemethod/undecorated"][0]["scaling"])
+        self.assertEqual(len(bench.THREAD_COUNTS), len(results["results"]["threads/privatemethod/undecorated"]))
+
+    def test_threads_without_output(self):
+        """Test that the threaded benchmarks don't need an output file."""
+        exit_code, lines = self.run_main("--threads", "--filter", "protectedmethod/undecorated", "--number", "10")
+        self.assertEqual((0, 2), (exit_code, len(lines)))
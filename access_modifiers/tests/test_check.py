@@ -0,0 +1,224 @@
+"""Unit tests for the static access checker."""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import textwrap
+import unittest
+
+from ..check import CACHE_VERSION, find_violations, load_cache, main, summarize, summarize_files
+
+
+SOURCE = '''
+from access_modifiers import privatemethod, protectedmethod
+import access_modifiers
+
+
+class Class:
+    @privatemethod
+    def private_method(self):
+        return "private"
+
+    @staticmethod
+    @access_modifiers.privatemethod
+    def static_private_method():
+        return "static private"
+
+    @protectedmethod
+    def protected_method(self):
+        return "protected"
+
+    def public_method(self, default=Class2()):
+        other = Class()
+        helper = lambda: self.private_method()
+        def nested():
+            return self.private_method() + self.protected_method()
+        return [self.private_method() for _ in range(1)], helper(), nested(), other.private_method(), \\
+            other.protected_method(), Class.protected_method(self), Class.protected_method(other), \\
+            self.static_private_method(), self.public_method(), self.unknown_method()
+
+
+class Subclass(Class):
+    def public_method(self):
+        return self.private_method() + super().private_method() + super().protected_method() + \\
+            self.protected_method()
+
+
+def function():
+    instance = Class()
+    instance = unknown()
+    return Class().private_method(), Class().protected_method(), Class.static_private_method(), \\
+        instance.private_method(), Unknown().private_method(), self.private_method(), function().x()
+'''
+
+
+def check(source: str):
+    """Return the violations in the source code as (line, message) tuples."""
+    violations = find_violations({"module.py": summarize(textwrap.dedent(source), "module.py")})
+    return [(violation.line, violation.message) for violation in violations]
+
+
+class CheckTest(unittest.TestCase):
+    """Unit tests for finding violations."""
+
+    def test_violations(self):
+        """Test that calls that would raise an access exception are reported."""
+        private = "call to private method Class.private_method from outside its class"
+        protected = "call to protected method Class.protected_method from another object"
+        self.assertEqual(
+            [(24, private), (26, protected), (26, protected), (32, private), (32, private), (39, private),
+             (39, protected), (39, "call to private method Class.static_private_method from outside its class")],
+            check(SOURCE))
+
+    def test_allowed_calls(self):
+        """Test that calls that are allowed at runtime are not reported."""
+        self.assertEqual([], check('''
+            class Class(Generic[T]):
+                attribute = 1
+
+                @privatemethod
+                def private_method(self, *, keyword, default=None):
+                    first, second = 1, 2
+
+                @decorator()
+                def decorated_method(self):
+                    pass
+
+                @protectedmethod
+                def protected_method(self):
+                    pass
+
+                def public_method(self):
+                    return {x: self.private_method() for x in (self.protected_method() for _ in "a")}
+            '''))
+
+    def test_nested_classes(self):
+        """Test that private methods of nested classes can be called by methods of the nested class only."""
+        self.assertEqual([(12, "call to private method Outer.Inner.private_method from outside its class")], check('''
+            class Outer:
+                class Inner:
+                    @privatemethod
+                    def private_method(self):
+                        return "Inner.private_method"
+
+                    def public_method(self):
+                        self.private_method()
+
+                def public_method(self):
+                    return Inner().private_method()
+            '''))
+
+    def test_class_defined_in_function(self):
+        """Test that classes defined in functions are checked."""
+        self.assertEqual([(11, "call to private method function.<locals>.Class.private_method from outside its "
+                                "class")], check('''
+            def function():
+                class Class:
+                    @privatemethod
+                    def private_method(self):
+                        pass
+
+                    async def public_method(self):
+                        self.private_method()
+
+                Class().private_method()
+            '''))
+
+    def test_ambiguous_class_names(self):
+        """Test that calls on instances of classes with ambiguous names are not checked."""
+        summaries = {
+            path: summarize("class Class:\n    @privatemethod\n    def private_method(self): pass\n", path)
+            for path in ("a.py", "b.py")}
+        summaries["c.py"] = summarize("Class().private_method()\n", "c.py")
+        self.assertEqual([], find_violations(summaries))
+
+    def test_base_class_in_other_file(self):
+        """Test that base classes are looked up in other files."""
+        summaries = {
+            "a.py": summarize("class Class:\n    @privatemethod\n    def private_method(self): pass\n", "a.py"),
+            "b.py": summarize("import a\nclass Subclass(a.Class, Mixin):\n    def method(self):\n"
+                              "        self.private_method()\n", "b.py")}
+        self.assertEqual(["b.py:4:8: call to private method Class.private_method from outside its class"],
+                         [str(violation) for violation in find_violations(summaries)])
+
+    def test_diamond_inheritance(self):
+        """Test that classes occurring twice in the class hierarchy are handled."""
+        self.assertEqual([(7, "call to protected method Base.protected_method from another object")], check('''
+            class Base:
+                @protectedmethod
+                def protected_method(self): pass
+            class Left(Base): pass
+            class Right(Base): pass
+            class Diamond(Left, Right): pass
+            Diamond().protected_method()
+            '''[1:]))
+
+    def test_syntax_error(self):
+        """Test that syntax errors are reported."""
+        self.assertEqual([(1, "syntax error: invalid syntax")], check("class\n"))
+
+
+class CheckFilesTest(unittest.TestCase):
+    """Unit tests for checking files from the command line."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.cache = os.path.join(self.directory.name, "cache.json")
+        self.package = os.path.join(self.directory.name, "package")
+        os.mkdir(self.package)
+        self.write("module.py", SOURCE)
+        self.write("clean.py", "print('hello')\n")
+        self.write("README.md", "not Python")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, filename: str, contents: str) -> str:
+        """Write the file in the package and return its path."""
+        path = os.path.join(self.package, filename)
+        with open(path, "w") as python_file:
+            python_file.write(contents)
+        return path
+
+    def run_main(self, *args: str):
+        """Run the checker and return the exit code and the output."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exit_code = main(args)
+        return exit_code, output.getvalue()
+
+    def test_violations(self):
+        """Test that violations are printed and the exit code is 1."""
+        exit_code, output = self.run_main("--no-cache", "--jobs", "2", self.package)
+        self.assertEqual(1, exit_code)
+        self.assertEqual(8, len(output.splitlines()))
+        self.assertFalse(os.path.exists(self.cache))
+
+    def test_no_violations(self):
+        """Test that the exit code is 0 if there are no violations."""
+        self.assertEqual((0, ""), self.run_main("--no-cache", os.path.join(self.package, "clean.py")))
+
+    def test_cache(self):
+        """Test that the summaries are cached and reused."""
+        self.assertEqual(1, self.run_main("--cache", self.cache, "--jobs", "1", self.package)[0])
+        cache = load_cache(self.cache)
+        self.assertEqual(2, len(cache))
+        path = os.path.join(self.package, "module.py")
+        cache[path]["summary"]["calls"] = []  # Fake summary to detect that the cached summary is used
+        self.assertEqual([], find_violations(summarize_files([path], cache)))
+        os.utime(path, (0, 0))  # Same contents, new mtime: the cached summary is still used
+        self.assertEqual([], find_violations(summarize_files([path], cache)))
+        self.assertEqual(0, cache[path]["mtime"])
+        self.write("module.py", SOURCE + "\n")  # New contents: the file is summarized again
+        self.assertEqual(8, len(find_violations(summarize_files([path], cache))))
+
+    def test_corrupt_cache(self):
+        """Test that a corrupt or outdated cache is ignored."""
+        with open(self.cache, "w") as cache_file:
+            cache_file.write("{")
+        self.assertEqual({}, load_cache(self.cache))
+        with open(self.cache, "w") as cache_file:
+            json.dump(dict(version=CACHE_VERSION - 1, files={"path": {}}), cache_file)
+        self.assertEqual({}, load_cache(self.cache))
@@ -0,0 +1,226 @@
+"""Unit tests for class methods and static methods with access modifiers."""
+
+import gc
+import os
+import tempfile
+import unittest
+import weakref
+
+from ..access_modifiers import (
+    allowlist, collect_stats, disable, enable, enforce, privatemethod, protectedmethod, sample, stats, AccessException)
+from ..controlled import AccessControlled
+from ..policies import set_policy
+
+
+# pylint: disable=missing-docstring,too-few-public-methods,protected-access
+
+def create_classes(base=object):
+    """Return a class with class methods and static methods with access modifiers, a subclass, and an unrelated
+    class."""
+
+    class Class(base):
+        @privatemethod
+        @classmethod
+        def private_class_method(cls):
+            return f"{cls.__name__}.private_class_method"
+
+        @protectedmethod
+        @classmethod
+        def protected_class_method(cls):
+            return f"{cls.__name__}.protected_class_method"
+
+        @privatemethod
+        @staticmethod
+        def private_static_method():
+            return "Class.private_static_method"
+
+        @protectedmethod
+        @staticmethod
+        def protected_static_method(argument):
+            return f"Class.protected_static_method({argument})"
+
+        @classmethod
+        def create(cls):
+            return cls.private_class_method() + " " + cls.protected_class_method()
+
+        @classmethod
+        def create_via_lambda(cls):
+            return (lambda: cls.private_class_method())()  # pylint: disable=unnecessary-lambda
+
+        def public_method(self):
+            return self.private_class_method() + " " + self.private_static_method()
+
+    class Subclass(Class):
+        @classmethod
+        def create_from_subclass(cls):
+            return cls.protected_class_method() + " " + super().protected_class_method()
+
+        @classmethod
+        def call_private_class_method(cls):
+            return cls.private_class_method()
+
+        @classmethod
+        def call_protected_class_method_of_base_class(cls):
+            return Class.protected_class_method()
+
+        def call_protected_static_method(self):
+            return self.protected_static_method(1)
+
+    class UnrelatedClass:
+        @classmethod
+        def call_protected_class_method(cls):
+            return Class.protected_class_method()
+
+    return Class, Subclass, UnrelatedClass
+
+
+class ClassMethodTests(unittest.TestCase):
+    """Unit tests for private and protected class methods and static methods."""
+
+    def setUp(self):
+        self.cls, self.subclass, self.unrelated_class = create_classes()
+
+    def test_call_from_class(self):
+        """Test that private and protected class methods can be called from the class methods and methods of their
+        class, also on a subclass."""
+        self.assertEqual("Class.private_class_method Class.protected_class_method", self.cls.create())
+        self.assertEqual("Subclass.private_class_method Subclass.protected_class_method", self.subclass.create())
+        self.assertEqual("Class.private_class_method", self.cls.create_via_lambda())
+        self.assertEqual("Class.private_class_method Class.private_static_method", self.cls().public_method())
+
+    def test_call_from_outside_class(self):
+        """Test that private and protected class methods and static methods can't be called from outside their
+        class."""
+        self.assertRaises(AccessException, self.cls.private_class_method)
+        self.assertRaises(AccessException, self.cls().private_class_method)
+        self.assertRaises(AccessException, self.cls.protected_class_method)
+        self.assertRaises(AccessException, self.cls.private_static_method)
+        self.assertRaises(AccessException, self.cls.protected_static_method, 1)
+
+    def test_call_from_subclass(self):
+        """Test that subclasses can call protected class methods and static methods on their own class, but not
+        private class methods."""
+        self.assertEqual(
+            "Subclass.protected_class_method Subclass.protected_class_method", self.subclass.create_from_subclass())
+        self.assertEqual("Class.protected_static_method(1)", self.subclass().call_protected_static_method())
+        self.assertRaises(AccessException, self.subclass.call_private_class_method)
+
+    def test_call_protected_class_method_on_other_class(self):
+        """Test that protected class methods can't be called on a base class or from an unrelated class."""
+        self.assertRaises(AccessException, self.subclass.call_protected_class_method_of_base_class)
+        self.assertRaises(AccessException, self.unrelated_class.call_protected_class_method)
+
+    def test_verdicts_are_cached(self):
+        """Test that the verdicts are cached per caller and class."""
+        collect_stats()
+        try:
+            self.cls.create()
+            self.cls.create()
+            self.subclass.create()
+            result = stats()
+        finally:
+            collect_stats(False)
+        self.assertEqual((6, 2), (result["checks"], result["cache_hits"]))  # Only the second calls on Class are cached
+
+    def test_cached_verdicts_do_not_keep_classes_alive(self):
+        """Test that the cached verdicts don't keep the classes the methods were called on alive."""
+        cls, subclass, unrelated_class = create_classes()
+        self.assertEqual("Class.private_class_method Class.protected_class_method", cls.create())
+        self.assertEqual(
+            "Subclass.protected_class_method Subclass.protected_class_method", subclass.create_from_subclass())
+        references = [weakref.ref(cls), weakref.ref(subclass)]
+        del cls, subclass, unrelated_class
+        gc.collect()
+        self.assertEqual([None, None], [reference() for reference in references])
+
+    def test_indexed_class(self):
+        """Test that the class methods of classes that index their methods check calls with a membership test."""
+        cls = create_classes(AccessControlled)[0]
+        collect_stats()
+        try:
+            self.assertEqual("Class.private_class_method Class.protected_class_method", cls.create())
+            result = stats()
+        finally:
+            collect_stats(False)
+        self.assertEqual((2, 2), (result["checks"], result["cache_hits"]))
+
+    def test_wrappers_keep_their_kind(self):
+        """Test that the class methods and static methods are still class methods and static methods in the class
+        after they have been looked up."""
+        self.assertEqual("Class.private_class_method Class.private_static_method", self.cls().public_method())
+        self.assertEqual("Class.protected_static_method(1)", self.subclass().call_protected_static_method())
+        self.assertIsInstance(vars(self.cls)["private_class_method"], classmethod)
+        self.assertIsInstance(vars(self.cls)["private_static_method"], staticmethod)
+        self.assertIsInstance(vars(self.cls)["protected_static_method"], staticmethod)
+        self.assertRaises(AccessException, self.cls.private_static_method)
+        self.assertRaises(AccessException, self.cls().protected_static_method, 1)
+
+    def test_static_method_decorator_above_protected_method_decorator(self):
+        """Test that calling a protected static method decorated in the wrong order raises a type error that explains
+        the right order, instead of an index error."""
+
+        class ClassWithDecoratorsInWrongOrder:
+            @staticmethod
+            @protectedmethod
+            def protected_static_method():
+                return "ClassWithDecoratorsInWrongOrder.protected_static_method"  # pragma: nocover
+
+        with self.assertRaisesRegex(TypeError, "put @protectedmethod above @staticmethod"):
+            ClassWithDecoratorsInWrongOrder.protected_static_method()
+
+    def test_disable(self):
+        """Test that disabling access checks puts the original class methods and static methods back, also after
+        they have been called."""
+        self.cls.create()
+        disable()
+        try:
+            self.assertEqual("Class.private_class_method", self.cls.private_class_method())
+            self.assertEqual("Class.protected_static_method(1)", self.cls.protected_static_method(1))
+            self.assertIsInstance(vars(self.cls)["private_class_method"], classmethod)
+            self.assertIsInstance(vars(self.cls)["protected_static_method"], staticmethod)
+        finally:
+            enable()
+        self.assertRaises(AccessException, self.cls.private_class_method)
+        self.assertRaises(AccessException, self.cls.protected_static_method, 1)
+
+    def test_sample(self):
+        """Test that the checks of class methods can be sampled."""
+        sample(every=2)
+        try:
+            self.assertRaises(AccessException, self.cls.private_class_method)
+            self.assertEqual("Class.private_class_method", self.cls.private_class_method())
+        finally:
+            sample()
+
+    def test_record(self):
+        """Test that violations can be recorded instead of raised."""
+        records = []
+        enforce("record", sink=records.append)
+        try:
+            self.assertEqual("Class.protected_class_method", self.cls.protected_class_method())
+        finally:
+            enforce()
+        self.assertEqual(["protected"], [record.modifier for record in records])
+
+    def test_allowlist(self):
+        """Test that calls of class methods are recorded in the allowlist and checked against it."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "allowlist.txt")
+            allowlist("record", path)
+            try:
+                self.cls.create()
+                allowlist("enforce", path)
+                self.assertEqual("Class.private_class_method Class.protected_class_method", self.cls.create())
+                self.assertRaises(AccessException, self.cls.create_via_lambda)
+            finally:
+                allowlist()
+
+    def test_policy_off(self):
+        """Test that class methods in modules with level off are returned unchanged."""
+        set_policy({"access_modifiers.tests": "off"})
+        try:
+            cls = create_classes()[0]
+        finally:
+            set_policy({})
+        self.assertIsInstance(vars(cls)["private_class_method"], classmethod)
+        self.assertEqual("Class.private_class_method", cls.private_class_method())
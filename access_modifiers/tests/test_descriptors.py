@@ -0,0 +1,173 @@
+"""Unit tests for the descriptors created by the access modifier decorators."""
+
+import types
+import unittest
+
+import access_modifiers.access_modifiers
+
+from ..access_modifiers import (
+    collect_stats, disable, enable, privatemethod, protectedmethod, sample, stats, AccessException)
+
+
+class DescriptorTests(unittest.TestCase):
+    """Unit tests for the descriptors that create the wrappers of methods with access modifiers when the methods are
+    first looked up."""
+
+    # pylint: disable=missing-docstring
+
+    def setUp(self):
+
+        class Class:
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                """Private method docstring."""
+                return "Class.private_method"
+
+            @property
+            @protectedmethod
+            def protected_property(self):  # pylint: disable=no-self-use
+                return "Class.protected_property"
+
+            @staticmethod
+            @privatemethod
+            def static_private_method():
+                return "Class.static_private_method"
+
+            @protectedmethod
+            @staticmethod
+            def protected_static_method():
+                """Protected static method docstring."""
+                return "Class.protected_static_method"  # pragma: nocover
+
+            def public_method(self):
+                return self.protected_property + " " + self.static_private_method()
+
+        self.cls = Class
+
+    def tearDown(self):
+        collect_stats(False)
+        sample()
+
+    def test_wrapper_replaces_descriptor(self):
+        """Test that the descriptor is replaced by the wrapper when the method is first looked up."""
+        self.assertNotIsInstance(vars(self.cls)["private_method"], types.FunctionType)
+        wrapper = self.cls.private_method
+        self.assertIs(wrapper, vars(self.cls)["private_method"])
+        self.assertEqual("private_method", wrapper.__name__)
+        self.assertEqual("Private method docstring.", wrapper.__doc__)
+
+    def test_descriptor_looks_like_method(self):
+        """Test that the descriptor has the attributes of the method."""
+        descriptor = vars(self.cls)["private_method"]
+        self.assertEqual(
+            ("private_method", f"{self.cls.__qualname__}.private_method", __name__, "Private method docstring."),
+            (descriptor.__name__, descriptor.__qualname__, descriptor.__module__, descriptor.__doc__))
+
+    def test_class_level_descriptor_looks_like_method(self):
+        """Test that the descriptor of a static method, and the static method that takes its place when it's first
+        looked up, have the attributes of the method."""
+        for _ in range(2):
+            descriptor = vars(self.cls)["protected_static_method"]
+            self.assertEqual(
+                ("protected_static_method", f"{self.cls.__qualname__}.protected_static_method", __name__,
+                 "Protected static method docstring."),
+                (descriptor.__name__, descriptor.__qualname__, descriptor.__module__, descriptor.__doc__))
+            self.assertIsNotNone(self.cls.protected_static_method)
+
+    def test_descriptor_class_keeps_its_docstring(self):
+        """Test that the class of the descriptor keeps its own docstring and module."""
+        descriptor_class = type(vars(self.cls)["private_method"])
+        self.assertEqual(("Descriptor for a private method.", "access_modifiers.access_modifiers"), (
+            descriptor_class.__doc__, descriptor_class.__module__))
+
+    def test_descriptor_added_later(self):
+        """Test that the calls of a method with access modifier added to the class after it was created are checked,
+        without replacing the descriptor."""
+
+        def private_method(self):  # pylint: disable=unused-argument
+            return "private_method"  # pragma: nocover
+
+        self.cls.private_method_added_later = privatemethod(private_method)
+        self.assertRaises(AccessException, self.cls().private_method_added_later)
+        self.assertNotIsInstance(vars(self.cls)["private_method_added_later"], types.FunctionType)
+
+    def test_disable_before_lookup(self):
+        """Test that the descriptor is replaced by the original method when disabling access checks."""
+        try:
+            disable()
+            self.assertEqual("Class.private_method", self.cls().private_method())
+        finally:
+            enable()
+        self.assertRaises(AccessException, self.cls().private_method)
+
+    def test_disable_method_copied_to_subclass(self):
+        """Test that disabling access checks also puts the original method back in subclasses that copied the
+        wrapper."""
+        wrapper = self.cls.private_method
+
+        class Subclass(self.cls):
+            copied_private_method = wrapper
+
+        try:
+            disable()
+            self.assertEqual("Class.private_method", Subclass().copied_private_method())
+        finally:
+            enable()
+        self.assertRaises(AccessException, Subclass().copied_private_method)
+
+    def test_disable_method_put_in_other_class(self):
+        """Test that disabling access checks also puts the original method back in other classes the descriptor was
+        put in."""
+
+        class OtherClass:  # pylint: disable=too-few-public-methods
+            other_private_method = vars(self.cls)["private_method"]
+
+        try:
+            disable()
+            self.assertEqual("Class.private_method", OtherClass().other_private_method())
+            self.assertEqual("Class.private_method", self.cls().private_method())
+        finally:
+            enable()
+        self.assertRaises(AccessException, OtherClass().other_private_method)
+
+    def test_classes_to_swap(self):
+        """Test that disabling access checks only visits the classes the methods were put in and their subclasses,
+        unless a method wasn't put in one class, like a method wrapped in a static method."""
+        classes = access_modifiers.access_modifiers._classes  # pylint: disable=protected-access
+
+        class Subclass(self.cls):
+            pass
+
+        wrapper = self.cls.private_method
+        self.assertEqual({self.cls, Subclass}, set(classes([wrapper])))
+        self.assertIn(object, list(classes([wrapper, vars(self.cls)["static_private_method"].__func__])))
+
+    def test_call_descriptor(self):
+        """Test that the descriptor checks the calls of static methods and properties, which call it directly."""
+        self.assertEqual("Class.protected_property Class.static_private_method", self.cls().public_method())
+        self.assertRaises(AccessException, getattr, self.cls(), "protected_property")
+        self.assertRaises(AccessException, self.cls.static_private_method)
+
+    def test_call_descriptor_with_stats(self):
+        """Test that the checks of the descriptor are counted."""
+        collect_stats()
+        self.cls().public_method()
+        self.assertEqual(2, stats()["checks"])
+
+    def test_call_descriptor_with_sampling(self):
+        """Test that the checks of the descriptor are sampled."""
+        sample(every=2)
+        self.assertRaises(AccessException, self.cls.static_private_method)
+        self.assertEqual("Class.static_private_method", self.cls.static_private_method())
+        self.assertRaises(AccessException, getattr, self.cls(), "protected_property")
+        self.assertEqual("Class.protected_property", self.cls().protected_property)
+
+    def test_call_descriptor_with_sampling_per_call_site(self):
+        """Test that the checks of the descriptor are sampled per call site of the method."""
+        sample(every=2, per_call_site=True)
+        self.assertRaises(AccessException, self.cls.static_private_method)
+
+        def call_from_other_call_site():
+            return self.cls.static_private_method()
+
+        self.assertRaises(AccessException, call_from_other_call_site)
@@ -0,0 +1,108 @@
+"""Unit tests for recording access modifier violations instead of raising them."""
+
+import unittest
+from unittest.mock import patch
+
+from ..access_modifiers import (
+    collect_stats, enforce, privatemethod, protectedmethod, stats, AccessException)
+
+
+class EnforceTests(unittest.TestCase):
+    """Unit tests for the enforcement modes."""
+
+    # pylint: disable=missing-docstring
+
+    class Class:
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"
+
+        @protectedmethod
+        def protected_method(self):  # pylint: disable=no-self-use
+            return "Class.protected_method"
+
+    def setUp(self):
+        self.records = []
+        enforce("record", sink=self.records.append)
+
+    def tearDown(self):
+        enforce()
+        collect_stats(False)
+
+    def test_raise(self):
+        """Test that violations raise an AccessException by default."""
+        enforce()
+        self.assertRaises(AccessException, self.Class().private_method)
+
+    def test_invalid_mode(self):
+        """Test that the enforcement mode is checked."""
+        self.assertRaises(ValueError, enforce, "ignore")
+
+    def test_record_private_method_violation(self):
+        """Test that a call of a private method from outside its class is recorded and the method is called."""
+        self.assertEqual("Class.private_method", self.Class().private_method())
+        record = self.records[0]
+        self.assertEqual(("private", __file__), (record.modifier, record.filename))
+        self.assertIn("Attempted call to private method", str(record))
+
+    def test_record_protected_method_violation(self):
+        """Test that a call of a protected method from another object is recorded and the method is called."""
+        self.assertEqual("Class.protected_method", self.Class().protected_method())
+        self.assertEqual("protected", self.records[0].modifier)
+
+    def test_deduplicate(self):
+        """Test that each violating caller code location is recorded once."""
+        instance = self.Class()
+        for _ in range(3):
+            instance.private_method()
+        instance.private_method()
+        self.assertEqual(2, len(self.records))
+
+    def test_rate_limit(self):
+        """Test that at most limit records are handed to the sink per period."""
+        enforce("record", sink=self.records.append, limit=1)
+        instance = self.Class()
+        instance.private_method()
+        instance.private_method()
+        instance.private_method()
+        self.assertEqual(1, len(self.records))
+
+    def test_suppressed_count(self):
+        """Test that the number of suppressed records is passed with the next record, in the next period."""
+        instance = self.Class()
+        with patch("access_modifiers.sinks.monotonic", side_effect=[0, 0, 0, 100]):
+            enforce("record", sink=self.records.append, limit=1)
+            instance.private_method()
+            instance.private_method()
+            instance.private_method()
+        self.assertEqual([0, 1], [record.suppressed for record in self.records])
+
+    def test_forget_seen_violations(self):
+        """Test that the seen violations are forgotten when there are too many."""
+        instance = self.Class()
+        with patch("access_modifiers.sinks._SEEN_SIZE", 1):
+            instance.private_method()
+            instance.protected_method()
+            instance.private_method()
+        self.assertEqual(3, len(self.records))
+
+    def test_record_as_dict(self):
+        """Test that a record can be converted to a dict."""
+        self.Class().private_method()
+        record = self.records[0].as_dict()
+        self.assertEqual(f"{__name__}.EnforceTests.Class.private_method", record["method"])
+        self.assertEqual(0, record["suppressed"])
+
+    def test_count_recorded_violations(self):
+        """Test that recorded violations are counted in the stats."""
+        collect_stats()
+        self.Class().private_method()
+        self.Class().protected_method()
+        self.assertEqual(2, stats()["violations"])
+
+    def test_default_sink(self):
+        """Test that the records are logged by default."""
+        enforce("record")
+        with self.assertLogs("access_modifiers") as logs:
+            self.Class().private_method()
+        self.assertIn("Attempted call to private method", logs.output[0])
@@ -0,0 +1,127 @@
+"""Unit tests for the exceptions raised by the access checks."""
+
+import pickle
+import sys
+import traceback
+import unittest
+from unittest.mock import Mock, patch
+
+from ..access_modifiers import (
+    collect_stats, privateattribute, privatemethod, protectedattribute, protectedmethod, AccessException,
+    PrivateAccessException, ProtectedAccessException)
+
+
+# pylint: disable=missing-docstring,too-few-public-methods,no-member
+
+class Class:
+    __slots__ = ("_private_attribute", "_protected_attribute")
+
+    private_attribute = privateattribute()
+    protected_attribute = protectedattribute()
+
+    @privatemethod
+    def private_method(self):
+        return "Class.private_method"  # pragma: nocover
+
+    @protectedmethod
+    def protected_method(self):
+        return "Class.protected_method"  # pragma: nocover
+
+
+def call_private_method():
+    return Class().private_method()
+
+
+class ExceptionTests(unittest.TestCase):
+    """Unit tests for the private and protected access exceptions."""
+
+    def test_private_method(self):
+        """Test that calling a private method from outside its class raises a private access exception with the callee
+        and the caller."""
+        with self.assertRaises(PrivateAccessException) as context:
+            call_private_method()
+        exception = context.exception
+        self.assertIsInstance(exception, AccessException)
+        self.assertEqual(f"{__name__}.Class.private_method", exception.callee)
+        self.assertEqual("call_private_method", exception.caller)
+        self.assertEqual(
+            (__file__, call_private_method.__code__.co_firstlineno + 1), (exception.filename, exception.lineno))
+        self.assertEqual("private", exception.modifier)
+        self.assertEqual(f"Attempted call to private method {__name__}.Class.private_method from outside its class",
+                         str(exception))
+
+    def test_protected_method(self):
+        """Test that calling a protected method from another object raises a protected access exception."""
+        with self.assertRaises(ProtectedAccessException) as context:
+            Class().protected_method()
+        self.assertEqual("protected", context.exception.modifier)
+        self.assertTrue(str(context.exception).startswith("Attempted call to protected method"))
+
+    def test_attributes(self):
+        """Test that accessing private and protected attributes from outside their class raises access exceptions
+        with the attribute as callee."""
+        with self.assertRaises(PrivateAccessException) as context:
+            Class().private_attribute = "private"
+        self.assertEqual(f"{__name__}.Class.private_attribute", context.exception.callee)
+        self.assertEqual("private attribute", context.exception.modifier)
+        with self.assertRaises(ProtectedAccessException) as context:
+            del Class().protected_attribute
+        self.assertEqual("protected attribute", context.exception.modifier)
+
+    def test_message_is_formatted_lazily(self):
+        """Test that the message is only formatted when the exception is converted to a string."""
+        message = Mock(format=Mock(return_value="message"))
+        with patch.dict("access_modifiers.access_modifiers._MESSAGES", private=message):
+            with self.assertRaises(PrivateAccessException) as context:
+                call_private_method()
+            message.format.assert_not_called()
+            self.assertEqual("message", str(context.exception))
+
+    def assert_traceback_ends_in_caller(self, call, caller):
+        """Assert that the traceback of the access exception raised by the call ends in the caller."""
+        try:
+            call()
+        except AccessException as exception:
+            self.assertEqual(caller, traceback.extract_tb(exception.__traceback__)[-1].name)
+        else:
+            self.fail("Expected an AccessException")  # pragma: nocover
+
+    @unittest.skipIf(sys.version_info < (3, 11), "Bare raise adds the traceback of the caught exception before 3.11")
+    def test_traceback(self):
+        """Test that the frames of the access check are trimmed from the traceback."""
+        self.assert_traceback_ends_in_caller(call_private_method, "call_private_method")
+        self.assert_traceback_ends_in_caller(Class().protected_method, "assert_traceback_ends_in_caller")
+        self.assert_traceback_ends_in_caller(lambda: Class().private_attribute, "<lambda>")
+
+    @unittest.skipIf(sys.version_info < (3, 11), "Bare raise adds the traceback of the caught exception before 3.11")
+    def test_traceback_with_stats(self):
+        """Test that the frames of the access check are trimmed from the traceback when the checks are measured."""
+        collect_stats()
+        try:
+            self.assert_traceback_ends_in_caller(call_private_method, "call_private_method")
+        finally:
+            collect_stats(False)
+
+    def test_pickle(self):
+        """Test that the exceptions can be pickled, so they can be sent to other processes."""
+        with self.assertRaises(PrivateAccessException) as context:
+            call_private_method()
+        exception = pickle.loads(pickle.dumps(context.exception))
+        self.assertEqual((f"{__name__}.Class.private_method", "call_private_method", "private"), (
+            exception.callee, exception.caller, exception.modifier))
+        self.assertEqual(str(context.exception), str(exception))
+
+    def test_created_by_user(self):
+        """Test that exceptions created by other code render like plain exceptions and have no attributes, whatever
+        their arguments."""
+        for exception, message in (
+                (PrivateAccessException(), ""), (PrivateAccessException("custom message"), "custom message"),
+                (ProtectedAccessException("callee", "caller", "filename.py", 1),
+                 "('callee', 'caller', 'filename.py', 1)"),
+                (ProtectedAccessException("callee", "caller", "filename.py", 1, "protected"),
+                 "('callee', 'caller', 'filename.py', 1, 'protected')")):
+            with self.subTest(exception=exception):
+                exception = pickle.loads(pickle.dumps(exception))
+                self.assertEqual(message, str(exception))
+                self.assertEqual((None, None, None, None, None), (
+                    exception.callee, exception.caller, exception.filename, exception.lineno, exception.modifier))
@@ -0,0 +1,164 @@
+"""Unit tests for the import hook that strips the access modifiers."""
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ..access_modifiers import AccessException
+from .. import importhook
+
+
+MODULE = '''
+import access_modifiers
+from access_modifiers import (
+    access_controlled, privateattribute, privatemethod, protectedattribute, protectedmethod, AccessControlled)
+
+
+class Class:
+    @privatemethod
+    def private_method(self):
+        return "Class.private_method"
+
+    @staticmethod
+    @access_modifiers.privatemethod
+    def static_private_method():
+        return "Class.static_private_method"
+
+    @protectedmethod
+    async def protected_method(self):
+        return "Class.protected_method"
+
+    @property
+    def public_property(self):
+        return "Class.public_property"
+
+
+@access_controlled
+class ControlledClass(AccessControlled):
+    __slots__ = ("_private_attribute", "storage", "_unchanged")
+
+    private_attribute = privateattribute()
+    protected_attribute = access_modifiers.protectedattribute(slot="storage")
+
+    def __init__(self):
+        self.private_attribute = "private"
+        self.protected_attribute = "protected"
+
+    def __private_method(self):
+        return "ControlledClass.__private_method"
+
+
+class SubclassWithSlotOfBase(ControlledClass):
+    __slots__ = ()
+    unchanged = privateattribute()
+'''
+
+
+class ImportHookTest(unittest.TestCase):
+    """Unit tests for the import hook."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.package = os.path.join(self.directory.name, "stripped_package")
+        os.mkdir(self.package)
+        self.write("__init__.py", "")
+        self.write("module.py", MODULE)
+        self.write("plain.py", "VALUE = 'plain'\n")
+        self.write("other_module.py", MODULE)
+        sys.path.insert(0, self.directory.name)
+        dont_write_bytecode = patch("sys.dont_write_bytecode", False)
+        dont_write_bytecode.start()
+        self.addCleanup(dont_write_bytecode.stop)
+        importhook.install("stripped_package.module", "stripped_package.plain")
+
+    def tearDown(self):
+        importhook.uninstall()
+        sys.path.remove(self.directory.name)
+        for name in list(sys.modules):
+            if name.startswith("stripped_package"):
+                del sys.modules[name]
+        self.directory.cleanup()
+
+    def write(self, filename: str, contents: str) -> None:
+        """Write the file in the package."""
+        with open(os.path.join(self.package, filename), "w", encoding="utf-8") as module_file:
+            module_file.write(contents)
+
+    @staticmethod
+    def import_module(name: str):
+        """Import the module, also if it has been imported before."""
+        sys.modules.pop(f"stripped_package.{name}", None)
+        importlib.invalidate_caches()
+        return importlib.import_module(f"stripped_package.{name}")
+
+    def bytecode_path(self, name: str) -> str:
+        """Return the path of the stripped bytecode of the module."""
+        source_path = os.path.join(self.package, f"{name}.py")
+        return importlib.util.cache_from_source(source_path, optimization=importhook.OPTIMIZATION_TAG)
+
+    def test_strip_decorators(self):
+        """Test that the access modifier decorators are stripped."""
+        instance = self.import_module("module").Class()
+        self.assertEqual("Class.private_method", instance.private_method())
+        self.assertEqual("Class.static_private_method", instance.static_private_method())
+        self.assertEqual("Class.public_property", instance.public_property)
+        self.assertTrue(os.path.exists(self.bytecode_path("module")))
+
+    def test_strip_class_decorator_base_class_and_attributes(self):
+        """Test that the access_controlled decorator, the AccessControlled base class, and the attributes with access
+        modifiers are stripped."""
+        module = self.import_module("module")
+        instance = module.ControlledClass()
+        private_method = instance._ControlledClass__private_method  # pylint: disable=protected-access
+        self.assertEqual("ControlledClass.__private_method", private_method())
+        self.assertEqual(("private", "protected"), (instance.private_attribute, instance.protected_attribute))
+        self.assertEqual((object,), module.ControlledClass.__bases__)
+        self.assertEqual(("private_attribute", "protected_attribute", "_unchanged"), module.ControlledClass.__slots__)
+        # Attributes whose slot is declared in a base class are kept
+        self.assertRaises(AccessException, getattr, module.SubclassWithSlotOfBase(), "unchanged")
+
+    def test_other_modules_are_not_stripped(self):
+        """Test that only modules in the given packages are stripped."""
+        self.assertRaises(AccessException, self.import_module("other_module").Class().private_method)
+
+    def test_modules_without_access_modifiers_are_loaded_normally(self):
+        """Test that modules without access modifiers are loaded with the normal bytecode cache."""
+        self.assertEqual("plain", self.import_module("plain").VALUE)
+        self.assertFalse(os.path.exists(self.bytecode_path("plain")))
+
+    def test_bytecode_cache(self):
+        """Test that the stripped bytecode is reused if the source didn't change."""
+        self.import_module("module")
+        with patch.object(importhook.StrippingLoader, "source_to_code") as source_to_code:
+            self.assertEqual("Class.private_method", self.import_module("module").Class().private_method())
+        source_to_code.assert_not_called()
+
+    def test_changed_source(self):
+        """Test that the stripped bytecode is not reused if the source changed."""
+        self.import_module("module")
+        self.write("module.py", MODULE.replace("Class.private_method", "Class.changed_private_method"))
+        self.assertEqual("Class.changed_private_method", self.import_module("module").Class().private_method())
+
+    def test_dont_write_bytecode(self):
+        """Test that no bytecode is written if Python has been told not to."""
+        with patch("sys.dont_write_bytecode", True):
+            self.import_module("module")
+        self.assertFalse(os.path.exists(self.bytecode_path("module")))
+
+    def test_uninstall(self):
+        """Test that modules are not stripped after uninstalling the import hook."""
+        importhook.uninstall()
+        self.assertRaises(AccessException, self.import_module("module").Class().private_method)
+
+    def test_strip_all_modules(self):
+        """Test that all modules are stripped if no packages are given."""
+        importhook.install()
+        self.assertEqual("Class.private_method", self.import_module("other_module").Class().private_method())
+
+    def test_missing_module(self):
+        """Test that the import hook leaves missing modules to the other finders."""
+        importhook.install()
+        self.assertRaises(ModuleNotFoundError, self.import_module, "missing")
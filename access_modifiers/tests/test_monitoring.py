@@ -0,0 +1,203 @@
+"""Unit tests for the sys.monitoring backend."""
+
+import gc
+import sys
+import unittest
+import weakref
+from unittest.mock import patch
+
+import access_modifiers.monitoring
+
+from ..access_modifiers import (
+    collect_stats, disable, enable, enforce, privatemethod, protectedmethod, sample, stats, use_backend,
+    AccessException)
+from ..controlled import access_controlled, AccessControlled
+
+
+def create_classes():  # pragma: nocover, sys.monitoring is available since Python 3.12
+    """Return classes with methods with access modifiers."""
+
+    # pylint: disable=missing-docstring
+
+    class Class:
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"
+
+        @protectedmethod
+        def protected_method(self):  # pylint: disable=no-self-use
+            return "Class.protected_method"
+
+        @staticmethod
+        @protectedmethod
+        def static_protected_method():
+            return "Class.static_protected_method"
+
+        def public_method(self):
+            return self.private_method() + " " + self.protected_method()
+
+        def public_method_using_lambda(self):
+            return (lambda: self.private_method())()  # pylint: disable=unnecessary-lambda
+
+    class Subclass(Class):
+        def public_method_calling_private_method(self):
+            return self.private_method()
+
+    class IndexedClass(AccessControlled):
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "IndexedClass.private_method"
+
+        def public_method(self):
+            return self.private_method()
+
+    return Class, Subclass, IndexedClass
+
+
+@unittest.skipIf(sys.version_info < (3, 12), "sys.monitoring is available since Python 3.12")
+class MonitoringBackendTests(unittest.TestCase):  # pragma: nocover
+    """Unit tests for checking the access with sys.monitoring."""
+
+    def setUp(self):
+        use_backend("monitoring")
+        self.cls, self.subclass, self.indexed_class = create_classes()
+        use_backend()
+
+    def test_methods_are_not_wrapped(self):
+        """Test that the methods are not wrapped."""
+        self.assertFalse(hasattr(self.cls.private_method, "__wrapped__"))
+        self.assertFalse(hasattr(self.cls.protected_method, "__wrapped__"))
+
+    def test_call_from_class(self):
+        """Test that private and protected methods can be called from their class."""
+        self.assertEqual("Class.private_method Class.protected_method", self.cls().public_method())
+        self.assertEqual("Class.private_method", self.cls().public_method_using_lambda())
+        self.assertEqual("IndexedClass.private_method", self.indexed_class().public_method())
+
+    def test_call_from_outside_class(self):
+        """Test that private and protected methods can't be called from outside their class."""
+        self.assertRaises(AccessException, self.cls().private_method)
+        self.assertRaises(AccessException, self.cls().protected_method)
+        self.assertRaises(AccessException, self.cls.static_protected_method)
+
+    def test_call_private_method_from_subclass(self):
+        """Test that private methods can't be called from a subclass."""
+        self.assertRaises(AccessException, self.subclass().public_method_calling_private_method)
+
+    def test_disable(self):
+        """Test that the checks can be turned off and on after the methods have been decorated."""
+        disable()
+        try:
+            self.assertEqual("Class.private_method", self.cls().private_method())
+            self.assertEqual("Class.protected_method", self.cls().protected_method())
+        finally:
+            enable()
+        self.assertRaises(AccessException, self.cls().protected_method)
+
+    def test_sample(self):
+        """Test that the checks can be sampled."""
+        sample(every=2)
+        try:
+            self.assertRaises(AccessException, self.cls().protected_method)
+            self.assertEqual("Class.protected_method", self.cls().protected_method())
+        finally:
+            sample()
+
+    def test_stats(self):
+        """Test that the checks are counted."""
+        collect_stats()
+        try:
+            self.cls().public_method()
+            self.assertRaises(AccessException, self.cls().private_method)
+            self.assertEqual((3, 1), (stats()["checks"], stats()["violations"]))
+        finally:
+            collect_stats(False)
+
+    def test_record(self):
+        """Test that violations can be recorded instead of raised."""
+        records = []
+        enforce("record", sink=records.append)
+        try:
+            self.assertEqual("Class.private_method", self.cls().private_method())
+            self.assertEqual("Class.static_protected_method", self.cls.static_protected_method())
+        finally:
+            enforce()
+        self.assertEqual(["private", "protected"], [record.modifier for record in records])
+
+    def test_access_controlled(self):
+        """Test that the access controlled class decorator uses the backend and leaves methods that already have an
+        access modifier alone."""
+        use_backend("monitoring")
+        try:
+            @access_controlled
+            class Class:  # pylint: disable=missing-docstring,too-few-public-methods
+                @privatemethod
+                def _private_method(self):  # pylint: disable=no-self-use
+                    return "Class._private_method"
+
+                def _protected_method(self):
+                    return self._private_method()
+        finally:
+            use_backend()
+        self.assertFalse(hasattr(Class._protected_method, "__wrapped__"))  # pylint: disable=protected-access
+        self.assertRaises(AccessException, Class()._protected_method)  # pylint: disable=protected-access
+
+        class Subclass(Class):  # pylint: disable=missing-docstring,too-few-public-methods
+            def public_method(self):  # pylint: disable=missing-docstring
+                return self._private_method()
+
+        self.assertRaises(AccessException, Subclass().public_method)  # The private method didn't become protected
+
+    def test_classes_created_by_the_same_function(self):
+        """Test that the methods of classes created by the same function, which share their code, are checked with
+        the verdict cache of their own class."""
+        use_backend("monitoring")
+        try:
+            other_cls = create_classes()[0]
+        finally:
+            use_backend()
+        self.assertIs(self.cls.private_method.__code__, other_cls.private_method.__code__)
+        for cls in (self.cls, other_cls):
+            self.assertEqual("Class.private_method Class.protected_method", cls().public_method())
+            self.assertRaises(AccessException, cls().private_method)
+
+    def test_garbage_collection(self):
+        """Test that monitored methods and their verdict caches don't keep dynamically created classes alive, and
+        that monitoring the methods stops when they are garbage collected."""
+        use_backend("monitoring")
+        try:
+            class Class:  # pylint: disable=missing-docstring
+                @privatemethod
+                def private_method(self):  # pylint: disable=no-self-use
+                    return "private_method"
+
+                def public_method(self):
+                    return self.private_method()
+        finally:
+            use_backend()
+        self.assertEqual("private_method", Class().public_method())
+        code, reference = Class.private_method.__code__, weakref.ref(Class)
+        del Class
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertNotIn(id(code), access_modifiers.monitoring._MONITORED)  # pylint: disable=protected-access
+
+    def test_no_tool_id_available(self):
+        """Test that an exception is raised if all tool ids are in use."""
+        tool_id_in_use = access_modifiers.monitoring._TOOL  # pylint: disable=protected-access
+        with patch("access_modifiers.monitoring._TOOL", None), \
+                patch("access_modifiers.monitoring._TOOL_IDS", (tool_id_in_use,)):
+            self.assertRaises(RuntimeError, use_backend, "monitoring")
+
+
+class BackendTests(unittest.TestCase):
+    """Unit tests for selecting the backend."""
+
+    def test_invalid_backend(self):
+        """Test that the backend is checked."""
+        self.assertRaises(ValueError, use_backend, "tracing")
+
+    @unittest.skipIf(sys.version_info >= (3, 12), "sys.monitoring is available since Python 3.12")
+    def test_monitoring_backend_not_available(self):  # pragma: nocover
+        """Test that the monitoring backend needs Python 3.12 or newer."""
+        self.assertRaises(ValueError, use_backend, "monitoring")
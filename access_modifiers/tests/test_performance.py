@@ -1,11 +1,23 @@
 """Performance tests for the access modifiers."""
 
+import importlib
+import os
+import sys
+import tempfile
+import time
 import timeit
 import unittest
+from unittest.mock import patch
 
+from ..access_modifiers import enable, sample
+from .. import bench, importhook
 
+
+@unittest.skipUnless(
+    os.environ.get("ACCESS_MODIFIERS_TIMING_TESTS"),
+    "Wall-clock comparisons are flaky on busy machines; set ACCESS_MODIFIERS_TIMING_TESTS=1 to run them")
 class PerformanceTest(unittest.TestCase):
-    """Performance tests for the access modifiers."""
+    """Performance tests for the access modifiers. They compare wall-clock times, so they don't run by default."""
 
     def setUp(self):
         self.number = 10_000  # How often to repeat the performance test with timeit.
@@ -89,3 +101,212 @@ class C:
 c = C()
 """, number=self.number)
         self.assertLess(time_with_modifier, time_without_modifier * 10)
+
+    def test_call_private_class_method(self):
+        """Test the time it takes to call private class methods as compared to class methods without access
+        modifier."""
+        setup = """
+from access_modifiers import privatemethod
+class C:
+    @privatemethod
+    @classmethod
+    def private_class_method(cls):
+        pass
+    @classmethod
+    def create(cls):
+        cls.private_class_method()
+"""
+        time_without_modifier = min(
+            timeit.repeat("C.create()", setup=setup.replace("@privatemethod", ""), number=self.number, repeat=3))
+        time_with_modifier = min(timeit.repeat("C.create()", setup=setup, number=self.number, repeat=3))
+        self.assertLess(time_with_modifier, time_without_modifier * 15)
+
+    def test_call_protected_class_method_from_class_method_with_many_locals(self):
+        """Test that the time protected class method access checks take doesn't depend on the number of locals of
+        the caller, because the verdicts are cached per caller and class."""
+        overhead = {}
+        for number_of_locals in (0, 100):
+            setup = f"""
+from access_modifiers import protectedmethod
+class C:
+    @protectedmethod
+    @classmethod
+    def protected_class_method(cls):
+        pass
+class Subclass(C):
+    @classmethod
+    def create(cls):
+        {"; ".join(f"local{index} = {index}" for index in range(number_of_locals)) or "pass"}
+        cls.protected_class_method()
+"""
+            time_without_modifier = min(timeit.repeat(
+                "Subclass.create()", setup=setup.replace("@protectedmethod", ""), number=self.number, repeat=3))
+            time_with_modifier = min(timeit.repeat("Subclass.create()", setup=setup, number=self.number, repeat=3))
+            overhead[number_of_locals] = time_with_modifier - time_without_modifier
+        self.assertLess(overhead[100], overhead[0] * 1.5)
+
+    def test_call_private_method_in_deep_class_hierarchy(self):
+        """Test that calling private methods in a deep class hierarchy is faster if the class indexes its methods."""
+        setup = """
+from access_modifiers import AccessControlled, privatemethod
+class C0{bases}:
+    @privatemethod
+    def private_method(self):
+        pass
+    def public_method(self):
+        self.private_method()
+""" + "".join(f"class C{index}(C{index - 1}):\n    pass\n" for index in range(1, 21)) + "c = C20()\n"
+        time_without_index = timeit.timeit("c.public_method()", setup=setup.format(bases=""), number=self.number)
+        time_with_index = timeit.timeit(
+            "c.public_method()", setup=setup.format(bases="(AccessControlled)"), number=self.number)
+        self.assertLess(time_with_index, time_without_index)
+
+    def access_check_overhead(self, modifier: str, number_of_locals: int) -> float:
+        """Return the time the access checks add to calling a method from a method with the number of locals."""
+        setup = f"""
+from access_modifiers import {modifier}
+class C:
+    @{modifier}
+    def method(self):
+        pass
+    def public_method(self):
+        {"; ".join(f"local{index} = {index}" for index in range(number_of_locals)) or "pass"}
+        self.method()
+c = C()
+"""
+        time_without_modifier = min(
+            timeit.repeat("c.public_method()", setup=setup.replace(f"@{modifier}", ""), number=self.number, repeat=3))
+        time_with_modifier = min(timeit.repeat("c.public_method()", setup=setup, number=self.number, repeat=3))
+        return time_with_modifier - time_without_modifier
+
+    @unittest.skipIf(sys.version_info < (3, 13), "Frame locals are copied into a dict on each access before 3.13")
+    def test_call_protected_method_from_method_with_many_locals(self):
+        """Test that the time protected method access checks take doesn't depend on the number of locals of the
+        caller."""
+        self.assertLess(
+            self.access_check_overhead("protectedmethod", 100), self.access_check_overhead("protectedmethod", 0) * 1.5)
+
+    def test_call_private_method_from_outside_class(self):
+        """Test the time it takes to reject calls of private methods as compared to raising an exception in a method
+        without access modifier, since the message of the exception isn't formatted until it's needed."""
+        setup = """
+from access_modifiers import AccessException, privatemethod
+class C:
+    @privatemethod
+    def private_method(self):
+        raise AccessException
+def function(c):
+    try:
+        c.private_method()
+    except AccessException:
+        pass
+c = C()
+"""
+        time_without_modifier = min(timeit.repeat(
+            "function(c)", setup=setup.replace("@privatemethod", ""), number=self.number, repeat=3))
+        time_with_modifier = min(timeit.repeat("function(c)", setup=setup, number=self.number, repeat=3))
+        self.assertLess(time_with_modifier, time_without_modifier * 8)
+
+    def test_call_private_method_after_disabling_access_checks(self):
+        """Test that calling private methods after disabling access checks is as fast as calling methods without
+        access modifier."""
+        time_without_modifier = min(timeit.repeat("c.public_method()", setup="""
+class C:
+    def private_method(self):
+        pass
+    def public_method(self):
+        self.private_method()
+c = C()
+""", number=self.number, repeat=5))
+
+        try:
+            time_with_modifier = min(timeit.repeat("c.public_method()", setup="""
+from access_modifiers import disable, privatemethod
+class C:
+    @privatemethod
+    def private_method(self):
+        pass
+    def public_method(self):
+        self.private_method()
+c = C()
+disable()
+""", number=self.number, repeat=5))
+        finally:
+            enable()
+        self.assertLess(time_with_modifier, time_without_modifier * 1.5)
+
+    def test_call_protected_method_with_sampling(self):
+        """Test that the time it takes to call protected methods decreases with the sampling interval."""
+        setup = f"""
+from access_modifiers import protectedmethod
+class C:
+    @protectedmethod
+    def protected_method(self):
+        pass
+    def public_method(self):
+        {"; ".join(f"local{index} = {index}" for index in range(50))}
+        self.protected_method()
+c = C()
+"""
+        times = {}
+        try:
+            for every in (1, 10, 100):
+                sample(every=every)
+                times[every] = min(timeit.repeat("c.public_method()", setup=setup, number=self.number, repeat=3))
+        finally:
+            sample()
+        self.assertLess(times[10], times[1])
+        self.assertLess(times[100], times[1])
+
+    def test_call_protected_method_compared_to_baseline(self):
+        """Test that calling protected methods takes about as long as with the wrapper of version 0.3.1, which only
+        compared the caller's self with the instance, when sampling, collecting stats, and the allowlist are off."""
+        times = {benchmark.name: bench.measure(benchmark, repeat=25, number=self.number)["min_ns"]
+                 for benchmark in bench.benchmarks() if benchmark.name.startswith("call/protected/")}
+        self.assertLess(times["call/protected/protectedmethod"], times["call/protected/baseline"] * 1.25)
+
+    def test_import_with_import_hook(self):
+        """Test that importing modules with thousands of methods with access modifiers is faster when the import
+        hook strips the access modifiers."""
+        methods = "".join(f"""
+    @privatemethod
+    def private_method_{index}(self):
+        pass
+
+    @protectedmethod
+    def protected_method_{index}(self):
+        pass
+""" for index in range(5))
+        module = "from access_modifiers import privatemethod, protectedmethod\n" + "".join(
+            f"\nclass Class{index}:{methods}" for index in range(40))
+        module_names = [f"synthetic_package.module{index}" for index in range(10)]
+
+        def import_package() -> float:
+            """Import the package from scratch and return the duration."""
+            for name in module_names:
+                sys.modules.pop(name, None)
+            importlib.invalidate_caches()
+            start = time.perf_counter()
+            for name in module_names:
+                importlib.import_module(name)
+            return time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory, patch("sys.dont_write_bytecode", False):
+            os.mkdir(os.path.join(directory, "synthetic_package"))
+            for filename, contents in [("__init__", "")] + [(name.split(".")[1], module) for name in module_names]:
+                module_path = os.path.join(directory, "synthetic_package", f"{filename}.py")
+                with open(module_path, "w", encoding="utf-8") as module_file:
+                    module_file.write(contents)
+            sys.path.insert(0, directory)
+            try:
+                import_package()  # Write the bytecode cache
+                time_without_hook = min(import_package() for _ in range(3))
+                importhook.install("synthetic_package")
+                import_package()  # Write the bytecode cache
+                time_with_hook = min(import_package() for _ in range(3))
+            finally:
+                importhook.uninstall()
+                sys.path.remove(directory)
+                for name in ["synthetic_package"] + module_names:
+                    sys.modules.pop(name, None)
+        self.assertLess(time_with_hook, time_without_hook)
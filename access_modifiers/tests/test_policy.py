@@ -0,0 +1,194 @@
+"""Unit tests for the per-module enforcement policy."""
+
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from ..access_modifiers import enforce, privatemethod, protectedmethod, AccessException
+from ..policies import set_policy
+from .. import policies
+
+
+def create_class():
+    """Return a class with a private and a protected method, decorated according to the current policy."""
+
+    class Class:  # pylint: disable=missing-docstring
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"
+
+        @protectedmethod
+        def protected_method(self):  # pylint: disable=no-self-use
+            return "Class.protected_method"
+
+    return Class
+
+
+class PolicyTests(unittest.TestCase):
+    """Unit tests for the enforcement levels per module or package prefix."""
+
+    def tearDown(self):
+        set_policy({})
+
+    def test_strict_by_default(self):
+        """Test that modules not in the policy have strict access checks."""
+        set_policy({"other_package": "off"})
+        self.assertRaises(AccessException, create_class()().private_method)
+
+    def test_off(self):
+        """Test that methods in modules with level off are returned unchanged."""
+        set_policy({"access_modifiers.tests": "off"})
+        cls = create_class()
+        self.assertEqual("Class.private_method", cls().private_method())
+        self.assertEqual("Class.protected_method", cls().protected_method())
+        self.assertEqual("function", type(cls.__dict__["private_method"]).__name__)
+
+    def test_warn(self):
+        """Test that violations of methods in modules with level warn are logged instead of raised."""
+        set_policy({"access_modifiers.tests.test_policy": "warn"})
+        cls = create_class()
+        with self.assertLogs("access_modifiers") as logs:
+            self.assertEqual("Class.private_method", cls().private_method())
+            self.assertEqual("Class.protected_method", cls().protected_method())
+        self.assertEqual(2, len(logs.records))
+
+    def test_warn_with_record_mode(self):
+        """Test that violations of methods in modules with level warn go to the sink of the record mode."""
+        set_policy({"access_modifiers": "warn"})
+        records = []
+        enforce("record", sink=records.append)
+        try:
+            create_class()().private_method()
+        finally:
+            enforce()
+        self.assertEqual(1, len(records))
+
+    def test_longest_prefix_wins(self):
+        """Test that the level of the longest matching module or package prefix is used."""
+        set_policy(
+            {"": "off", "access_modifiers": "off", "access_modifiers.tests": "strict", "access_modifiers.t": "off"})
+        self.assertRaises(AccessException, create_class()().private_method)
+
+    def test_default_level(self):
+        """Test that the empty prefix sets the default level."""
+        set_policy({"": "off"})
+        self.assertEqual("Class.private_method", create_class()().private_method())
+
+    def test_invalid_level(self):
+        """Test that the levels are checked."""
+        self.assertRaises(ValueError, set_policy, {"access_modifiers": "lenient"})
+
+    def test_policy_read_once(self):
+        """Test that the policy is read when the first method is decorated, and not again."""
+        with patch.object(policies, "_POLICY", None), \
+                patch.object(policies, "_read_policy", return_value={"": "off"}) as read_policy:
+            policies._LEVELS.clear()  # pylint: disable=protected-access
+            create_class()
+            create_class()
+        read_policy.assert_called_once_with()
+
+
+class ReadPolicyTests(unittest.TestCase):
+    """Unit tests for reading the policy from the environment and pyproject.toml."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.subdirectory = os.path.join(self.directory.name, "src")
+        os.mkdir(self.subdirectory)
+        environment = {key: value for key, value in os.environ.items() if key != "ACCESS_MODIFIERS_POLICY"}
+        self.patches = [
+            patch.dict(os.environ, environment, clear=True), patch("os.getcwd", return_value=self.subdirectory)]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        self.directory.cleanup()
+        set_policy({})
+
+    @staticmethod
+    def policy():
+        """Return the current policy."""
+        return policies._POLICY  # pylint: disable=protected-access
+
+    def write_pyproject(self, contents):
+        """Write the pyproject.toml in the parent of the current directory."""
+        with open(os.path.join(self.directory.name, "pyproject.toml"), "w", encoding="utf-8") as pyproject:
+            pyproject.write(contents)
+
+    def test_environment_variable(self):
+        """Test that the policy is read from the environment variable."""
+        os.environ["ACCESS_MODIFIERS_POLICY"] = "warn, core = strict,vendored.lib=off,"
+        set_policy()
+        self.assertEqual({"": "warn", "core": "strict", "vendored.lib": "off"}, self.policy())
+
+    def test_invalid_environment_variable(self):
+        """Test that the levels in the environment variable are checked."""
+        os.environ["ACCESS_MODIFIERS_POLICY"] = "core=on"
+        self.assertRaises(ValueError, set_policy)
+
+    def test_no_pyproject(self):
+        """Test that the policy is empty without environment variable and pyproject.toml."""
+        with patch("os.path.isfile", return_value=False):
+            set_policy()
+        self.assertEqual({}, self.policy())
+
+    @unittest.skipIf(sys.version_info < (3, 11), "The TOML parser is part of the standard library since Python 3.11")
+    def test_pyproject(self):
+        """Test that the policy is read from the nearest pyproject.toml."""
+        self.write_pyproject('[tool.access_modifiers]\nlevel = "warn"\n\n'
+                             '[tool.access_modifiers.packages]\ncore = "strict"\n"vendored.lib" = "off"\n')
+        set_policy()
+        self.assertEqual({"": "warn", "core": "strict", "vendored.lib": "off"}, self.policy())
+
+    @unittest.skipIf(sys.version_info < (3, 11), "The TOML parser is part of the standard library since Python 3.11")
+    def test_pyproject_without_section(self):
+        """Test that the policy is empty if the pyproject.toml has no access_modifiers section."""
+        self.write_pyproject('[project]\nname = "project"\n')
+        set_policy()
+        self.assertEqual({}, self.policy())
+
+    @unittest.skipIf(sys.version_info < (3, 11), "The TOML parser is part of the standard library since Python 3.11")
+    def test_environment_variable_overrides_pyproject(self):
+        """Test that the environment variable takes precedence over the pyproject.toml."""
+        self.write_pyproject('[tool.access_modifiers]\nlevel = "warn"\n')
+        os.environ["ACCESS_MODIFIERS_POLICY"] = "off"
+        set_policy()
+        self.assertEqual({"": "off"}, self.policy())
+
+    def test_pyproject_with_tomli(self):
+        """Test that the pyproject.toml is read with tomli if the standard library has no TOML parser."""
+        self.write_pyproject('[tool.access_modifiers.packages]\ncore = "off"\n')
+        tomli = SimpleNamespace(loads=lambda text: {"tool": {"access_modifiers": {"packages": {"core": "off"}}}})
+        with patch.dict(sys.modules, tomllib=None, tomli=tomli):
+            set_policy()
+        self.assertEqual({"core": "off"}, self.policy())
+
+    def test_pyproject_without_toml_parser(self):
+        """Test that a warning is issued if the pyproject.toml has an access_modifiers section, but there is no TOML
+        parser to read it."""
+        self.write_pyproject('[tool.access_modifiers]\nlevel = "warn"\n')
+        with patch.dict(sys.modules, tomllib=None, tomli=None):
+            with self.assertWarnsRegex(RuntimeWarning, "needs Python 3.11 or newer, or the tomli package"):
+                set_policy()
+        self.assertEqual({}, self.policy())
+
+    def test_pyproject_without_section_and_toml_parser(self):
+        """Test that no warning is issued if the pyproject.toml has no access_modifiers section."""
+        self.write_pyproject('[project]\nname = "project"\n')
+        with patch.dict(sys.modules, tomllib=None, tomli=None), patch("warnings.warn") as warn:
+            set_policy()
+        warn.assert_not_called()
+        self.assertEqual({}, self.policy())
+
+    @unittest.skipIf(sys.version_info < (3, 11), "The TOML parser is part of the standard library since Python 3.11")
+    def test_invalid_pyproject(self):
+        """Test that a warning is issued if the pyproject.toml can't be parsed."""
+        self.write_pyproject('[tool.access_modifiers\nlevel = "warn"\n')
+        with self.assertWarnsRegex(RuntimeWarning, "Can't read the access modifiers policy from .*pyproject.toml"):
+            set_policy()
+        self.assertEqual({}, self.policy())
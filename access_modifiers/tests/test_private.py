@@ -1,8 +1,15 @@
 """Unit tests for the private method access modifier."""
 
+import gc
+import threading
 import unittest
+import weakref
+from unittest.mock import patch
 
-from ..access_modifiers import AccessException, disable, enable, privatemethod, protectedmethod
+import access_modifiers.access_modifiers
+
+from ..access_modifiers import AccessException, disable, enable, invalidate_caches, privatemethod, protectedmethod
+from ..controlled import AccessControlled
 
 
 class PrivateMethodTests(unittest.TestCase):
@@ -41,6 +48,26 @@ class PrivateMethodTests(unittest.TestCase):
             except AttributeError:  # pragma: nocover
                 pass
 
+        def public_method_using_nested_function(self):
+            def nested_function():
+                return self.private_method()
+            return nested_function()
+
+        def public_method_returning_lambda(self):
+            return lambda: "Class.public_method -> " + self.private_method()
+
+        @property
+        def public_property(self):
+            return "Class.public_property -> " + self.private_method()
+
+        @classmethod
+        def public_class_method(cls):
+            return "Class.public_class_method -> " + cls().private_method()
+
+        @staticmethod
+        def public_static_method(instance):
+            return "Class.public_static_method -> " + instance.private_method()
+
     class Subclass(Class):
         @privatemethod
         def private_method(self):
@@ -69,10 +96,46 @@ class PrivateMethodTests(unittest.TestCase):
         finally:
             enable()
 
+    def test_call_private_method_directly_after_disabling_access_checks(self):
+        """Test that accessing a private method works after disabling access checks, also if the method was
+        decorated before."""
+        try:
+            disable()
+            self.assertEqual("Class.private_method", self.Class().private_method())
+        finally:
+            enable()
+        self.assertRaises(AccessException, self.Class().private_method)
+
+    def test_enable_access_checks_twice(self):
+        """Test that enabling access checks twice has the same effect as enabling them once."""
+        try:
+            disable()
+        finally:
+            enable()
+            enable()
+        self.assertRaises(AccessException, self.Class().private_method)
+
     def test_call_private_method_via_public_method(self):
         """Test that accessing a private method via a public method is allowed."""
         self.assertEqual("Class.public_method -> Class.private_method", self.Class().public_method())
 
+    def test_call_private_method_from_threads(self):
+        """Test that calls of private methods from many threads at once are checked correctly."""
+        results = []
+
+        def call():
+            instance = self.Class()
+            for _ in range(100):
+                results.append(instance.public_method())
+            self.assertRaises(AccessException, instance.private_method)
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(["Class.public_method -> Class.private_method"] * 800, results)
+
     def test_call_private_method_via_public_method_from_subclass(self):
         """Test that accessing a private method via an overridden public method is allowed."""
 
@@ -116,6 +179,28 @@ class PrivateMethodTests(unittest.TestCase):
         """Test that accessing a private method from a try/except in a public method works."""
         self.assertEqual("Class.public_method -> Class.private_method", self.Class().public_method_using_try_except())
 
+    def test_call_private_method_via_nested_function(self):
+        """Test that accessing a private method via a function nested in a public method is not allowed."""
+        self.assertRaises(AccessException, self.Class().public_method_using_nested_function)
+
+    def test_call_private_method_via_escaped_lambda(self):
+        """Test that a lambda returned by a public method can't access a private method: the access check skips the
+        frame of the lambda, like in the public method, and finds the code that called the lambda."""
+        self.assertRaises(AccessException, self.Class().public_method_returning_lambda())
+
+    def test_call_private_method_via_property(self):
+        """Test that accessing a private method via a property is allowed."""
+        self.assertEqual("Class.public_property -> Class.private_method", self.Class().public_property)
+
+    def test_call_private_method_via_class_method(self):
+        """Test that accessing a private method via a class method is not allowed, as the class method has no self."""
+        self.assertRaises(AccessException, self.Class.public_class_method)
+
+    def test_call_private_method_via_static_method(self):
+        """Test that accessing a private method via a static method is not allowed, as the static method has no
+        self."""
+        self.assertRaises(AccessException, self.Class.public_static_method, self.Class())
+
     def test_override_private_method(self):
         """Test that an overridden private method can't call its super."""
         self.assertRaises(AccessException, self.Subclass().public_method)
@@ -171,6 +256,26 @@ class StaticPrivateMethodTests(PrivateMethodTests):
             except AttributeError:  # pragma: nocover
                 pass
 
+        def public_method_using_nested_function(self):
+            def nested_function():
+                return self.private_method()
+            return nested_function()
+
+        def public_method_returning_lambda(self):
+            return lambda: "Class.public_method -> " + self.private_method()
+
+        @property
+        def public_property(self):
+            return "Class.public_property -> " + self.private_method()
+
+        @classmethod
+        def public_class_method(cls):
+            return "Class.public_class_method -> " + cls().private_method()
+
+        @staticmethod
+        def public_static_method(instance):
+            return "Class.public_static_method -> " + instance.private_method()
+
     class Subclass(Class):
         @staticmethod
         @privatemethod
@@ -196,3 +301,298 @@ class StaticPrivateMethodTests(PrivateMethodTests):
             self.assertEqual("Class.private_method", Class().private_method())
         finally:
             enable()
+
+
+class AccessControlledPrivateMethodTests(PrivateMethodTests):
+    """Unit tests for private methods of classes that precompute their allowed callers."""
+
+    # pylint: disable=missing-docstring,inconsistent-return-statements
+
+    class Class(AccessControlled):
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"
+
+        @privatemethod
+        def private_method_calling_private_method(self):
+            return "Class.private_method_calling_private_method -> " + self.private_method()
+
+        def public_method(self):
+            return "Class.public_method -> " + self.private_method()
+
+        def public_method_calling_private_method_via_private_method(self):
+            return "Class.public_method_calling_private_method_via_private_method -> " + \
+                   self.private_method_calling_private_method()
+
+        def public_method_using_list_comprehension(self):
+            return ["Class.public_method -> " + self.private_method() for _ in range(1)][0]
+
+        def public_method_using_nested_lambdas(self):
+            # pylint: disable=unnecessary-lambda
+            inner_lambda_function = lambda: self.private_method()
+            outer_lambda_function = lambda: "Class.public_method -> " + inner_lambda_function()
+            return outer_lambda_function()
+
+        def public_method_using_try_except(self):
+            try:
+                return "Class.public_method -> " + self.private_method()
+            except AttributeError:  # pragma: nocover
+                pass
+
+        def public_method_using_nested_function(self):
+            def nested_function():
+                return self.private_method()
+            return nested_function()
+
+        def public_method_returning_lambda(self):
+            return lambda: "Class.public_method -> " + self.private_method()
+
+        @property
+        def public_property(self):
+            return "Class.public_property -> " + self.private_method()
+
+        @classmethod
+        def public_class_method(cls):
+            return "Class.public_class_method -> " + cls().private_method()
+
+        @staticmethod
+        def public_static_method(instance):
+            return "Class.public_static_method -> " + instance.private_method()
+
+    class Subclass(Class):
+        @privatemethod
+        def private_method(self):
+            super().private_method()  # pragma: nocover
+
+    def test_call_private_method_via_method_added_later(self):
+        """Test that accessing a private method via a method added after the class was created is allowed."""
+
+        def public_method_added_later(self):
+            return "Class.public_method_added_later -> " + self.private_method()
+
+        class Class(AccessControlled):  # pylint: disable=too-few-public-methods
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                return "Class.private_method"
+
+        Class.public_method_added_later = public_method_added_later
+        self.assertEqual(
+            "Class.public_method_added_later -> Class.private_method", Class().public_method_added_later())
+
+
+class PrivateMethodVerdictCacheTests(unittest.TestCase):
+    """Unit tests for the caching of access verdicts of private methods."""
+
+    # pylint: disable=missing-docstring
+
+    def test_cached_verdict_is_reused(self):
+        """Test that calling a private method twice via the same public method is allowed."""
+
+        class Class:
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                return "Class.private_method"
+
+            def public_method(self):
+                return "Class.public_method -> " + self.private_method()
+
+        instance = Class()
+        self.assertEqual(instance.public_method(), instance.public_method())
+
+    def test_cached_verdict_is_per_class(self):
+        """Test that a verdict cached for the class is not used for a subclass that overrides the caller."""
+
+        class Class:
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                return "Class.private_method"
+
+            def public_method(self):
+                return "Class.public_method -> " + self.private_method()
+
+        class Subclass(Class):
+            def public_method(self):
+                return self.private_method()
+
+        self.assertEqual("Class.public_method -> Class.private_method", Class().public_method())
+        self.assertRaises(AccessException, Subclass().public_method)
+
+    def test_cached_verdict_does_not_keep_class_alive(self):
+        """Test that a verdict cached for the class doesn't keep the class alive, and is forgotten when the class is
+        garbage collected."""
+
+        class Class:
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                return "Class.private_method"
+
+            def public_method(self):
+                return "Class.public_method -> " + self.private_method()
+
+        self.assertEqual("Class.public_method -> Class.private_method", Class().public_method())
+        cache = access_modifiers.access_modifiers._VERDICT_CACHES[  # pylint: disable=protected-access
+            Class.private_method.__wrapped__]  # pylint: disable=no-member
+        self.assertEqual(1, len(cache.verdicts))
+        reference = weakref.ref(Class)
+        del Class
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertEqual({}, cache.verdicts)
+
+    def test_index_does_not_keep_class_alive(self):
+        """Test that the index of an AccessControlled class doesn't keep the class alive, and is forgotten when the
+        class is garbage collected."""
+
+        class Class(AccessControlled):
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                return "Class.private_method"
+
+            def public_method(self):
+                return "Class.public_method -> " + self.private_method()
+
+        self.assertEqual("Class.public_method -> Class.private_method", Class().public_method())
+        cache = access_modifiers.access_modifiers._VERDICT_CACHES[  # pylint: disable=protected-access
+            Class.private_method.__wrapped__]  # pylint: disable=no-member
+        self.assertEqual(({}, 2), (cache.verdicts, len(cache.callers)))
+        reference = weakref.ref(Class)
+        del Class
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertEqual(frozenset(), cache.callers)
+
+    def test_invalidate_caches_after_monkeypatching(self):
+        """Test that a cached verdict is forgotten after invalidating the caches."""
+
+        def public_method_added_later(self):
+            return "Class.public_method_added_later -> " + self.private_method()
+
+        class Class:  # pylint: disable=too-few-public-methods
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                return "Class.private_method"
+
+        Class.public_method_added_later = public_method_added_later
+        expected = "Class.public_method_added_later -> Class.private_method"
+        self.assertEqual(expected, Class().public_method_added_later())
+        del Class.public_method_added_later
+        self.assertEqual(expected, public_method_added_later(Class()))
+        invalidate_caches()
+        self.assertRaises(AccessException, public_method_added_later, Class())
+
+    def test_eviction(self):
+        """Test that verdicts are evicted when the cache is full and computed again when needed."""
+        with patch("access_modifiers.access_modifiers._VERDICT_CACHE_SIZE", 1):
+
+            class Class:
+                @privatemethod
+                def private_method(self):  # pylint: disable=no-self-use
+                    return "Class.private_method"
+
+                def public_method(self):
+                    return "Class.public_method -> " + self.private_method()
+
+                def another_public_method(self):
+                    return "Class.another_public_method -> " + self.private_method()
+
+        instance = Class()
+        for _ in range(2):
+            self.assertEqual("Class.public_method -> Class.private_method", instance.public_method())
+            self.assertEqual("Class.another_public_method -> Class.private_method", instance.another_public_method())
+
+
+class PrivateMethodFrameWalkTests(unittest.TestCase):
+    """Unit tests for finding the calling method of private methods called via lambdas and generator expressions in
+    methods that are not lexically part of the class."""
+
+    # pylint: disable=missing-docstring,unnecessary-lambda
+
+    def setUp(self):
+
+        class Class:  # pylint: disable=too-few-public-methods
+            @privatemethod
+            def private_method(self):  # pylint: disable=no-self-use
+                return "Class.private_method"
+
+        def public_method_using_nested_lambdas(self):
+            return (lambda: (lambda: (lambda: self.private_method())())())()
+
+        def public_method_using_nested_lambdas_without_self(self):
+            instance = self
+            return (lambda: (lambda: (lambda: instance.private_method())())())()
+
+        def public_method_using_generator_expression(self):
+            return next(self.private_method() for _ in range(1))
+
+        Class.public_method_using_nested_lambdas = public_method_using_nested_lambdas
+        Class.public_method_using_nested_lambdas_without_self = public_method_using_nested_lambdas_without_self
+        Class.public_method_using_generator_expression = public_method_using_generator_expression
+        self.instance = Class()
+
+    def test_call_private_method_via_nested_lambdas(self):
+        """Test that the calling method is found by skipping the frames of the lambdas."""
+        self.assertEqual("Class.private_method", self.instance.public_method_using_nested_lambdas())
+
+    def test_call_private_method_via_nested_lambdas_without_self(self):
+        """Test that the calling method is found by skipping the frames of lambdas that don't use self."""
+        self.assertEqual("Class.private_method", self.instance.public_method_using_nested_lambdas_without_self())
+
+    def test_call_private_method_via_generator_expression(self):
+        """Test that the calling method is found by skipping the frame of the generator expression."""
+        self.assertEqual("Class.private_method", self.instance.public_method_using_generator_expression())
+
+    def test_walk_depth(self):
+        """Test that calls via more nested lambdas than the maximum walk depth are not allowed."""
+        with patch("access_modifiers.access_modifiers._MAX_WALK_DEPTH", 3):
+            self.assertEqual("Class.private_method", self.instance.public_method_using_nested_lambdas())
+        with patch("access_modifiers.access_modifiers._MAX_WALK_DEPTH", 2):
+            self.assertRaises(AccessException, self.instance.public_method_using_nested_lambdas)
+
+    def test_bounded_code_info_cache(self):
+        """Test that the cache of the classification of code objects is bounded."""
+        with patch("access_modifiers.access_modifiers._CODE_INFO_SIZE", 1):
+            self.assertEqual("Class.private_method", self.instance.public_method_using_nested_lambdas())
+
+    def test_call_private_method_via_lambda_from_outside_class(self):
+        """Test that a lambda that uses self, but is not part of a method of the class, can't call private methods."""
+        self.assertRaises(AccessException, lambda self=self.instance: self.private_method())
+
+
+class PrivateMethodCallerTests(unittest.TestCase):
+    """Unit tests for the code that may call the private methods of classes that are not indexed: only methods of the
+    class called on behalf of an instance of the class, also if the code is lexically part of the class."""
+
+    # pylint: disable=missing-docstring,unnecessary-lambda
+
+    class Class:
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"  # pragma: nocover
+
+        @classmethod
+        def class_method(cls, instance):
+            return instance.private_method()
+
+        @staticmethod
+        def static_method(instance):
+            return instance.private_method()
+
+        def public_method_returning_lambda(self):
+            return lambda: self.private_method()
+
+    def test_call_private_method_via_class_method(self):
+        """Test that accessing a private method via a class method is not allowed."""
+        self.assertRaises(AccessException, self.Class.class_method, self.Class())
+
+    def test_call_private_method_via_static_method(self):
+        """Test that accessing a private method via a static method is not allowed."""
+        self.assertRaises(AccessException, self.Class.static_method, self.Class())
+
+    def test_call_private_method_via_escaped_lambda(self):
+        """Test that a lambda defined in a method of the class can't call private methods when it's called from
+        outside the class."""
+
+        def function(instance):
+            return instance.public_method_returning_lambda()()
+
+        self.assertRaises(AccessException, function, self.Class())
@@ -0,0 +1,95 @@
+"""Unit tests for the overhead attribution report."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from .. import profile
+
+
+SCRIPT = """
+import sys
+from access_modifiers import privatemethod, protectedmethod, AccessException
+
+class Class:
+    @privatemethod
+    def private_method(self):
+        return 1
+
+    @protectedmethod
+    def protected_method(self):
+        return 1
+
+    def public_method(self):
+        return self.private_method() + self.protected_method()
+
+instance = Class()
+for _ in range(100):
+    instance.public_method()
+try:
+    instance.private_method()
+except AccessException:
+    pass
+sys.exit(len(sys.argv))
+"""
+
+
+class ProfileTest(unittest.TestCase):
+    """Unit tests for the overhead attribution report."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.script = os.path.join(self.directory.name, "script.py")
+        with open(self.script, "w", encoding="utf-8") as script_file:
+            script_file.write(SCRIPT)
+        self.output = os.path.join(self.directory.name, "report.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_main(self, *args: str):
+        """Run the script under the profile runner and return the output and the saved report."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(0, profile.main(["--output", self.output, *args, self.script, "argument"]))
+        with open(self.output, encoding="utf-8") as report_file:
+            return output.getvalue().splitlines(), json.load(report_file)
+
+    def test_call_sites(self):
+        """Test that the call sites are ranked and that each gets a suggestion."""
+        _, report = self.run_main()
+        self.assertEqual(201, report["checks"])
+        sites = {(site["method"], site["caller"].rsplit(":", 1)[1]): site for site in report["call_sites"]}
+        self.assertEqual("exempt", sites[("__main__.Class.private_method", "15")]["suggestion"])
+        self.assertEqual("exempt", sites[("__main__.Class.protected_method", "15")]["suggestion"])
+        self.assertEqual("static-check", sites[("__main__.Class.private_method", "21")]["suggestion"])
+        self.assertEqual("cache", profile.suggestion(dict(modifier="private", checks=2, cache_hits=0, violations=0)))
+        durations = [site["ns"] for site in report["call_sites"]]
+        self.assertEqual(sorted(durations, reverse=True), durations)
+
+    def test_collapsed_profile(self):
+        """Test that the access modifier frames are collapsed out of the profile and that the decorated methods are
+        marked."""
+        _, report = self.run_main("--top", "1000")  # Report all functions, so the methods of the script are included
+        functions = {function["function"].split("(")[-1]: function for function in report["profile"]}
+        self.assertTrue(functions["private_method)"]["decorated"])
+        self.assertFalse(functions["public_method)"]["decorated"])
+        self.assertFalse(any("method_wrapper" in function["function"] for function in report["profile"]))
+        self.assertFalse(any("_getframe" in function["function"] for function in report["profile"]))
+        self.assertGreater(report["collapsed_seconds"], 0)
+
+    def test_summary(self):
+        """Test that the summary is printed."""
+        lines, _ = self.run_main("--top", "2")
+        self.assertTrue(lines[0].startswith("201 access checks took"))
+        self.assertEqual(3, sum(" <- " in line for line in lines))  # Header and two call sites
+
+    def test_script_environment_is_restored(self):
+        """Test that the arguments and path of the script are restored after running it."""
+        argv, path = list(sys.argv), list(sys.path)
+        self.run_main()
+        self.assertEqual((argv, path), (sys.argv, sys.path))
@@ -1,6 +1,7 @@
 """Unit tests for the protected method access modifier."""
 
 import unittest
+from unittest.mock import patch
 
 from ..access_modifiers import AccessException, enable, disable, protectedmethod, privatemethod
 
@@ -22,6 +23,16 @@ class ProtectedMethodTest(unittest.TestCase):
         """Test that accessing a protected method throws an exception."""
         self.assertRaises(AccessException, self.Class().protected_method)
 
+    def test_call_protected_method_from_function(self):
+        """Test that accessing a protected method from a function without self throws an exception."""
+
+        def function(instance):
+            return instance.protected_method()
+
+        with patch("access_modifiers.access_modifiers._CODE_INFO_SIZE", 0):
+            self.assertRaises(AccessException, function, self.Class())
+        self.assertRaises(AccessException, function, self.Class())
+
     def test_call_protected_method_directly_without_access_checks(self):
         """Test that accessing a protected method without access checks works."""
         try:
@@ -36,6 +47,16 @@ class ProtectedMethodTest(unittest.TestCase):
         finally:
             enable()
 
+    def test_call_protected_method_directly_after_disabling_access_checks(self):
+        """Test that accessing a protected method works after disabling access checks, also if the method was
+        decorated before."""
+        try:
+            disable()
+            self.assertEqual("Class.protected_method", self.Class().protected_method())
+        finally:
+            enable()
+        self.assertRaises(AccessException, self.Class().protected_method)
+
     def test_call_protected_method_via_public_method(self):
         """Test that accessing a protected method via a public method is allowed."""
         self.assertEqual("Class.public_method -> Class.protected_method", self.Class().public_method())
@@ -0,0 +1,76 @@
+"""Unit tests for sampling the access checks."""
+
+import threading
+import unittest
+
+from ..access_modifiers import AccessException, privatemethod, protectedmethod, sample
+
+
+class SamplingTests(unittest.TestCase):
+    """Unit tests for checking only a sample of the calls of methods with access modifiers."""
+
+    # pylint: disable=missing-docstring
+
+    class Class:
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"
+
+        @protectedmethod
+        def protected_method(self):  # pylint: disable=no-self-use
+            return "Class.protected_method"
+
+    def tearDown(self):
+        sample()
+
+    def assert_checked(self, method, *expected_checks):
+        """Call the method once for each expected check and verify that exactly those calls were checked."""
+        for index, expected_check in enumerate(expected_checks):
+            with self.subTest(call=index):
+                if expected_check:
+                    self.assertRaises(AccessException, method)
+                else:
+                    method()
+
+    def test_sample_private_method(self):
+        """Test that only one in every calls of a private method is checked."""
+        sample(every=3)
+        self.assert_checked(self.Class().private_method, True, False, False, True, False, False, True)
+
+    def test_sample_protected_method(self):
+        """Test that only one in every calls of a protected method is checked."""
+        sample(every=2)
+        self.assert_checked(self.Class().protected_method, True, False, True, False)
+
+    def test_sample_adaptively(self):
+        """Test that adaptive sampling checks the first calls more often."""
+        sample(every=4, adaptive=True)
+        self.assert_checked(self.Class().private_method, True, True, True, False, True, False, False, False, True)
+
+    def test_sample_per_call_site(self):
+        """Test that sampling per call site checks the first call of each call site."""
+        sample(every=10, per_call_site=True)
+        instance = self.Class()
+        call_site = lambda: instance.private_method()  # pylint: disable=unnecessary-lambda
+        self.assertRaises(AccessException, call_site)
+        self.assertEqual("Class.private_method", call_site())
+        self.assertRaises(AccessException, instance.private_method)
+
+    def test_sample_per_thread(self):
+        """Test that each thread counts its own calls, so the first call in each thread is checked."""
+        sample(every=10)
+        instance = self.Class()
+        self.assert_checked(instance.private_method, True, False)
+        thread = threading.Thread(target=self.assert_checked, args=(instance.private_method, True, False))
+        thread.start()
+        thread.join()
+        self.assert_checked(instance.private_method, False)
+
+    def test_sample_every_call(self):
+        """Test that sampling every call checks each call."""
+        sample(every=1)
+        self.assert_checked(self.Class().private_method, True, True, True)
+
+    def test_invalid_interval(self):
+        """Test that the sampling interval must be positive."""
+        self.assertRaises(ValueError, sample, every=0)
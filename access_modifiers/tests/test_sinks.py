@@ -0,0 +1,58 @@
+"""Unit tests for the violation record sinks."""
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from ..access_modifiers import ViolationRecord
+from ..sinks import AccessWarning, JSONLinesSink, LoggingSink, WarningsSink
+
+
+def method():
+    """Method with an access modifier."""
+
+
+class SinkTests(unittest.TestCase):
+    """Unit tests for the sinks."""
+
+    def setUp(self):
+        self.record = ViolationRecord(method, "private", "file.py", 12, 0)
+
+    def test_logging_sink(self):
+        """Test that the logging sink logs the record."""
+        with self.assertLogs("access_modifiers", logging.ERROR) as logs:
+            LoggingSink(level=logging.ERROR)(self.record)
+        self.assertIn("file.py:12: Attempted call to private method", logs.output[0])
+
+    def test_logging_sink_formats_lazily(self):
+        """Test that the logging sink doesn't format the record if the logger is disabled for the level."""
+        record = MagicMock()
+        LoggingSink(level=logging.DEBUG)(record)
+        record.__str__.assert_not_called()  # pylint: disable=no-member
+
+    def test_warnings_sink(self):
+        """Test that the warnings sink issues a warning attributed to the caller."""
+        with self.assertWarns(AccessWarning) as warning:
+            WarningsSink()(self.record)
+        self.assertEqual(("file.py", 12), (warning.filename, warning.lineno))
+
+    def test_jsonlines_sink(self):
+        """Test that the JSON lines sink writes the records when the buffer is full and when flushed."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "violations.jsonl")
+            sink = JSONLinesSink(path, buffer_size=2)
+            sink(self.record)
+            self.assertFalse(os.path.exists(path))
+            sink(self.record)
+            sink(self.record)
+            with open(path, encoding="utf-8") as jsonl_file:
+                self.assertEqual(2, len(jsonl_file.readlines()))
+            sink.flush()
+            sink.flush()
+            with open(path, encoding="utf-8") as jsonl_file:
+                records = [json.loads(line) for line in jsonl_file]
+        self.assertEqual(3, len(records))
+        self.assertEqual(f"{__name__}.method", records[0]["method"])
@@ -0,0 +1,183 @@
+"""Unit tests for the access check stats."""
+
+import threading
+import unittest
+
+import access_modifiers.access_modifiers
+
+from ..access_modifiers import (
+    collect_stats, invalidate_caches, privatemethod, protectedmethod, sample, stats, AccessException)
+from ..controlled import AccessControlled
+
+
+class StatsTests(unittest.TestCase):
+    """Unit tests for counting the access checks."""
+
+    # pylint: disable=missing-docstring
+
+    class Class:
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "Class.private_method"
+
+        @protectedmethod
+        def protected_method(self):  # pylint: disable=no-self-use
+            return "Class.protected_method"
+
+        def public_method(self):
+            return self.private_method(), self.protected_method()
+
+    class IndexedClass(AccessControlled):
+        @privatemethod
+        def private_method(self):  # pylint: disable=no-self-use
+            return "IndexedClass.private_method"
+
+        def public_method(self):
+            return self.private_method()
+
+    def setUp(self):
+        invalidate_caches()
+        collect_stats()
+        self.private_method_name = f"{__name__}.StatsTests.Class.private_method"
+        self.protected_method_name = f"{__name__}.StatsTests.Class.protected_method"
+
+    def tearDown(self):
+        collect_stats(False)
+        sample()
+
+    def test_no_stats_by_default(self):
+        """Test that no checks are counted if collecting stats is off."""
+        collect_stats(False)
+        self.Class().public_method()
+        self.assertEqual(dict(checks=0, cache_hits=0, violations=0, ns=0, methods={}), stats())
+
+    def test_count_checks(self):
+        """Test that the checks are counted per method."""
+        instance = self.Class()
+        instance.public_method()
+        instance.public_method()
+        counts = stats()
+        self.assertEqual(4, counts["checks"])
+        self.assertEqual(0, counts["violations"])
+        self.assertEqual(2, counts["methods"][self.private_method_name]["checks"])
+        self.assertEqual(2, counts["methods"][self.protected_method_name]["checks"])
+        self.assertLess(0, counts["ns"])
+
+    def test_modifier(self):
+        """Test that the stats contain the access modifier of the methods."""
+        self.Class().public_method()
+        counts = stats()["methods"]
+        self.assertEqual("private", counts[self.private_method_name]["modifier"])
+        self.assertEqual("protected", counts[self.protected_method_name]["modifier"])
+
+    def test_count_cache_hits(self):
+        """Test that the private method verdicts found in the cache are counted."""
+        instance = self.Class()
+        instance.public_method()
+        instance.public_method()
+        counts = stats()["methods"]
+        self.assertEqual(1, counts[self.private_method_name]["cache_hits"])
+        self.assertEqual(0, counts[self.protected_method_name]["cache_hits"])
+
+    def test_count_cache_hits_of_indexed_class(self):
+        """Test that the indexed callers of private methods count as cache hits."""
+        self.IndexedClass().public_method()
+        self.assertEqual(1, stats()["cache_hits"])
+
+    def test_count_violations(self):
+        """Test that violations are counted."""
+        instance = self.Class()
+        self.assertRaises(AccessException, instance.private_method)
+        self.assertRaises(AccessException, instance.protected_method)
+        counts = stats()
+        self.assertEqual(2, counts["violations"])
+        self.assertEqual(1, counts["methods"][self.private_method_name]["violations"])
+
+    def test_count_per_caller(self):
+        """Test that the checks are counted per caller code location."""
+        instance = self.Class()
+        line = instance.public_method.__code__.co_firstlineno + 1
+        instance.public_method()
+        self.assertRaises(AccessException, instance.private_method)
+        callers = stats()["methods"][self.private_method_name]["callers"]
+        self.assertEqual(dict(checks=1, cache_hits=0, violations=0), {
+            key: value for key, value in callers[f"{__file__}:{line}"].items() if key != "ns"})
+        self.assertEqual(2, len(callers))
+
+    def test_reset(self):
+        """Test that the counts can be reset."""
+        self.Class().public_method()
+        self.assertEqual(2, stats(reset=True)["checks"])
+        self.assertEqual(0, stats()["checks"])
+        self.Class().public_method()
+        self.assertEqual(2, stats()["checks"])
+
+    def run_in_thread(self, reset):
+        """Call the public method in a thread, and return the counters of the thread and a copy of them, made after
+        getting the stats, resetting them if reset is true, while the thread is still running."""
+        called, finish = threading.Event(), threading.Event()
+
+        def call():
+            self.Class().public_method()
+            called.set()
+            finish.wait()
+
+        thread = threading.Thread(target=call)
+        thread.start()
+        called.wait()
+        current_stats = access_modifiers.access_modifiers._STATS  # pylint: disable=protected-access
+        counters = next(iter(current_stats.thread_counters.values()))
+        copy = {key: list(counter) for key, counter in counters.items()}
+        self.assertEqual(2, stats(reset=reset)["checks"])
+        self.assertEqual(copy, counters)
+        finish.set()
+        thread.join()
+        return current_stats
+
+    def test_reset_counts_of_other_threads(self):
+        """Test that the counts of other threads can be reset without changing their counters, and stay reset when the
+        threads finish."""
+        self.run_in_thread(reset=True)
+        self.assertEqual(dict(checks=0, cache_hits=0, violations=0, ns=0, methods={}), stats())
+
+    def test_counts_of_finished_threads(self):
+        """Test that the counters of finished threads are dropped, and their counts are kept by name, so they don't
+        keep the caller code alive."""
+        current_stats = self.run_in_thread(reset=False)
+        self.assertEqual({}, current_stats.thread_counters)
+        self.assertEqual({}, current_stats.reset_counts)
+        counts = stats()
+        self.assertEqual(2, counts["checks"])
+        self.assertEqual(1, counts["methods"][self.private_method_name]["checks"])
+        self.assertEqual(2, stats(reset=True)["checks"])
+        self.assertEqual(0, stats()["checks"])
+
+    def test_stop_collecting(self):
+        """Test that stopping collecting stats discards the counts."""
+        self.Class().public_method()
+        collect_stats(False)
+        collect_stats()
+        self.assertEqual(0, stats()["checks"])
+
+    def test_start_collecting_twice(self):
+        """Test that starting collecting stats again keeps the counts."""
+        self.Class().public_method()
+        collect_stats()
+        self.assertEqual(2, stats()["checks"])
+
+    def test_count_sampled_checks(self):
+        """Test that only the calls that are checked are counted."""
+        sample(every=2)
+        instance = self.Class()
+        for _ in range(4):
+            instance.public_method()
+        self.assertEqual(4, stats()["checks"])
+
+    def test_count_checks_in_threads(self):
+        """Test that the checks in all threads are counted."""
+        threads = [threading.Thread(target=self.Class().public_method) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(8, stats()["checks"])
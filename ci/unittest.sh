@@ -1,6 +1,6 @@
 #!/bin/sh
 
-coverage run --omit=venv/*,/home/travis/virtualenv/* --branch -m unittest --quiet
+coverage run --source=access_modifiers --omit=venv/*,/home/travis/virtualenv/*,access_modifiers/tests/test_performance.py --branch -m unittest --quiet
 coverage xml -o build/unittest-coverage.xml
 coverage html --directory build/unittest-coverage
 coverage report --fail-under=100 --skip-covered